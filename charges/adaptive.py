@@ -0,0 +1,138 @@
+"""Python module for sampling electric potential adaptively, refining cells only where it changes quickly."""
+
+from __future__ import annotations
+from math import ceil, log2
+import numpy as np
+from charges import System
+from points import Point
+from quantiles import levels
+
+CORNERS: tuple[tuple[int, int], ...] = ((0, 0), (0, 1), (1, 0), (1, 1))
+"""Offsets of the corners of a cell, in units of its size, as rows and columns."""
+
+
+class AdaptiveSampler:
+    """Quadtree sampler starting from a coarse grid and splitting the cells its bilinear interpolation misrepresents.
+
+    A cell is split when the potential at its center or the midpoints of its edges differs from the interpolation of
+    its corners by more than the tolerance, a fraction of the spread of the coarse samples; this catches both steep
+    gradients and strong curvature. Every leaf is then filled by bilinear interpolation on a regular lattice, which
+    can be given to contourf like a uniformly sampled grid.
+    """
+
+    tolerance: float
+    coarse: int
+    depth: int
+    evaluations: int
+
+    def __init__(self, tolerance: float = 0.01, size: int = 100, coarse: int = 8) -> None:
+        """Create a sampler whose finest cells match a uniform grid of at least the specified size."""
+        self.tolerance = tolerance
+        self.coarse = coarse
+        self.depth = max(0, ceil(log2(max(size - 1, 1) / coarse)))
+        self.evaluations = 0
+
+    def sample(
+        self, system: System, minimum: Point, maximum: Point, workers: int = 1
+    ) -> np.ndarray:
+        """Calculate the potential over the region on a regular lattice, rows going up, evaluating it only where needed."""
+        size = self.coarse * 2**self.depth
+        xs = np.linspace(minimum.x, maximum.x, size + 1)
+        ys = np.linspace(minimum.y, maximum.y, size + 1)
+        values = np.zeros((size + 1, size + 1))
+        known = np.zeros((size + 1, size + 1), dtype=bool)
+        self.evaluations = 0
+
+        def evaluate(rows: np.ndarray, columns: np.ndarray) -> None:
+            """Calculate the potential at the lattice points not evaluated yet."""
+            flat = np.unique(rows * (size + 1) + columns)
+            flat = flat[~known.ravel()[flat]]
+            rows, columns = np.divmod(flat, size + 1)
+            values[rows, columns] = system.potential_grid(
+                xs[columns], ys[rows], workers=workers
+            )
+            known[rows, columns] = True
+            self.evaluations += len(flat)
+
+        step = 2**self.depth
+        rows, columns = (
+            grid.ravel()
+            for grid in np.meshgrid(
+                np.arange(0, size, step), np.arange(0, size, step), indexing="ij"
+            )
+        )
+        coarse_rows, coarse_columns = np.meshgrid(
+            np.arange(0, size + 1, step), np.arange(0, size + 1, step), indexing="ij"
+        )
+        evaluate(coarse_rows.ravel(), coarse_columns.ravel())
+        low, high = levels(values[::step, ::step], [0.02, 0.98])
+        threshold = self.tolerance * (high - low)
+        leaves: list[tuple[np.ndarray, np.ndarray, int]] = []
+        while len(rows) > 0 and step > 1:
+            half = step // 2
+            # Center, then the midpoints of the bottom, top, left and right edges.
+            probes = (
+                (half, half, CORNERS),
+                (0, half, ((0, 0), (0, 1))),
+                (step, half, ((1, 0), (1, 1))),
+                (half, 0, ((0, 0), (1, 0))),
+                (half, step, ((0, 1), (1, 1))),
+            )
+            evaluate(
+                np.concatenate([rows + row for row, _, _ in probes]),
+                np.concatenate([columns + column for _, column, _ in probes]),
+            )
+            error = np.zeros(len(rows))
+            for row, column, corners in probes:
+                interpolated = np.mean(
+                    [
+                        values[rows + a * step, columns + b * step]
+                        for a, b in corners
+                    ],
+                    axis=0,
+                )
+                error = np.maximum(
+                    error, np.abs(values[rows + row, columns + column] - interpolated)
+                )
+            split = error > threshold
+            leaves.append((rows[~split], columns[~split], step))
+            rows = np.concatenate([rows[split] + a * half for a, _ in CORNERS])
+            columns = np.concatenate([columns[split] + b * half for _, b in CORNERS])
+            step = half
+        leaves.append((rows, columns, step))
+        # Coarser leaves are filled first, so that finer neighbors overwrite their shared edges.
+        for rows, columns, step in leaves:
+            if len(rows) == 0:
+                continue
+            fraction = np.arange(step + 1) / step
+            offsets = np.arange(step + 1)
+            lattice_rows, lattice_columns = np.broadcast_arrays(
+                rows[:, None, None] + offsets[None, :, None],
+                columns[:, None, None] + offsets[None, None, :],
+            )
+            weight_y = fraction[None, :, None]
+            weight_x = fraction[None, None, :]
+            interpolated = np.zeros(lattice_rows.shape)
+            for a, b in CORNERS:
+                interpolated += (
+                    values[rows + a * step, columns + b * step][:, None, None]
+                    * (weight_y if a else 1 - weight_y)
+                    * (weight_x if b else 1 - weight_x)
+                )
+            missing = ~known[lattice_rows, lattice_columns]
+            values[lattice_rows[missing], lattice_columns[missing]] = interpolated[
+                missing
+            ]
+        return values
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
@@ -0,0 +1,112 @@
+"""Python module for rendering many systems of charges described in JSON files, in parallel and without a display."""
+
+from __future__ import annotations
+import matplotlib
+
+matplotlib.use("Agg")
+
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+from time import perf_counter
+import json
+import numpy as np
+import matplotlib.pyplot as plt
+from charges import System, Charge
+from render import figure_system
+from scene import point, build_charges, load_scene
+
+
+def build_system(job: dict) -> System:
+    """Create the system of charges of a job, starting from the charges of its scene file if it names one."""
+    charges: list[Charge] = list(load_scene(job["scene"]).charges) if "scene" in job else []
+    for description in job.get("charges", []):
+        charges.extend(build_charges(description))
+    return System(charges)
+
+
+def run(job: dict, output: str, dpi: int, cache: bool) -> float:
+    """Render a job to an image and an array in the output directory, returning the time it took in seconds."""
+    start = perf_counter()
+    name = job["name"]
+    figure, potentials = figure_system(
+        build_system(job),
+        point(job.get("minimum", [0, 0])),
+        point(job.get("maximum", [10, 10])),
+        job.get("title", name),
+        field_size=int(job.get("field_size", 20)),
+        potential_size=int(job.get("potential_size", 100)),
+        tolerance=job.get("tolerance"),
+        field_lines=int(job.get("field_lines", 0)),
+        **({} if cache else {"cache": None}),
+    )
+    figure.savefig(Path(output) / f"{name}.png", dpi=dpi)
+    plt.close(figure)
+    np.save(Path(output) / f"{name}.npy", potentials)
+    return perf_counter() - start
+
+
+def load_jobs(paths: list[str]) -> list[dict]:
+    """Read the jobs of JSON files holding either a list of jobs or an object with a list under "jobs"."""
+    jobs: list[dict] = []
+    for path in paths:
+        with open(path) as file:
+            content = json.load(file)
+        jobs.extend(content["jobs"] if isinstance(content, dict) else content)
+    for index, job in enumerate(jobs):
+        job.setdefault("name", f"job-{index}")
+    return jobs
+
+
+def run_batch(
+    jobs: list[dict],
+    output: str | Path,
+    workers: int | None = None,
+    dpi: int = 100,
+    cache: bool = True,
+) -> int:
+    """Render every job on a pool of processes, reporting progress as they finish, and return the number of failures.
+
+    The processes are spawned rather than forked, as a process forked after the compiled kernels ran in parallel
+    inherits their thread pool in an unusable state and hangs the program when it exits.
+    """
+    Path(output).mkdir(parents=True, exist_ok=True)
+    failures = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as executor:
+        futures = {
+            executor.submit(run, job, str(output), dpi, cache): job["name"]
+            for job in jobs
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            name = futures[future]
+            try:
+                seconds = future.result()
+            except Exception as error:
+                failures += 1
+                print(f"[{done}/{len(jobs)}] {name} failed: {error}", flush=True)
+            else:
+                print(f"[{done}/{len(jobs)}] {name} rendered in {seconds:.2f} s", flush=True)
+    return failures
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """Run the batch renderer from the command line, exiting with a failure status if any job failed."""
+    parser = ArgumentParser(description="Render systems of charges described in JSON files.")
+    parser.add_argument("jobs", nargs="+", help="JSON files with the jobs to render")
+    parser.add_argument("-o", "--output", default="renders", help="directory to write the images and arrays to")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of processes, every core by default")
+    parser.add_argument("--dpi", type=int, default=100, help="resolution of the images")
+    parser.add_argument("--no-cache", action="store_true", help="always recompute, without reading or writing the grid cache")
+    options = parser.parse_args(arguments)
+    jobs = load_jobs(options.jobs)
+    failures = run_batch(jobs, options.output, options.workers, options.dpi, not options.no_cache)
+    print(f"Done, {len(jobs) - failures} of {len(jobs)} jobs rendered.")
+    return 1 if failures > 0 else 0
+
+
+try:
+    if __name__ == "__main__":
+        raise SystemExit(main())
+except KeyboardInterrupt:
+    exit()
@@ -0,0 +1,254 @@
+"""Python module for measuring the speed and memory use of systems, particles and rendering on reproducible scenes."""
+
+from __future__ import annotations
+import matplotlib
+
+matplotlib.use("Agg")
+
+from argparse import ArgumentParser
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter
+import json
+import platform
+import tracemalloc
+import numpy as np
+import matplotlib.pyplot as plt
+import kernels
+from points import Point
+from charges import (
+    System,
+    PointCharge,
+    FiniteLineCharge,
+    CircleCharge,
+    ChargeArray,
+    PROTON_CHARGE,
+    ELECTRON_CHARGE,
+)
+from particles import System as ParticleSystem
+from render import figure_system
+from scene import particle_system
+
+SEED: int = 0
+"""Seed of the random scenes, so that every run measures the same charges."""
+GRID_SIZE: int = 200
+"""Width and height of the grid whose evaluation is measured, shrunk for systems with many sources."""
+GRID_INTERACTIONS: int = 1 << 27
+"""Largest number of point and source pairs a measured grid evaluation may take."""
+LATENCY_CALLS: int = 1000
+"""Number of single point evaluations timed together, fewer for systems with many sources."""
+PARTICLE_STEPS: int = 10
+"""Number of particle steps timed together."""
+REPEATS: int = 5
+"""Number of times every measurement is taken, the fastest being kept."""
+THRESHOLD: float = 0.2
+"""Relative change past which a measurement is reported as a regression against the baseline."""
+
+
+def random_charges(count: int) -> System:
+    """Create a system of point charges of random sign at random positions in the viewport."""
+    generator = np.random.default_rng(SEED)
+    return System(
+        [
+            ChargeArray(
+                generator.uniform(0, 10, count),
+                generator.uniform(0, 10, count),
+                generator.choice([PROTON_CHARGE, ELECTRON_CHARGE], count),
+            )
+        ]
+    )
+
+
+def random_particles(count: int) -> ParticleSystem:
+    """Create a system of protons and electrons of random sign at rest at random positions in the viewport."""
+    generator = np.random.default_rng(SEED)
+    charge = generator.choice([PROTON_CHARGE, ELECTRON_CHARGE], count)
+    return particle_system(
+        generator.uniform(0, 10, count),
+        generator.uniform(0, 10, count),
+        np.zeros(count),
+        np.zeros(count),
+        charge,
+        np.where(charge > 0, 1.67262192e-27, 9.1093837e-31),
+    )
+
+
+def square() -> System:
+    """Create the square of charge of charges_square.py with a total charge of one nanocoulomb."""
+    corners = [Point(3, 7), Point(7, 7), Point(7, 3), Point(3, 3)]
+    return System(
+        [
+            FiniteLineCharge(1e-9 / 4, corners[n], corners[(n + 1) % 4], 100, analytic=True)
+            for n in range(4)
+        ]
+    )
+
+
+SCENES: dict[str, Callable[[], System]] = {
+    "proton": lambda: System([PointCharge(PROTON_CHARGE, Point(5, 5))]),
+    "dipole": lambda: System(
+        [PointCharge(PROTON_CHARGE, Point(2, 5)), PointCharge(ELECTRON_CHARGE, Point(8, 5))]
+    ),
+    "finite_line_2x": lambda: System(
+        [
+            FiniteLineCharge(1e-9, Point(3, 3), Point(3, 7), 100, analytic=True),
+            FiniteLineCharge(-1e-9, Point(7, 3), Point(7, 7), 100, analytic=True),
+        ]
+    ),
+    "square": square,
+    "circle_100": lambda: System([CircleCharge(1e-9, Point(5, 5), 3, 100)]),
+    "random_10000": lambda: random_charges(10_000),
+    "random_100000": lambda: random_charges(100_000),
+    "random_1000000": lambda: random_charges(1_000_000),
+}
+"""Systems of charges measured for single point latency, grid throughput and memory, all over (0, 0) to (10, 10)."""
+PARTICLE_SCENES: dict[str, Callable[[], ParticleSystem]] = {
+    "particles_1000": lambda: random_particles(1_000),
+    "particles_10000": lambda: random_particles(10_000),
+}
+"""Systems of particles measured for steps per second and memory."""
+RENDER_SCENES: tuple[str, ...] = ("dipole", "square", "circle_100")
+"""Systems whose whole figure is also drawn and timed."""
+
+
+def fastest(function: Callable[[], object], repeats: int = REPEATS) -> float:
+    """Time a function several times, returning the fastest run in seconds."""
+    times = []
+    for _ in range(repeats):
+        start = perf_counter()
+        function()
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def peak_memory(function: Callable[[], object]) -> int:
+    """Measure the most memory allocated at once while running a function, in bytes."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_system(name: str, system: System) -> dict[str, float]:
+    """Measure the single point latency, grid throughput and grid memory of a system."""
+    sources = max(1, len(system.store) + len(system.store.line_q))
+    calls = max(1, min(LATENCY_CALLS, GRID_INTERACTIONS // (sources * 1000)))
+    size = max(8, min(GRID_SIZE, int((GRID_INTERACTIONS / sources) ** 0.5)))
+    point = Point(4.321, 5.678)
+    xs, ys = np.meshgrid(np.linspace(0, 10, size), np.linspace(0, 10, size))
+    # The first evaluations compile the kernels of the Numba backend, which is not what is measured.
+    system.potential_grid(xs[:2, :2], ys[:2, :2])
+    system.field_grid(xs[:2, :2], ys[:2, :2])
+    system.field(point)
+    results = {
+        "potential_latency_us": fastest(
+            lambda: [system.potential(point) for _ in range(calls)]
+        )
+        / calls
+        * 1e6,
+        "field_latency_us": fastest(lambda: [system.field(point) for _ in range(calls)])
+        / calls
+        * 1e6,
+        "potential_grid_points_per_second": size**2
+        / fastest(lambda: system.potential_grid(xs, ys)),
+        "field_grid_points_per_second": size**2
+        / fastest(lambda: system.field_grid(xs, ys)),
+        "grid_peak_bytes": peak_memory(lambda: system.field_grid(xs, ys)),
+    }
+    if name in RENDER_SCENES:
+        results["render_seconds"] = fastest(render(system), 3)
+    return results
+
+
+def render(system: System) -> Callable[[], None]:
+    """Make a function drawing the figure of a system without the cache, then closing it."""
+
+    def draw() -> None:
+        """Draw and close the figure."""
+        figure, _ = figure_system(system, Point(0, 0), Point(10, 10), "", cache=None)
+        figure.canvas.draw()
+        plt.close(figure)
+
+    return draw
+
+
+def measure_particles(system: ParticleSystem) -> dict[str, float]:
+    """Measure the steps per second and memory of the particle simulation."""
+    system.iterate(1e-12)
+    return {
+        "steps_per_second": PARTICLE_STEPS
+        / fastest(lambda: [system.iterate(1e-12) for _ in range(PARTICLE_STEPS)]),
+        "step_peak_bytes": peak_memory(lambda: system.iterate(1e-12)),
+    }
+
+
+def run(names: list[str] | None = None) -> dict:
+    """Measure the specified scenes, or all of them, along with a description of the environment."""
+    names = list(SCENES) + list(PARTICLE_SCENES) if names is None else names
+    results: dict[str, dict[str, float]] = {}
+    for name in names:
+        if name in SCENES:
+            results[name] = measure_system(name, SCENES[name]())
+        elif name in PARTICLE_SCENES:
+            results[name] = measure_particles(PARTICLE_SCENES[name]())
+        else:
+            raise ValueError(f"Unknown scene {name!r}.")
+        print(f"{name}: " + ", ".join(f"{key} {value:.4g}" for key, value in results[name].items()), flush=True)
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "backend": kernels.BACKEND,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    results: dict, baseline: dict, threshold: float = THRESHOLD
+) -> list[tuple[str, str, float, float]]:
+    """Find the measurements worse than the baseline by more than the threshold, as scene, metric, baseline and new value.
+
+    Rates per second are better higher, everything else lower.
+    """
+    regressions = []
+    for name, metrics in results["results"].items():
+        for metric, value in metrics.items():
+            old = baseline["results"].get(name, {}).get(metric)
+            if old is None or old == 0:
+                continue
+            change = (old - value) / old if metric.endswith("_per_second") else (value - old) / old
+            if change > threshold:
+                regressions.append((name, metric, old, value))
+    return regressions
+
+
+def main(arguments: list[str] | None = None) -> int:
+    """Run the benchmarks from the command line, exiting with a failure status on regressions against a baseline."""
+    parser = ArgumentParser(description="Measure the speed and memory use of the simulation on reproducible scenes.")
+    parser.add_argument("scenes", nargs="*", help="scenes to measure, all of them by default: " + ", ".join([*SCENES, *PARTICLE_SCENES]))
+    parser.add_argument("-o", "--output", help="JSON file to write the results to")
+    parser.add_argument("-b", "--baseline", help="JSON file of earlier results to compare against")
+    parser.add_argument("-t", "--threshold", type=float, default=THRESHOLD, help="relative change reported as a regression")
+    options = parser.parse_args(arguments)
+    results = run(options.scenes or None)
+    if options.output is not None:
+        Path(options.output).write_text(json.dumps(results, indent=2))
+    if options.baseline is None:
+        return 0
+    regressions = compare(results, json.loads(Path(options.baseline).read_text()), options.threshold)
+    for name, metric, old, new in regressions:
+        print(f"Regression in {name} {metric}: {old:.4g} -> {new:.4g}")
+    print(f"{len(regressions)} regressions against {options.baseline}.")
+    return 1 if len(regressions) > 0 else 0
+
+
+try:
+    if __name__ == "__main__":
+        raise SystemExit(main())
+except KeyboardInterrupt:
+    exit()
@@ -0,0 +1,256 @@
+"""Python module for reusing grid evaluations of systems of charges across calls and across processes."""
+
+from __future__ import annotations
+from collections import OrderedDict
+from hashlib import blake2b
+from os import environ, getpid, replace, utime
+from pathlib import Path
+import json
+import numpy as np
+from charges import System
+from points import Point
+import instrument
+
+MEMORY_BYTES: int = 256 << 20
+"""Size in bytes of the grid evaluations kept in memory by default."""
+DISK_BYTES: int = 1 << 30
+"""Size in bytes the cache directory is kept under by default."""
+
+
+def default_directory() -> Path | None:
+    """Find the directory of the on-disk cache in CHARGES_CACHE, if set, as the disk is only used when asked for."""
+    if environ.get("CHARGES_CACHE"):
+        return Path(environ["CHARGES_CACHE"])
+    return None
+
+
+def user_directory() -> Path:
+    """Find the charges directory of the user cache directory, to pass to a cache explicitly."""
+    return Path(environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "charges"
+
+
+class GridCache:
+    """Content-addressed cache of potential and field grids, least recently used first out, in memory and on disk.
+
+    Entries are keyed by a hash of the charge arrays, the engine settings, the viewport and the resolution, so any
+    change to the system gives a new key and stale entries simply age out. Failing to write to the directory, when
+    it is read only or full, leaves the cache in memory only instead of failing the evaluation.
+    """
+
+    memory_limit: int
+    directory: Path | None
+    disk_limit: int
+    memory: OrderedDict[str, tuple[np.ndarray, ...]]
+    memory_bytes: int
+    hits: int
+    misses: int
+
+    def __init__(
+        self,
+        memory_limit: int = MEMORY_BYTES,
+        directory: str | Path | None = None,
+        disk_limit: int = DISK_BYTES,
+    ) -> None:
+        """Create a cache keeping up to the specified number of bytes in memory, and on disk if a directory is given."""
+        self.memory_limit = memory_limit
+        self.directory = None if directory is None else Path(directory)
+        self.disk_limit = disk_limit
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def key(
+        self,
+        system: System,
+        kind: str,
+        minimum: Point,
+        maximum: Point,
+        width: int,
+        height: int,
+    ) -> str:
+        """Hash everything a grid evaluation depends on into a key."""
+        digest = blake2b(digest_size=20)
+        for array in (*system.store.points(), *system.store.segments()):
+            digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+            digest.update(b"|")
+        engine = system.engine
+        settings = (
+            {}
+            if engine is None
+            else {
+                name: value
+                for name, value in vars(engine).items()
+                if isinstance(value, (bool, int, float, str, type(None)))
+            }
+        )
+        digest.update(
+            json.dumps(
+                [
+                    kind,
+                    None if engine is None else type(engine).__name__,
+                    settings,
+                    [minimum.x, minimum.y, maximum.x, maximum.y],
+                    [width, height],
+                ],
+                sort_keys=True,
+            ).encode()
+        )
+        return digest.hexdigest()
+
+    def get(self, key: str) -> tuple[np.ndarray, ...] | None:
+        """Find the arrays stored under a key, in memory first and then on disk, or None."""
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            instrument.count("cache hits")
+            return tuple(array.copy() for array in self.memory[key])
+        if self.directory is not None:
+            path = self.directory / f"{key}.npz"
+            try:
+                with np.load(path) as data:
+                    arrays = tuple(data[f"arr_{n}"] for n in range(len(data.files)))
+                utime(path)
+            except (OSError, ValueError, KeyError):
+                pass
+            else:
+                self.hits += 1
+                instrument.count("cache hits")
+                self.remember(key, arrays)
+                return tuple(array.copy() for array in arrays)
+        self.misses += 1
+        instrument.count("cache misses")
+        return None
+
+    def put(self, key: str, arrays: tuple[np.ndarray, ...]) -> None:
+        """Store arrays under a key, in memory if they fit and on disk."""
+        if sum(np.asarray(array).nbytes for array in arrays) <= self.memory_limit:
+            self.remember(key, tuple(np.array(array, dtype=float) for array in arrays))
+        if self.directory is None:
+            return
+        # Writing to a temporary name first keeps other processes from reading half a file.
+        temporary = self.directory / f"{key}.{getpid()}.tmp"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(temporary, "wb") as file:
+                np.savez(file, *arrays)
+            replace(temporary, self.directory / f"{key}.npz")
+        except OSError:
+            try:
+                temporary.unlink(missing_ok=True)
+            except OSError:
+                pass
+            self.directory = None
+            return
+        self.evict()
+
+    def remember(self, key: str, arrays: tuple[np.ndarray, ...]) -> None:
+        """Keep arrays in memory, dropping the least recently used entries until the memory is under its size limit."""
+        size = sum(array.nbytes for array in arrays)
+        if size > self.memory_limit:
+            return
+        if key in self.memory:
+            self.memory_bytes -= sum(array.nbytes for array in self.memory.pop(key))
+        self.memory[key] = arrays
+        self.memory_bytes += size
+        while self.memory_bytes > self.memory_limit:
+            _, dropped = self.memory.popitem(last=False)
+            self.memory_bytes -= sum(array.nbytes for array in dropped)
+
+    def evict(self) -> None:
+        """Delete the least recently used files until the cache directory is under its size limit."""
+        entries = []
+        try:
+            paths = list(self.directory.glob("*.npz"))
+        except OSError:
+            return
+        for path in paths:
+            try:
+                status = path.stat()
+            except OSError:
+                continue
+            entries.append((status.st_mtime, status.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_limit:
+                break
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self) -> None:
+        """Forget every entry, in memory and on disk."""
+        self.memory.clear()
+        self.memory_bytes = 0
+        if self.directory is not None:
+            for path in self.directory.glob("*.npz"):
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    continue
+
+    def potential_grid(
+        self,
+        system: System,
+        minimum: Point,
+        maximum: Point,
+        width: int,
+        height: int,
+        workers: int = 1,
+    ) -> np.ndarray:
+        """Calculate the electric potential over an evenly spaced grid of the viewport, reusing earlier results."""
+        key = self.key(system, "potential", minimum, maximum, width, height)
+        cached = self.get(key)
+        if cached is not None:
+            return cached[0]
+        potentials = system.potential_grid(
+            *np.meshgrid(
+                np.linspace(minimum.x, maximum.x, width),
+                np.linspace(minimum.y, maximum.y, height),
+            ),
+            workers=workers,
+        )
+        self.put(key, (potentials,))
+        return potentials
+
+    def field_grid(
+        self,
+        system: System,
+        minimum: Point,
+        maximum: Point,
+        width: int,
+        height: int,
+        workers: int = 1,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate the electric field components over an evenly spaced grid of the viewport, reusing earlier results."""
+        key = self.key(system, "field", minimum, maximum, width, height)
+        cached = self.get(key)
+        if cached is not None:
+            return cached[0], cached[1]
+        field_x, field_y = system.field_grid(
+            *np.meshgrid(
+                np.linspace(minimum.x, maximum.x, width),
+                np.linspace(minimum.y, maximum.y, height),
+            ),
+            workers=workers,
+        )
+        self.put(key, (field_x, field_y))
+        return field_x, field_y
+
+
+default_cache: GridCache = GridCache(directory=default_directory())
+"""Cache shared by render_system and text_system, in memory only unless CHARGES_CACHE names a directory."""
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
@@ -3,10 +3,15 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from collections.abc import Iterator
+from typing import Protocol
+from math import tau, sqrt, hypot
+import numpy as np
 from points import Point
+from store import ChargeStore, empty_segments
+from kernels import ELECTROSTATIC_CONSTANT
+from parallel import map_tiles
+import instrument
 
-ELECTROSTATIC_CONSTANT: float = 8.9875517923e9
-"""Electrostatic constant in Newtons, meters squared per Coulombs squared."""
 ELEMENTARY_CHARGE: float = 1.602176634e-19
 """Charge of basic unit in Coulombs."""
 PROTON_CHARGE: float = ELEMENTARY_CHARGE
@@ -17,40 +22,188 @@ NEUTRON_CHARGE: float = 0
 """Charge of a neutron in Coulombs."""
 
 
+class Engine(Protocol):
+    """Approximation engine that evaluates a charge store in place of the direct sum."""
+
+    def field_grid(
+        self, store: ChargeStore, xs: np.ndarray, ys: np.ndarray, /
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Calculation of electric field over arrays of points."""
+        ...
+
+    def potential_grid(
+        self, store: ChargeStore, xs: np.ndarray, ys: np.ndarray, /
+    ) -> np.ndarray:
+        """Calculation of electric potential over arrays of points."""
+        ...
+
+
 class System:
     """System of charges."""
 
     charges: list[Charge]
+    store: ChargeStore
+    engine: Engine | None
+    retained: list[RetainedGrid]
 
-    def __init__(self, charges: list[Charge]) -> None:
-        """Create a system of charges."""
+    def __init__(self, charges: list[Charge], engine: Engine | None = None) -> None:
+        """Create a system of charges, evaluated directly unless an approximation engine is given."""
         self.charges = charges
+        self.engine = engine
+        self.retained = []
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Flatten the sources of every charge into the store."""
+        self.store = ChargeStore(
+            [charge.arrays() for charge in self.charges],
+            [charge.segments() for charge in self.charges],
+        )
+
+    def retain(
+        self, xs: np.ndarray, ys: np.ndarray, /, workers: int = 1, field: bool = True
+    ) -> RetainedGrid:
+        """Calculate the electric potential, and field unless told otherwise, at arrays of points and keep them up to date as charges change."""
+        xs, ys = np.broadcast_arrays(
+            np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+        )
+        field_x, field_y = (
+            self.field_grid(xs, ys, workers=workers) if field else (None, None)
+        )
+        potential = self.potential_grid(xs, ys, workers=workers)
+        grid = RetainedGrid(xs.copy(), ys.copy(), potential, field_x, field_y)
+        self.retained.append(grid)
+        return grid
+
+    def release(self, grid: RetainedGrid, /) -> None:
+        """Stop keeping a retained grid up to date."""
+        self.retained.remove(grid)
+
+    def superpose(
+        self,
+        sources: tuple[tuple[np.ndarray, ...], tuple[np.ndarray, ...]],
+        sign: float,
+    ) -> None:
+        """Add or subtract the contribution of the sources of one charge to every retained grid."""
+        if len(self.retained) == 0:
+            return
+        store = ChargeStore([sources[0]], [sources[1]])
+        for grid in self.retained:
+            grid.potential += sign * store.potential_grid(grid.xs, grid.ys)
+            if grid.field_x is not None:
+                field_x, field_y = store.field_grid(grid.xs, grid.ys)
+                grid.field_x += sign * field_x
+                grid.field_y += sign * field_y
+
+    def add(self, charge: Charge, /) -> None:
+        """Add a charge to the system, updating the retained grids with its contribution alone."""
+        sources = (charge.arrays(), charge.segments())
+        self.superpose(sources, 1)
+        self.store = self.store.splice(len(self.charges), *sources)
+        self.charges.append(charge)
+
+    def remove(self, charge: Charge, /) -> None:
+        """Remove a charge from the system, updating the retained grids with its contribution alone."""
+        index = self.index(charge)
+        self.superpose(self.store.sources(index), -1)
+        self.store = self.store.splice(index)
+        del self.charges[index]
+
+    def update(self, charge: Charge, /) -> None:
+        """Account for a charge of the system having been moved or changed, updating the retained grids by the difference."""
+        index = self.index(charge)
+        sources = (charge.arrays(), charge.segments())
+        # The store still holds the sources of the charge as they were, which are all there is to subtract.
+        self.superpose(self.store.sources(index), -1)
+        self.superpose(sources, 1)
+        self.store = self.store.splice(index, *sources)
+
+    def index(self, charge: Charge, /) -> int:
+        """Find the position of a charge in the system by identity."""
+        for index, other in enumerate(self.charges):
+            if other is charge:
+                return index
+        raise ValueError("The charge is not part of the system.")
 
     def field(self, point: Point, /) -> Point:
         """Calculate the electric field at the specified point in the system."""
-        field = Point(0, 0)
-        for charge in self.charges:
-            field += charge.field(point)
-        return field
+        field_x, field_y = self.field_grid(point.x, point.y)
+        return Point(float(field_x), float(field_y))
 
     def fields(self, point: Point, /) -> Iterator[Point]:
         """Calculate the independent electric fields caused by each charge at the specified point in the system."""
-        for charge in self.charges:
-            field = charge.field(point)
+        _, field_x, field_y = self.store.contributions(point.x, point.y)
+        for field_x, field_y in zip(field_x, field_y):
+            field = Point(float(field_x), float(field_y))
             yield field
 
     def potential(self, point: Point, /) -> float:
         """Calculate the electric potential at the specified point in the system."""
-        potential = 0.0
-        for charge in self.charges:
-            potential += charge.potential(point)
-        return potential
+        return float(self.potential_grid(point.x, point.y))
 
     def potentials(self, point: Point, /) -> Iterator[float]:
         """Calculate the independent electric potentials caused by each charge at the specified point in the system."""
-        for charge in self.charges:
-            potential = charge.potential(point)
-            yield potential
+        potential, _, _ = self.store.contributions(point.x, point.y)
+        for potential in potential:
+            yield float(potential)
+
+    def field_grid(
+        self, xs: np.ndarray, ys: np.ndarray, /, workers: int = 1
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate the electric field components at arrays of points in the system, split over the specified number of threads unless an engine or the compiled kernels evaluate it."""
+        self.tally("field", xs, ys)
+        with instrument.phase("field grid"):
+            # Engines evaluate the whole grid at once, so their tree is built and their expansions computed once.
+            if self.engine is not None:
+                return self.engine.field_grid(self.store, xs, ys)
+            return map_tiles(self.store.field_grid, xs, ys, workers, self.store.compiled)
+
+    def potential_grid(
+        self, xs: np.ndarray, ys: np.ndarray, /, workers: int = 1
+    ) -> np.ndarray:
+        """Calculate the electric potential at arrays of points in the system, split over the specified number of threads unless an engine or the compiled kernels evaluate it."""
+        self.tally("potential", xs, ys)
+        with instrument.phase("potential grid"):
+            # Engines evaluate the whole grid at once, so their tree is built and their expansions computed once.
+            if self.engine is not None:
+                return self.engine.potential_grid(self.store, xs, ys)
+            return map_tiles(self.store.potential_grid, xs, ys, workers, self.store.compiled)
+
+    def tally(self, kind: str, xs: np.ndarray, ys: np.ndarray, /) -> None:
+        """Count an evaluation of the system, the points it covers and the pairs of points and sources it takes."""
+        if instrument.active is None:
+            return
+        points = np.broadcast(xs, ys).size
+        instrument.count(f"{kind} evaluations")
+        instrument.count(f"{kind} points", points)
+        instrument.count(
+            f"{kind} interactions", points * (len(self.store) + len(self.store.line_q))
+        )
+
+
+class RetainedGrid:
+    """Electric potential and field of a system at fixed arrays of points, updated by superposition as charges change."""
+
+    xs: np.ndarray
+    ys: np.ndarray
+    potential: np.ndarray
+    field_x: np.ndarray | None
+    field_y: np.ndarray | None
+
+    def __init__(
+        self,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        potential: np.ndarray,
+        field_x: np.ndarray | None = None,
+        field_y: np.ndarray | None = None,
+    ) -> None:
+        """Create a retained grid from already calculated values, without the field if it is not given."""
+        self.xs = xs
+        self.ys = ys
+        self.potential = potential
+        self.field_x = field_x
+        self.field_y = field_y
 
 
 class Charge(ABC):
@@ -72,6 +225,31 @@ class Charge(ABC):
         """Calculation of electric potential, that all charges inheriting this class should implement."""
         pass
 
+    @abstractmethod
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Positions and charges of the point sources making up the charge, that all charges inheriting this class should implement."""
+        pass
+
+    def segments(
+        self,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Find the end points and charges of the uniformly charged segments making up the charge."""
+        return empty_segments()
+
+    def move(self, offset: Point, /) -> None:
+        """Translate the charge by the specified offset, for the charges that support it."""
+        raise NotImplementedError(f"{type(self).__name__} cannot be moved.")
+
+    def field_grid(
+        self, xs: np.ndarray, ys: np.ndarray, /
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate the electric field components at arrays of points."""
+        return ChargeStore([self.arrays()], [self.segments()]).field_grid(xs, ys)
+
+    def potential_grid(self, xs: np.ndarray, ys: np.ndarray, /) -> np.ndarray:
+        """Calculate the electric potential at arrays of points."""
+        return ChargeStore([self.arrays()], [self.segments()]).potential_grid(xs, ys)
+
 
 class PointCharge(Charge):
     """Point charge."""
@@ -86,55 +264,168 @@ class PointCharge(Charge):
 
     def field(self, point: Point, /) -> Point:
         """Calculate the electric field at the specified point."""
-        try:
-            field = (
-                ELECTROSTATIC_CONSTANT * self.charge / self.point.dist(point) ** 2
-            ) * (point - self.point).norm()
-        except ZeroDivisionError:
-            field = Point(0, 0)
-        return field
+        return Point(*self.field_at(point.x, point.y))
+
+    def potential(self, point: Point, /) -> float:
+        """Calculate the electric potential at the specified point."""
+        return self.potential_at(point.x, point.y)
+
+    def field_at(self, x: float, y: float, /) -> tuple[float, float]:
+        """Calculate the electric field components at the specified coordinates, without creating any point."""
+        dx = x - self.point.x
+        dy = y - self.point.y
+        distance_squared = dx * dx + dy * dy
+        if distance_squared == 0:
+            return 0.0, 0.0
+        scale = ELECTROSTATIC_CONSTANT * self.charge / (distance_squared * sqrt(distance_squared))
+        return scale * dx, scale * dy
+
+    def potential_at(self, x: float, y: float, /) -> float:
+        """Calculate the electric potential at the specified coordinates, without creating any point."""
+        distance = hypot(x - self.point.x, y - self.point.y)
+        if distance == 0:
+            return 0
+        return ELECTROSTATIC_CONSTANT * self.charge / distance
+
+    def move(self, offset: Point, /) -> None:
+        """Translate the point charge by the specified offset."""
+        self.point = self.point + offset
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Find the position and charge of the point charge as arrays."""
+        return (
+            np.array([self.point.x], dtype=float),
+            np.array([self.point.y], dtype=float),
+            np.array([self.charge], dtype=float),
+        )
+
+
+class DiscreteCharge(Charge):
+    """Charge distributed over a finite number of point charges, kept as arrays."""
+
+    xs: np.ndarray
+    ys: np.ndarray
+    qs: np.ndarray
+
+    def __init__(self, charge: float, xs: np.ndarray, ys: np.ndarray) -> None:
+        """Create a charge spread evenly over the specified positions, not meant to be called directly."""
+        super().__init__(charge)
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+        self.qs = np.full(len(self.xs), charge / len(self.xs))
+
+    @property
+    def point_charges(self) -> list[PointCharge]:
+        """Build the point charges making up the charge."""
+        return [
+            PointCharge(float(q), Point(float(x), float(y)))
+            for x, y, q in zip(self.xs, self.ys, self.qs)
+        ]
+
+    def field(self, point: Point, /) -> Point:
+        """Calculate the electric field at the specified point."""
+        field_x, field_y = self.field_grid(point.x, point.y)
+        return Point(float(field_x), float(field_y))
 
     def potential(self, point: Point, /) -> float:
         """Calculate the electric potential at the specified point."""
-        try:
-            potential = ELECTROSTATIC_CONSTANT * self.charge / self.point.dist(point)
-        except ZeroDivisionError:
-            potential = 0
-        return potential
+        return float(self.potential_grid(point.x, point.y))
+
+    def move(self, offset: Point, /) -> None:
+        """Translate every point charge by the specified offset."""
+        self.xs = self.xs + offset.x
+        self.ys = self.ys + offset.y
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Find the positions and charges of the point charges making up the charge."""
+        return self.xs, self.ys, self.qs
 
 
-class FiniteLineCharge(Charge):
-    """Finite line charge."""
+class FiniteLineCharge(DiscreteCharge):
+    """Finite line charge, either discretized into point charges or evaluated exactly as a uniformly charged segment."""
 
-    point_charges: list[PointCharge]
     point_1: Point
     point_2: Point
+    analytic: bool
 
     def __init__(
-        self, charge: float, point_1: Point, point_2: Point, number_point_charges: int
+        self,
+        charge: float,
+        point_1: Point,
+        point_2: Point,
+        number_point_charges: int,
+        analytic: bool = False,
     ) -> None:
-        super().__init__(charge)
-        self.charge = charge
+        ratios = np.arange(number_point_charges) / (number_point_charges - 1)
+        super().__init__(
+            charge,
+            ratios * point_1.x + (1 - ratios) * point_2.x,
+            ratios * point_1.y + (1 - ratios) * point_2.y,
+        )
         self.point_1 = point_1
         self.point_2 = point_2
-        self.point_charges = []
-        for n in range(number_point_charges):
-            ratio = n / (number_point_charges - 1)
-            point = ratio * point_1 + (1 - ratio) * point_2
-            point_charge = PointCharge(charge / number_point_charges, point)
-            self.point_charges.append(point_charge)
+        self.analytic = analytic
 
-    def field(self, point: Point, /) -> Point:
-        field = Point(0, 0)
-        for point_charge in self.point_charges:
-            field += point_charge.field(point)
-        return field
+    def move(self, offset: Point, /) -> None:
+        """Translate the line and its point charges by the specified offset."""
+        super().move(offset)
+        self.point_1 = self.point_1 + offset
+        self.point_2 = self.point_2 + offset
 
-    def potential(self, point: Point, /) -> float:
-        potential = 0.0
-        for point_charge in self.point_charges:
-            potential += point_charge.potential(point)
-        return potential
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Find the positions and charges of the point charges, none when the line is analytic."""
+        if self.analytic:
+            return np.empty(0), np.empty(0), np.empty(0)
+        return super().arrays()
+
+    def segments(
+        self,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Find the end points and charge of the segment, none when the line is discretized."""
+        if not self.analytic:
+            return super().segments()
+        return (
+            np.array([self.point_1.x], dtype=float),
+            np.array([self.point_1.y], dtype=float),
+            np.array([self.point_2.x], dtype=float),
+            np.array([self.point_2.y], dtype=float),
+            np.array([self.charge], dtype=float),
+        )
+
+
+class CircleCharge(DiscreteCharge):
+    """Circle of charge."""
+
+    center: Point
+    radius: float
+
+    def __init__(
+        self, charge: float, center: Point, radius: float, number_point_charges: int
+    ) -> None:
+        angles = tau * (np.arange(number_point_charges) / number_point_charges)
+        super().__init__(
+            charge,
+            center.x + radius * np.cos(angles),
+            center.y + radius * np.sin(angles),
+        )
+        self.center = center
+        self.radius = radius
+
+    def move(self, offset: Point, /) -> None:
+        """Translate the circle and its point charges by the specified offset."""
+        super().move(offset)
+        self.center = self.center + offset
+
+
+class ChargeArray(DiscreteCharge):
+    """Point charges of arbitrary positions and charges kept as arrays, making up a single charge of the system."""
+
+    def __init__(self, xs: np.ndarray, ys: np.ndarray, qs: np.ndarray) -> None:
+        """Create a charge from arrays of positions and charges, used as they are without copying them."""
+        Charge.__init__(self, float(np.sum(qs)))
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+        self.qs = np.asarray(qs, dtype=float)
 
 
 try:
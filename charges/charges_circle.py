@@ -1,8 +1,8 @@
 try:
     from time import sleep
-    from math import isnan, cos, sin, tau
+    from math import isnan
     from points import Point
-    from charges import System, Charge, PointCharge
+    from charges import System, CircleCharge
     from render import render_system
 
     print(
@@ -25,14 +25,7 @@ try:
             continue
         break
 
-    charges: list[Charge] = []
-    for n in range(100):
-        angle = tau * (n / 100)
-        radius = 3
-        point = Point(5 + radius * cos(angle), 5 + radius * sin(angle))
-        charges.append(PointCharge(charge / 100, point))
-
-    system = System(charges)
+    system = System([CircleCharge(charge, Point(5, 5), 3, 100)])
     print()
     render_system(
         system,
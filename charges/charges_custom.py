@@ -1,8 +1,8 @@
 try:
     from time import sleep
-    from math import isnan, cos, sin, tau
+    from math import isnan
     from points import Point
-    from charges import System, Charge, PointCharge, FiniteLineCharge
+    from charges import System, Charge, PointCharge, FiniteLineCharge, CircleCharge
     from render import render_system
 
 
@@ -55,22 +55,16 @@ try:
         print(
             f"The positions and charge of the finite line charge is \n(({x1:.5f}m, {y1:.5f}m), ({x2:.5f}m, {y2:.5f}m)), {c: .5f}C"
         )
-        return FiniteLineCharge(c, Point(x1, y1), Point(x2, y2), 100)
+        return FiniteLineCharge(c, Point(x1, y1), Point(x2, y2), 100, analytic=True)
 
 
-    def ask_circle_charge() -> list[PointCharge]:
+    def ask_circle_charge() -> CircleCharge:
         print("Circle charge was selected.")
         c = ask_float("-> Total charge in Coulombs is [?]: ")
         xc = ask_float("-> Xc in meters is [?]: ")
         yc = ask_float("-> Yc in meters is [?]: ")
         r = ask_float("-> R in meters is [?]: ")
-        charges = []
-        for n in range(100):
-            angle = tau * (n / 100)
-            radius = r
-            point = Point(xc + radius * cos(angle), yc + radius * sin(angle))
-            charges.append(PointCharge(c / 100, point))
-        return charges
+        return CircleCharge(c, Point(xc, yc), r, 100)
 
 
     all_charges: list[Charge] = []
@@ -110,7 +104,7 @@ try:
             all_charges.append(finite_line_charge)
         elif letter == "C":
             circle_charge = ask_circle_charge()
-            all_charges.extend(circle_charge)
+            all_charges.append(circle_charge)
     try:
         system = System(all_charges)
     except:
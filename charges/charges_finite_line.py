@@ -26,7 +26,7 @@ try:
         break
 
 
-    system = System([FiniteLineCharge(charge, Point(3, 3), Point(7, 7), 100)])
+    system = System([FiniteLineCharge(charge, Point(3, 3), Point(7, 7), 100, analytic=True)])
     print()
     render_system(
         system,
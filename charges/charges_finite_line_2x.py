@@ -39,8 +39,8 @@ try:
 
     system = System(
         [
-            FiniteLineCharge(charge_1, Point(3, 3), Point(3, 7), 100),
-            FiniteLineCharge(charge_2, Point(7, 3), Point(7, 7), 100),
+            FiniteLineCharge(charge_1, Point(3, 3), Point(3, 7), 100, analytic=True),
+            FiniteLineCharge(charge_2, Point(7, 3), Point(7, 7), 100, analytic=True),
         ]
     )
     print()
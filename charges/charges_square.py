@@ -28,10 +28,10 @@ try:
 
     system = System(
         [
-            FiniteLineCharge(charge / 4, Point(3, 7), Point(7, 7), 100),
-            FiniteLineCharge(charge / 4, Point(7, 7), Point(7, 3), 100),
-            FiniteLineCharge(charge / 4, Point(7, 3), Point(3, 3), 100),
-            FiniteLineCharge(charge / 4, Point(3, 3), Point(3, 7), 100),
+            FiniteLineCharge(charge / 4, Point(3, 7), Point(7, 7), 100, analytic=True),
+            FiniteLineCharge(charge / 4, Point(7, 7), Point(7, 3), 100, analytic=True),
+            FiniteLineCharge(charge / 4, Point(7, 3), Point(3, 3), 100, analytic=True),
+            FiniteLineCharge(charge / 4, Point(3, 3), Point(3, 7), 100, analytic=True),
         ]
     )
     print()
@@ -0,0 +1,94 @@
+"""Python module with compiled versions of the point charge kernels, available when Numba is installed.
+
+The kernels leave out the electrostatic constant, which the callers in kernels.py apply, and treat charges at zero
+distance as contributing nothing, like the NumPy kernels.
+
+The kernels run on Numba's own thread pool, which does not survive a fork: a process forked after they ran hangs
+when it exits. Process pools should therefore be started with the spawn or forkserver context, as batch.py does.
+"""
+
+from __future__ import annotations
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+AVAILABLE: bool = njit is not None
+"""Whether Numba is installed and the compiled kernels can be used."""
+
+if AVAILABLE:
+
+    @njit(parallel=True, cache=True)
+    def point_potential(
+        xs: np.ndarray, ys: np.ndarray, px: np.ndarray, py: np.ndarray, pq: np.ndarray
+    ) -> np.ndarray:
+        """Sum the charges over their distances to every target point."""
+        potential = np.zeros(xs.size)
+        for target in prange(xs.size):
+            total = 0.0
+            for source in range(pq.size):
+                dx = xs[target] - px[source]
+                dy = ys[target] - py[source]
+                squared = dx * dx + dy * dy
+                if squared > 0:
+                    total += pq[source] / np.sqrt(squared)
+            potential[target] = total
+        return potential
+
+    @njit(parallel=True, cache=True)
+    def point_field(
+        xs: np.ndarray, ys: np.ndarray, px: np.ndarray, py: np.ndarray, pq: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Sum the charges times their displacements over their cubed distances at every target point."""
+        field_x = np.zeros(xs.size)
+        field_y = np.zeros(xs.size)
+        for target in prange(xs.size):
+            total_x = 0.0
+            total_y = 0.0
+            for source in range(pq.size):
+                dx = xs[target] - px[source]
+                dy = ys[target] - py[source]
+                squared = dx * dx + dy * dy
+                if squared > 0:
+                    weight = pq[source] / (squared * np.sqrt(squared))
+                    total_x += weight * dx
+                    total_y += weight * dy
+            field_x[target] = total_x
+            field_y[target] = total_y
+        return field_x, field_y
+
+    @njit(parallel=True, cache=True)
+    def pair_forces(
+        x: np.ndarray, y: np.ndarray, q: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Sum the forces on every charge from all the others, each thread owning whole rows so no writes collide."""
+        force_x = np.zeros(q.size)
+        force_y = np.zeros(q.size)
+        for i in prange(q.size):
+            total_x = 0.0
+            total_y = 0.0
+            for j in range(q.size):
+                dx = x[i] - x[j]
+                dy = y[i] - y[j]
+                squared = dx * dx + dy * dy
+                if squared > 0:
+                    weight = q[j] / (squared * np.sqrt(squared))
+                    total_x += weight * dx
+                    total_y += weight * dy
+            force_x[i] = q[i] * total_x
+            force_y[i] = q[i] * total_y
+        return force_x, force_y
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
@@ -0,0 +1,246 @@
+"""Python module for extracting equipotential lines of a system of charges as polylines, without plotting."""
+
+from __future__ import annotations
+import numpy as np
+from charges import System
+from points import Point
+
+CASES: dict[int, tuple[tuple[str, str], ...]] = {
+    1: (("left", "bottom"),),
+    2: (("bottom", "right"),),
+    3: (("left", "right"),),
+    4: (("right", "top"),),
+    6: (("bottom", "top"),),
+    7: (("left", "top"),),
+    8: (("top", "left"),),
+    9: (("bottom", "top"),),
+    11: (("right", "top"),),
+    12: (("left", "right"),),
+    13: (("bottom", "right"),),
+    14: (("left", "bottom"),),
+}
+"""Edges joined inside a cell for every unambiguous marching squares case, the bits being the corners above the
+level, counterclockwise from the bottom left."""
+SADDLES: dict[tuple[int, bool], tuple[tuple[str, str], ...]] = {
+    (5, True): (("bottom", "right"), ("top", "left")),
+    (5, False): (("left", "bottom"), ("right", "top")),
+    (10, True): (("left", "bottom"), ("right", "top")),
+    (10, False): (("bottom", "right"), ("top", "left")),
+}
+"""Edges joined inside a cell for the two saddle cases, depending on whether the cell center is above the level."""
+
+
+class Crossings:
+    """Points where a level crosses the edges of a grid, numbered by edge so that neighboring cells share them.
+
+    Horizontal edges come first, numbered by their left corner, then vertical edges, numbered by their bottom corner.
+    """
+
+    xs: np.ndarray
+    ys: np.ndarray
+    values: np.ndarray
+    level: float
+
+    def __init__(
+        self, xs: np.ndarray, ys: np.ndarray, values: np.ndarray, level: float
+    ) -> None:
+        """Create the crossings of a level over a grid with the specified coordinates and values, rows going up."""
+        self.xs = xs
+        self.ys = ys
+        self.values = values
+        self.level = level
+
+    def edge(self, name: str, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """Find the number of the specified edge of every cell."""
+        height, width = self.values.shape
+        if name == "bottom":
+            return rows * width + columns
+        if name == "top":
+            return (rows + 1) * width + columns
+        if name == "left":
+            return height * width + rows * width + columns
+        return height * width + rows * width + columns + 1
+
+    def ends(
+        self, edges: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Find the rows and columns of the two grid points at the ends of every edge."""
+        height, width = self.values.shape
+        vertical = edges >= height * width
+        rows, columns = np.divmod(
+            np.where(vertical, edges - height * width, edges), width
+        )
+        return rows, columns, rows + vertical, columns + ~vertical
+
+    def points(self, edges: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Interpolate linearly where the level crosses every edge."""
+        row_1, column_1, row_2, column_2 = self.ends(edges)
+        value_1 = self.values[row_1, column_1]
+        value_2 = self.values[row_2, column_2]
+        fraction = (self.level - value_1) / (value_2 - value_1)
+        return (
+            self.xs[column_1] + fraction * (self.xs[column_2] - self.xs[column_1]),
+            self.ys[row_1] + fraction * (self.ys[row_2] - self.ys[row_1]),
+        )
+
+    def refine(
+        self, system: System, edges: np.ndarray, iterations: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Find where the exact potential crosses the level along every edge, with the Illinois variant of regula falsi.
+
+        The closest point to the level found along every edge is returned, rather than the last one tried.
+        """
+        if iterations == 0:
+            return self.points(edges)
+        row_1, column_1, row_2, column_2 = self.ends(edges)
+        x_1, y_1 = self.xs[column_1], self.ys[row_1]
+        x_2, y_2 = self.xs[column_2], self.ys[row_2]
+        low = np.zeros(len(edges))
+        high = np.ones(len(edges))
+        value_low = self.values[row_1, column_1] - self.level
+        value_high = self.values[row_2, column_2] - self.level
+        # Side moved by the last iteration, 1 for the low end, -1 for the high end and 0 before the first one.
+        last = np.zeros(len(edges), dtype=int)
+        best = np.zeros(len(edges))
+        best_value = np.full(len(edges), np.inf)
+        for _ in range(iterations):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                fraction = (low * value_high - high * value_low) / (
+                    value_high - value_low
+                )
+            fraction = np.where(np.isfinite(fraction), fraction, (low + high) / 2)
+            value = (
+                system.potential_grid(
+                    x_1 + fraction * (x_2 - x_1), y_1 + fraction * (y_2 - y_1)
+                )
+                - self.level
+            )
+            closer = np.abs(value) < best_value
+            best = np.where(closer, fraction, best)
+            best_value = np.where(closer, np.abs(value), best_value)
+            moved_low = np.sign(value) == np.sign(value_low)
+            low = np.where(moved_low, fraction, low)
+            high = np.where(moved_low, high, fraction)
+            # An end kept twice in a row has its value halved, so the bracket shrinks from both sides.
+            value_high = np.where(
+                moved_low, np.where(last == 1, value_high / 2, value_high), value
+            )
+            value_low = np.where(
+                moved_low, value, np.where(last == -1, value_low / 2, value_low)
+            )
+            last = np.where(moved_low, 1, -1)
+        return x_1 + best * (x_2 - x_1), y_1 + best * (y_2 - y_1)
+
+
+def segments(values: np.ndarray, level: float) -> tuple[np.ndarray, np.ndarray]:
+    """Find the pairs of edges joined by the level inside every cell of a grid, by marching squares."""
+    above = values > level
+    crossings = Crossings(np.empty(0), np.empty(0), values, level)
+    case = (
+        above[:-1, :-1] * 1
+        + above[:-1, 1:] * 2
+        + above[1:, 1:] * 4
+        + above[1:, :-1] * 8
+    )
+    center = (
+        values[:-1, :-1] + values[:-1, 1:] + values[1:, 1:] + values[1:, :-1]
+    ) / 4 > level
+    first: list[np.ndarray] = []
+    second: list[np.ndarray] = []
+    joins = [((case == number), pairs) for number, pairs in CASES.items()]
+    joins += [
+        ((case == number) & (center == high), pairs)
+        for (number, high), pairs in SADDLES.items()
+    ]
+    for selected, pairs in joins:
+        rows, columns = np.nonzero(selected)
+        for start, stop in pairs:
+            first.append(crossings.edge(start, rows, columns))
+            second.append(crossings.edge(stop, rows, columns))
+    if len(first) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(first), np.concatenate(second)
+
+
+def chains(first: np.ndarray, second: np.ndarray) -> list[list[int]]:
+    """Join segments sharing an edge into chains of edges, open chains first, closed ones ending where they start."""
+    neighbors: dict[int, list[int]] = {}
+    for start, stop in zip(first.tolist(), second.tolist()):
+        neighbors.setdefault(start, []).append(stop)
+        neighbors.setdefault(stop, []).append(start)
+    result: list[list[int]] = []
+    # Open chains start at an edge on the border of the grid, which only one segment reaches.
+    starts = [edge for edge, others in neighbors.items() if len(others) == 1]
+    starts += [edge for edge, others in neighbors.items() if len(others) != 1]
+    for start in starts:
+        if len(neighbors[start]) == 0:
+            continue
+        chain = [start]
+        edge = start
+        while neighbors[edge]:
+            following = neighbors[edge].pop()
+            neighbors[following].remove(edge)
+            chain.append(following)
+            edge = following
+        result.append(chain)
+    return result
+
+
+def contour_lines(
+    values: np.ndarray,
+    xs: np.ndarray,
+    ys: np.ndarray,
+    level: float,
+    system: System | None = None,
+    iterations: int = 0,
+) -> list[np.ndarray]:
+    """Extract the polylines of a level from a grid of values, rows going up, as arrays of points.
+
+    With a system and iterations given, every vertex is moved to where the exact potential crosses the level along
+    its grid edge, the grid values being the potential of that system.
+    """
+    crossings = Crossings(xs, ys, values, level)
+    edges = chains(*segments(values, level))
+    if len(edges) == 0:
+        return []
+    flat = np.concatenate([np.array(chain) for chain in edges])
+    if system is None:
+        x, y = crossings.points(flat)
+    else:
+        x, y = crossings.refine(system, flat, iterations)
+    bounds = np.cumsum([0] + [len(chain) for chain in edges])
+    return [
+        np.column_stack([x[start:stop], y[start:stop]])
+        for start, stop in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def contours(
+    system: System,
+    minimum: Point,
+    maximum: Point,
+    levels: list[float],
+    size: int = 100,
+    iterations: int = 0,
+    workers: int = 1,
+) -> dict[float, list[np.ndarray]]:
+    """Extract the equipotential polylines of a system over a viewport for every level, refined by root finding if asked."""
+    xs = np.linspace(minimum.x, maximum.x, size)
+    ys = np.linspace(minimum.y, maximum.y, size)
+    values = system.potential_grid(*np.meshgrid(xs, ys), workers=workers)
+    return {
+        level: contour_lines(values, xs, ys, level, system, iterations)
+        for level in levels
+    }
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
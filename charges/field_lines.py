@@ -0,0 +1,166 @@
+"""Python module for tracing electric field lines of a system of charges, integrating all of them at once."""
+
+from __future__ import annotations
+from math import tau
+import numpy as np
+from charges import System
+from points import Point
+from integrators import dormand_prince
+from kernels import blocks
+from store import ChargeStore
+
+SEGMENT_SAMPLES: int = 16
+"""Number of points every uniformly charged segment is represented by when placing seeds."""
+
+
+def seeds(
+    store: ChargeStore, lines: int, radius: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Place the starting points of field lines around every charge, in proportion to its absolute charge.
+
+    Returns the positions along with the direction of travel along the field, away from positive charges and
+    towards negative ones.
+    """
+    fractions = (np.arange(SEGMENT_SAMPLES) + 0.5) / SEGMENT_SAMPLES
+    x = np.concatenate(
+        [store.x, np.ravel(store.x1[:, None] * (1 - fractions) + store.x2[:, None] * fractions)]
+    )
+    y = np.concatenate(
+        [store.y, np.ravel(store.y1[:, None] * (1 - fractions) + store.y2[:, None] * fractions)]
+    )
+    group = np.concatenate(
+        [store.group, np.repeat(store.line_group, SEGMENT_SAMPLES)]
+    )
+    charges = store.reduce(store.q, store.line_q)
+    total = np.abs(charges).sum()
+    seed_x: list[np.ndarray] = []
+    seed_y: list[np.ndarray] = []
+    direction: list[np.ndarray] = []
+    if total == 0:
+        return np.empty(0), np.empty(0), np.empty(0)
+    for index, charge in enumerate(charges):
+        members = np.flatnonzero(group == index)
+        if charge == 0 or len(members) == 0:
+            continue
+        count = max(1, round(lines * abs(charge) / total))
+        # Seeds go around the sources in turn, spread evenly around a single source or by the golden angle.
+        chosen = members[np.arange(count) * len(members) // count]
+        if len(members) > 1:
+            angles = np.pi * (1 + 5**0.5) * np.arange(count)
+        else:
+            angles = tau * np.arange(count) / count
+        seed_x.append(x[chosen] + radius * np.cos(angles))
+        seed_y.append(y[chosen] + radius * np.sin(angles))
+        direction.append(np.full(count, np.sign(charge)))
+    return np.concatenate(seed_x), np.concatenate(seed_y), np.concatenate(direction)
+
+
+def clearance(store: ChargeStore, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Find the distance from every point to the closest point source or segment."""
+    distance = np.full(len(x), np.inf)
+    for block in blocks(len(x), len(store) + len(store.line_q)):
+        bx = x[block, None]
+        by = y[block, None]
+        if len(store) > 0:
+            distance[block] = np.hypot(bx - store.x, by - store.y).min(axis=1)
+        if len(store.line_q) > 0:
+            dx = store.x2 - store.x1
+            dy = store.y2 - store.y1
+            along = np.clip(
+                ((bx - store.x1) * dx + (by - store.y1) * dy) / (dx**2 + dy**2), 0, 1
+            )
+            distance[block] = np.minimum(
+                distance[block],
+                np.hypot(
+                    bx - store.x1 - along * dx, by - store.y1 - along * dy
+                ).min(axis=1),
+            )
+    return distance
+
+
+class FieldLineTracer:
+    """Tracer integrating field lines by arc length with embedded Dormand-Prince steps, each line with its own step.
+
+    Lines start on a small circle around the charges and stop when they come back within half that radius of a
+    charge, leave the viewport, reach a point where the field vanishes, or run out of steps.
+    """
+
+    tolerance: float
+    radius: float
+    maximum_steps: int
+
+    def __init__(
+        self, tolerance: float = 1e-4, radius: float = 0.01, maximum_steps: int = 1000
+    ) -> None:
+        """Create a tracer with a position tolerance and a seed radius given as fractions of the viewport size."""
+        self.tolerance = tolerance
+        self.radius = radius
+        self.maximum_steps = maximum_steps
+
+    def trace(
+        self, system: System, minimum: Point, maximum: Point, lines: int = 100
+    ) -> list[np.ndarray]:
+        """Trace about the specified number of field lines, returning the points of every line as an array of rows."""
+        size = max(maximum.x - minimum.x, maximum.y - minimum.y)
+        radius = self.radius * size
+        tolerance = self.tolerance * size
+        largest = size / 50
+        x, y, direction = seeds(system.store, lines, radius)
+        paths = [[(x[n], y[n])] for n in range(len(x))]
+        active = np.arange(len(x))
+        step = np.full(len(x), radius / 4)
+        travelled = np.zeros(len(x))
+
+        def derivative(state: np.ndarray) -> np.ndarray:
+            """Find the unit field direction at the positions of the active lines."""
+            field_x, field_y = system.field_grid(state[0], state[1])
+            length = np.hypot(field_x, field_y)
+            length[length == 0] = np.inf
+            sign = direction[active]
+            return np.stack([sign * field_x / length, sign * field_y / length])
+
+        for _ in range(self.maximum_steps):
+            if len(active) == 0:
+                break
+            state = np.stack([x[active], y[active]])
+            new_state, error = dormand_prince(derivative, state, step[active])
+            error = np.hypot(error[0], error[1])
+            accepted = (error <= tolerance) | (step[active] <= tolerance)
+            with np.errstate(divide="ignore"):
+                factor = np.clip(0.9 * (tolerance / error) ** (1 / 5), 0.2, 5.0)
+            # Lines move at unit speed, so one that barely moves has reached a point without field.
+            stalled = accepted & (
+                np.hypot(new_state[0] - state[0], new_state[1] - state[1])
+                < step[active] / 2
+            )
+            travelled[active[accepted]] += step[active[accepted]]
+            x[active[accepted]] = new_state[0, accepted]
+            y[active[accepted]] = new_state[1, accepted]
+            step[active] = np.clip(step[active] * factor, tolerance, largest)
+            for n in active[accepted]:
+                paths[n].append((x[n], y[n]))
+            finished = (
+                stalled
+                | (x[active] < minimum.x)
+                | (x[active] > maximum.x)
+                | (y[active] < minimum.y)
+                | (y[active] > maximum.y)
+                | (
+                    (travelled[active] > 2 * radius)
+                    & (clearance(system.store, x[active], y[active]) < radius / 2)
+                )
+            )
+            active = active[~finished]
+        return [np.array(path) for path in paths]
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
@@ -0,0 +1,330 @@
+"""Python module for evaluating electric field and potential of many point charges with the fast multipole method."""
+
+from __future__ import annotations
+from math import ceil, log
+import numpy as np
+from kernels import BLOCK_SIZE, point_field, point_potential
+from multipole import l2l, l2p, m2l, m2m, powers, truncation
+from store import ChargeStore
+
+CONVERGENCE_RATIO: float = 0.35
+"""Ratio by which each extra expansion order shrinks the error between well separated boxes."""
+MAXIMUM_ORDER: int = 40
+"""Highest expansion order chosen from a tolerance."""
+
+
+class FMMEngine:
+    """Fast multipole engine evaluating the point charges of a system in linear time through a uniform quadtree."""
+
+    tolerance: float
+    order: int
+    leaf_size: int
+
+    def __init__(
+        self, tolerance: float = 1e-6, order: int | None = None, leaf_size: int = 32
+    ) -> None:
+        """Create a fast multipole engine meeting the relative tolerance, unless the expansion order is given directly."""
+        self.tolerance = tolerance
+        if order is None:
+            order = min(MAXIMUM_ORDER, max(1, ceil(log(tolerance) / log(CONVERGENCE_RATIO))))
+        self.order = order
+        self.leaf_size = leaf_size
+
+    def field_grid(
+        self, store: ChargeStore, xs: np.ndarray, ys: np.ndarray, /
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Approximate the electric field components of the store at arrays of points."""
+        xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+        _, field_x, field_y = self.evaluate(store, xs.ravel(), ys.ravel(), field=True)
+        line_field_x, line_field_y = store.segment_field_grid(xs, ys)
+        return (
+            field_x.reshape(xs.shape) + line_field_x,
+            field_y.reshape(xs.shape) + line_field_y,
+        )
+
+    def potential_grid(
+        self, store: ChargeStore, xs: np.ndarray, ys: np.ndarray, /
+    ) -> np.ndarray:
+        """Approximate the electric potential of the store at arrays of points."""
+        xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+        potential, _, _ = self.evaluate(store, xs.ravel(), ys.ravel(), field=False)
+        return potential.reshape(xs.shape) + store.segment_potential_grid(xs, ys)
+
+    def validate(
+        self,
+        store: ChargeStore,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        samples: int = 100,
+        seed: int = 0,
+    ) -> tuple[float, float]:
+        """Find the relative errors of the potential and field against the direct sum at a random sample of the points."""
+        xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+        chosen = np.random.default_rng(seed).choice(
+            xs.size, min(samples, xs.size), replace=False
+        )
+        xs = xs.ravel()[chosen]
+        ys = ys.ravel()[chosen]
+        potential = self.potential_grid(store, xs, ys)
+        potential_exact = store.potential_grid(xs, ys)
+        field = np.array(self.field_grid(store, xs, ys))
+        field_exact = np.array(store.field_grid(xs, ys))
+        return (
+            float(
+                np.abs(potential - potential_exact).max()
+                / max(np.abs(potential_exact).max(), np.finfo(float).tiny)
+            ),
+            float(
+                np.hypot(*(field - field_exact)).max()
+                / max(np.hypot(*field_exact).max(), np.finfo(float).tiny)
+            ),
+        )
+
+    def evaluate(
+        self, store: ChargeStore, xs: np.ndarray, ys: np.ndarray, field: bool
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Evaluate the potential or field of the point charges at flat arrays of points."""
+        values = [np.zeros(len(xs)) for _ in range(3)]
+        if len(store) == 0 or len(xs) == 0:
+            return tuple(values)
+        tree = Boxes(store.x, store.y, xs, ys, self.leaf_size)
+        local = self.expand(tree, store.q)
+        self.far(tree, local, xs, ys, field, values)
+        self.near(tree, store, xs, ys, field, values)
+        return tuple(values)
+
+    def expand(self, tree: Boxes, q: np.ndarray) -> np.ndarray:
+        """Run the upward and downward passes, returning the local expansions of the leaf boxes."""
+        order = self.order
+        kept = truncation(order)
+        # Multipole moments of the leaf boxes, accumulated one power of the offset at a time.
+        s = powers(tree.offset(tree.sources_x, tree.sources_y, tree.sources_box, tree.levels), order)
+        boxes = 4**tree.levels
+        moments = np.zeros((boxes, order + 1, order + 1), dtype=complex)
+        for j in range(order + 1):
+            weighted = (q[tree.sources] * s[:, j])[:, np.newaxis] * s[:, : order + 1 - j].conj()
+            for k in range(order + 1 - j):
+                moments[:, j, k] = np.bincount(
+                    tree.sources_box, weights=weighted[:, k].real, minlength=boxes
+                ) + 1j * np.bincount(
+                    tree.sources_box, weights=weighted[:, k].imag, minlength=boxes
+                )
+        moments[:, ~kept] = 0
+        side = 2**tree.levels
+        upward = {tree.levels: moments.reshape(side, side, order + 1, order + 1)}
+        for level in range(tree.levels, 2, -1):
+            width = tree.size / 2**level
+            children = upward[level]
+            parents = np.zeros(
+                (side // 2, side // 2, order + 1, order + 1), dtype=complex
+            )
+            for quadrant_y in range(2):
+                for quadrant_x in range(2):
+                    parents += m2m(
+                        children[quadrant_y::2, quadrant_x::2],
+                        (quadrant_x - 0.5) * width,
+                        (quadrant_y - 0.5) * width,
+                        order,
+                    )
+            side //= 2
+            upward[level - 1] = parents
+        local = None
+        for level in range(2, tree.levels + 1):
+            side = 2**level
+            width = tree.size / side
+            if local is None:
+                local = np.zeros((side, side, order + 1, order + 1), dtype=complex)
+            else:
+                parents = local
+                local = np.zeros((side, side, order + 1, order + 1), dtype=complex)
+                for quadrant_y in range(2):
+                    for quadrant_x in range(2):
+                        local[quadrant_y::2, quadrant_x::2] = l2l(
+                            parents,
+                            (quadrant_x - 0.5) * width,
+                            (quadrant_y - 0.5) * width,
+                            order,
+                        )
+            self.interact(upward[level], local, width)
+        return local.reshape(-1, order + 1, order + 1)
+
+    def interact(self, moments: np.ndarray, local: np.ndarray, width: float) -> None:
+        """Add the multipole to local conversions between all well separated boxes whose parents are neighbors."""
+        side = moments.shape[0]
+        half = side // 2
+        for offset_y in range(-3, 4):
+            for offset_x in range(-3, 4):
+                if max(abs(offset_x), abs(offset_y)) < 2:
+                    continue
+                for parity_y in range(2):
+                    if not -2 <= parity_y + offset_y <= 3:
+                        continue
+                    for parity_x in range(2):
+                        if not -2 <= parity_x + offset_x <= 3:
+                            continue
+                        # Targets are parity + 2a, sources are shifted by the offset and must stay inside.
+                        low_x = max(0, -((parity_x + offset_x) // 2))
+                        high_x = min(half, (side - parity_x - offset_x + 1) // 2)
+                        low_y = max(0, -((parity_y + offset_y) // 2))
+                        high_y = min(half, (side - parity_y - offset_y + 1) // 2)
+                        if low_x >= high_x or low_y >= high_y:
+                            continue
+                        targets = (
+                            slice(parity_y + 2 * low_y, parity_y + 2 * high_y - 1, 2),
+                            slice(parity_x + 2 * low_x, parity_x + 2 * high_x - 1, 2),
+                        )
+                        sources = (
+                            slice(
+                                parity_y + offset_y + 2 * low_y,
+                                parity_y + offset_y + 2 * high_y - 1,
+                                2,
+                            ),
+                            slice(
+                                parity_x + offset_x + 2 * low_x,
+                                parity_x + offset_x + 2 * high_x - 1,
+                                2,
+                            ),
+                        )
+                        local[targets] += m2l(
+                            moments[sources],
+                            -offset_x * width,
+                            -offset_y * width,
+                            moments.shape[-1] - 1,
+                        )
+
+    def far(
+        self,
+        tree: Boxes,
+        local: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        field: bool,
+        values: list[np.ndarray],
+    ) -> None:
+        """Evaluate the local expansions of the leaf boxes at the targets inside them."""
+        order = self.order
+        w = tree.offset(xs, ys, tree.targets_box_unsorted, tree.levels)
+        step = max(1, BLOCK_SIZE // (order + 1) ** 2)
+        for start in range(0, len(xs), step):
+            block = slice(start, start + step)
+            potential, field_x, field_y = l2p(
+                local[tree.targets_box_unsorted[block]], w[block].real, w[block].imag, order
+            )
+            if field:
+                values[1][block] += field_x
+                values[2][block] += field_y
+            else:
+                values[0][block] += potential
+
+    def near(
+        self,
+        tree: Boxes,
+        store: ChargeStore,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        field: bool,
+        values: list[np.ndarray],
+    ) -> None:
+        """Sum directly over the point charges in the leaf boxes neighboring each target box."""
+        side = 2**tree.levels
+        boxes = np.arange(side**2)
+        source_starts = np.searchsorted(tree.sources_box, boxes)
+        source_stops = np.searchsorted(tree.sources_box, boxes, side="right")
+        target_starts = np.searchsorted(tree.targets_box, boxes)
+        target_stops = np.searchsorted(tree.targets_box, boxes, side="right")
+        for box in np.flatnonzero(target_stops > target_starts):
+            box_y, box_x = divmod(int(box), side)
+            neighbors = [
+                np.arange(source_starts[other], source_stops[other])
+                for other_y in range(max(0, box_y - 1), min(side, box_y + 2))
+                for other_x in range(max(0, box_x - 1), min(side, box_x + 2))
+                for other in [other_y * side + other_x]
+                if source_stops[other] > source_starts[other]
+            ]
+            if not neighbors:
+                continue
+            sources = tree.sources[np.concatenate(neighbors)]
+            targets = tree.targets[target_starts[box] : target_stops[box]]
+            if field:
+                field_x, field_y = point_field(
+                    xs[targets], ys[targets], store.x[sources], store.y[sources], store.q[sources]
+                )
+                values[1][targets] += field_x
+                values[2][targets] += field_y
+            else:
+                values[0][targets] += point_potential(
+                    xs[targets], ys[targets], store.x[sources], store.y[sources], store.q[sources]
+                )
+
+
+class Boxes:
+    """Uniform quadtree over the sources and targets, with both sorted by the leaf box they fall in."""
+
+    minimum_x: float
+    minimum_y: float
+    size: float
+    levels: int
+    sources: np.ndarray
+    sources_x: np.ndarray
+    sources_y: np.ndarray
+    sources_box: np.ndarray
+    targets: np.ndarray
+    targets_box: np.ndarray
+    targets_box_unsorted: np.ndarray
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        leaf_size: int,
+    ) -> None:
+        """Bin the sources and targets into leaf boxes holding about the leaf size of sources each."""
+        self.minimum_x = float(min(x.min(), xs.min()))
+        self.minimum_y = float(min(y.min(), ys.min()))
+        size = max(
+            float(max(x.max(), xs.max())) - self.minimum_x,
+            float(max(y.max(), ys.max())) - self.minimum_y,
+        )
+        # Widen slightly so that points on the far edge still fall inside the last box.
+        self.size = size * (1 + 1e-9) if size > 0 else 1.0
+        self.levels = max(2, min(10, round(log(max(1, len(x) / leaf_size), 4))))
+        sources_box = self.box(x, y)
+        self.sources = np.argsort(sources_box, kind="stable")
+        self.sources_box = sources_box[self.sources]
+        self.sources_x = x[self.sources]
+        self.sources_y = y[self.sources]
+        self.targets_box_unsorted = self.box(xs, ys)
+        self.targets = np.argsort(self.targets_box_unsorted, kind="stable")
+        self.targets_box = self.targets_box_unsorted[self.targets]
+
+    def box(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Find the flat index of the leaf box every point falls in."""
+        side = 2**self.levels
+        box_x = np.clip(((x - self.minimum_x) / self.size * side).astype(int), 0, side - 1)
+        box_y = np.clip(((y - self.minimum_y) / self.size * side).astype(int), 0, side - 1)
+        return box_y * side + box_x
+
+    def offset(
+        self, x: np.ndarray, y: np.ndarray, box: np.ndarray, level: int
+    ) -> np.ndarray:
+        """Find the complex offsets of points from the centers of their boxes."""
+        side = 2**level
+        width = self.size / side
+        box_y, box_x = np.divmod(box, side)
+        return (x - self.minimum_x - (box_x + 0.5) * width) + 1j * (
+            y - self.minimum_y - (box_y + 0.5) * width
+        )
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
@@ -0,0 +1,165 @@
+"""Python module for measuring where time and memory go, through phases and counters reported by the other modules."""
+
+from __future__ import annotations
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from threading import Lock, local
+from time import perf_counter
+import tracemalloc
+
+
+class Phase:
+    """Totals of every time a phase of work ran."""
+
+    calls: int
+    seconds: float
+    peak_bytes: int
+
+    def __init__(self) -> None:
+        """Create the totals of a phase that has not run yet."""
+        self.calls = 0
+        self.seconds = 0.0
+        self.peak_bytes = 0
+
+
+class Profiler:
+    """Collector of phase timings, counters and memory high-water marks, active while used as a context manager.
+
+    A phase opened inside another one is named after it, separated by a slash, so the report reads as a tree. Memory
+    is traced with tracemalloc only when asked, as it slows everything down; the high-water marks count the bytes
+    allocated since the profiler started, all threads together.
+    """
+
+    phases: dict[str, Phase]
+    counters: dict[str, int]
+    memory: bool
+    lock: Lock
+    threads: local
+    previous: Profiler | None
+    tracing: bool
+
+    def __init__(self, memory: bool = False) -> None:
+        """Create an empty profiler, tracing memory if told to."""
+        self.phases = {}
+        self.counters = {}
+        self.memory = memory
+        self.lock = Lock()
+        self.threads = local()
+        self.previous = None
+        self.tracing = False
+
+    def __enter__(self) -> Profiler:
+        """Start collecting the phases and counters reported by the other modules."""
+        global active
+        self.previous = active
+        active = self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.tracing = True
+        return self
+
+    def __exit__(self, *exception: object) -> None:
+        """Stop collecting, giving back to the profiler active before, if any."""
+        global active
+        active = self.previous
+        if self.tracing:
+            tracemalloc.stop()
+            self.tracing = False
+
+    def stack(self) -> list[list]:
+        """Find the phases open in the current thread, as their names and memory high-water marks so far."""
+        if not hasattr(self.threads, "stack"):
+            self.threads.stack = []
+        return self.threads.stack
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a phase of work, and measure its memory high-water mark if memory is traced."""
+        stack = self.stack()
+        path = name if len(stack) == 0 else f"{stack[-1][0]}/{name}"
+        tracing = self.memory and tracemalloc.is_tracing()
+        if tracing:
+            # The peak is reset for this phase, so the one before it is kept for the enclosing phase.
+            if len(stack) > 0:
+                stack[-1][1] = max(stack[-1][1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        stack.append([path, 0])
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            seconds = perf_counter() - start
+            _, peak = stack.pop()
+            if tracing:
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                if len(stack) > 0:
+                    stack[-1][1] = max(stack[-1][1], peak)
+            with self.lock:
+                totals = self.phases.setdefault(path, Phase())
+                totals.calls += 1
+                totals.seconds += seconds
+                totals.peak_bytes = max(totals.peak_bytes, peak)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add to a counter."""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self) -> dict:
+        """Gather the phases and counters into plain values."""
+        with self.lock:
+            return {
+                "phases": {
+                    path: {
+                        "calls": phase.calls,
+                        "seconds": phase.seconds,
+                        "peak_bytes": phase.peak_bytes,
+                    }
+                    for path, phase in self.phases.items()
+                },
+                "counters": dict(self.counters),
+            }
+
+    def summary(self) -> str:
+        """Write the report as a table, nested phases indented under theirs."""
+        report = self.report()
+        lines = [f"{'Phase':<40} {'Calls':>8} {'Seconds':>10} {'Peak MB':>10}"]
+        for path in sorted(report["phases"]):
+            phase = report["phases"][path]
+            name = "  " * path.count("/") + path.rsplit("/", 1)[-1]
+            peak = f"{phase['peak_bytes'] / 1e6:.1f}" if self.memory else "-"
+            lines.append(
+                f"{name:<40} {phase['calls']:>8} {phase['seconds']:>10.4f} {peak:>10}"
+            )
+        for name, value in sorted(report["counters"].items()):
+            lines.append(f"{name:<40} {value:>8}")
+        return "\n".join(lines)
+
+
+active: Profiler | None = None
+"""Profiler collecting the phases and counters, if any."""
+
+
+def phase(name: str) -> AbstractContextManager:
+    """Time a phase of work with the active profiler, doing nothing without one."""
+    if active is None:
+        return nullcontext()
+    return active.phase(name)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add to a counter of the active profiler, doing nothing without one."""
+    if active is not None:
+        active.count(name, amount)
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
@@ -0,0 +1,228 @@
+"""Python module for advancing systems of charged particles through time with different integration schemes."""
+
+from __future__ import annotations
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Protocol
+import numpy as np
+
+if TYPE_CHECKING:
+    from particles import System
+
+DORMAND_PRINCE_STAGES: tuple[tuple[float, ...], ...] = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+"""Weights of the earlier stages used by every Dormand-Prince stage, the last row being the fifth order solution."""
+DORMAND_PRINCE_ERROR: tuple[float, ...] = (
+    35 / 384 - 5179 / 57600,
+    0,
+    500 / 1113 - 7571 / 16695,
+    125 / 192 - 393 / 640,
+    -2187 / 6784 + 92097 / 339200,
+    11 / 84 - 187 / 2100,
+    -1 / 40,
+)
+"""Difference between the fifth and fourth order Dormand-Prince weights, estimating the local error."""
+
+
+def dormand_prince(
+    derivative: Callable[[np.ndarray], np.ndarray], state: np.ndarray, step: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Take one embedded Runge-Kutta 4(5) step of an autonomous system, returning the new state and its error estimate."""
+    stages: list[np.ndarray] = []
+    for weights in DORMAND_PRINCE_STAGES:
+        stage_state = state.copy()
+        for weight, stage in zip(weights, stages):
+            if weight != 0:
+                stage_state += step * weight * stage
+        stages.append(derivative(stage_state))
+    error = step * sum(
+        weight * stage for weight, stage in zip(DORMAND_PRINCE_ERROR, stages)
+    )
+    return stage_state, error
+
+
+class Integrator(Protocol):
+    """Scheme advancing the positions and velocities of a system of charged particles."""
+
+    def step(self, system: System, time: float, /) -> None:
+        """Advance the system by the specified time."""
+        ...
+
+
+class SemiImplicitEuler:
+    """First order scheme updating velocities from the current forces, then positions from the new velocities."""
+
+    def step(self, system: System, time: float, /) -> None:
+        """Advance the system by the specified time."""
+        acceleration_x, acceleration_y = system.accelerations(system.x, system.y)
+        system.velocity_x += acceleration_x * time
+        system.velocity_y += acceleration_y * time
+        system.x += system.velocity_x * time
+        system.y += system.velocity_y * time
+
+
+class VelocityVerlet:
+    """Second order symplectic scheme (kick, drift, kick leapfrog), reusing the forces at the end of each step for the next."""
+
+    cache: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None
+
+    def __init__(self) -> None:
+        """Create a velocity Verlet integrator."""
+        self.cache = None
+
+    def accelerations(self, system: System) -> tuple[np.ndarray, np.ndarray]:
+        """Find the accelerations at the current positions, reusing the last ones when the positions are unchanged."""
+        if self.cache is not None:
+            x, y, acceleration_x, acceleration_y = self.cache
+            if np.array_equal(x, system.x) and np.array_equal(y, system.y):
+                return acceleration_x, acceleration_y
+        acceleration_x, acceleration_y = system.accelerations(system.x, system.y)
+        self.cache = (
+            system.x.copy(),
+            system.y.copy(),
+            acceleration_x,
+            acceleration_y,
+        )
+        return acceleration_x, acceleration_y
+
+    def step(self, system: System, time: float, /) -> None:
+        """Advance the system by the specified time."""
+        acceleration_x, acceleration_y = self.accelerations(system)
+        system.velocity_x += acceleration_x * (time / 2)
+        system.velocity_y += acceleration_y * (time / 2)
+        system.x += system.velocity_x * time
+        system.y += system.velocity_y * time
+        acceleration_x, acceleration_y = self.accelerations(system)
+        system.velocity_x += acceleration_x * (time / 2)
+        system.velocity_y += acceleration_y * (time / 2)
+
+
+class RungeKutta4:
+    """Classical fourth order Runge-Kutta scheme over positions and velocities."""
+
+    def step(self, system: System, time: float, /) -> None:
+        """Advance the system by the specified time."""
+        state = system.state()
+        k1 = system.derivative(state)
+        k2 = system.derivative(state + time / 2 * k1)
+        k3 = system.derivative(state + time / 2 * k2)
+        k4 = system.derivative(state + time * k3)
+        system.set_state(state + time / 6 * (k1 + 2 * k2 + 2 * k3 + k4))
+
+
+class Adaptive:
+    """Adaptive scheme keeping the position error of every step within a tolerance in meters.
+
+    With a shared step, the system is advanced by embedded Dormand-Prince 4(5) steps whose size follows the
+    estimated error. With block steps, every particle gets its own power of two subdivision of the step, chosen
+    so that half its acceleration times its step squared stays within the tolerance, and only the particles
+    finishing a substep have their forces recomputed.
+    """
+
+    tolerance: float
+    block: bool
+    maximum_level: int
+    step_size: float | None
+    levels: np.ndarray
+
+    def __init__(
+        self, tolerance: float, block: bool = False, maximum_level: int = 12
+    ) -> None:
+        """Create an adaptive integrator with the specified position tolerance in meters."""
+        self.tolerance = tolerance
+        self.block = block
+        self.maximum_level = maximum_level
+        self.step_size = None
+        self.levels = np.zeros(0, dtype=int)
+
+    def step(self, system: System, time: float, /) -> None:
+        """Advance the system by the specified time."""
+        if self.block:
+            self.step_block(system, time)
+        else:
+            self.step_shared(system, time)
+
+    def step_shared(self, system: System, time: float) -> None:
+        """Advance the system with error controlled Dormand-Prince steps until the specified time has passed."""
+        state = system.state()
+        elapsed = 0.0
+        step = min(self.step_size or time, time)
+        while elapsed < time:
+            step = min(step, time - elapsed)
+            new_state, error = dormand_prince(system.derivative, state, step)
+            # Velocity errors count by the distance they would cause over the step.
+            error[2:] *= step
+            ratio = np.abs(error).max() / self.tolerance if error.size > 0 else 0.0
+            # Steps are never shorter than the deepest subdivision, whatever their error.
+            if ratio <= 1 or step <= time / 2**self.maximum_level:
+                state = new_state
+                elapsed += step
+                self.step_size = step
+            step *= min(5.0, max(0.2, 0.9 * ratio ** (-1 / 5))) if ratio > 0 else 5.0
+            step = max(step, time / 2**self.maximum_level)
+        system.set_state(state)
+
+    def level(self, time: float, acceleration: np.ndarray) -> np.ndarray:
+        """Find the subdivision level of every particle from the magnitude of its acceleration."""
+        with np.errstate(divide="ignore"):
+            allowed = np.sqrt(2 * self.tolerance / acceleration)
+            levels = np.ceil(np.log2(time / allowed))
+        return np.clip(levels, 0, self.maximum_level).astype(int)
+
+    def step_block(self, system: System, time: float) -> None:
+        """Advance the system with hierarchical kick, drift, kick steps of per particle length."""
+        everyone = np.arange(len(system.mass))
+        acceleration_x, acceleration_y = system.accelerations(system.x, system.y)
+        levels = self.level(time, np.hypot(acceleration_x, acceleration_y))
+        # Leave room for particles to move to shorter steps during the step.
+        deepest = min(self.maximum_level, int(levels.max(initial=0)) + 2)
+        ticks = 2**deepest
+        tick = time / ticks
+        periods = 2 ** (deepest - np.minimum(levels, deepest))
+        for now in range(ticks):
+            starting = now % periods == 0
+            system.velocity_x[starting] += acceleration_x[starting] * (
+                periods[starting] * tick / 2
+            )
+            system.velocity_y[starting] += acceleration_y[starting] * (
+                periods[starting] * tick / 2
+            )
+            system.x += system.velocity_x * tick
+            system.y += system.velocity_y * tick
+            ending = everyone[(now + 1) % periods == 0]
+            if len(ending) == 0:
+                continue
+            new_x, new_y = system.accelerations(system.x, system.y, ending)
+            acceleration_x[ending] = new_x
+            acceleration_y[ending] = new_y
+            system.velocity_x[ending] += new_x * (periods[ending] * tick / 2)
+            system.velocity_y[ending] += new_y * (periods[ending] * tick / 2)
+            if now + 1 == ticks:
+                break
+            # A particle may only move to a longer step at a time that is a multiple of that step.
+            longest = 0
+            while (now + 1) % 2 ** (longest + 1) == 0:
+                longest += 1
+            wanted = deepest - np.minimum(
+                self.level(time, np.hypot(new_x, new_y)), deepest
+            )
+            periods[ending] = 2 ** np.minimum(wanted, longest)
+        self.levels = deepest - np.log2(periods).astype(int)
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
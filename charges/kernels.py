@@ -0,0 +1,246 @@
+"""Python module for evaluating electric field and potential of point and segment sources over arrays of points."""
+
+from __future__ import annotations
+from collections.abc import Iterator
+import numpy as np
+import compiled
+
+ELECTROSTATIC_CONSTANT: float = 8.9875517923e9
+"""Electrostatic constant in Newtons, meters squared per Coulombs squared."""
+BLOCK_SIZE: int = 1 << 20
+"""Maximum number of source and target pairs held in memory at once."""
+BACKEND: str = "numba" if compiled.AVAILABLE else "numpy"
+"""Backend running the point charge kernels, the compiled one whenever Numba is installed, which is not fork safe."""
+
+
+def set_backend(backend: str) -> None:
+    """Select the backend running the point charge kernels, either numba or numpy."""
+    global BACKEND
+    if backend not in ("numba", "numpy"):
+        raise ValueError(f"Unknown backend {backend!r}, expected 'numba' or 'numpy'.")
+    if backend == "numba" and not compiled.AVAILABLE:
+        raise ValueError("The numba backend needs Numba to be installed.")
+    BACKEND = backend
+
+
+def blocks(size: int, sources: int) -> Iterator[slice]:
+    """Split targets into blocks so that each block stays within the block size."""
+    step = max(1, BLOCK_SIZE // max(1, sources))
+    for start in range(0, size, step):
+        yield slice(start, start + step)
+
+
+def sources(*arrays: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Convert source arrays to the contiguous float arrays the compiled kernels expect."""
+    return tuple(np.ascontiguousarray(array, dtype=float) for array in arrays)
+
+
+def inverse_distances(
+    xs: np.ndarray, ys: np.ndarray, px: np.ndarray, py: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find the displacements and inverse distances between every target and every source point."""
+    dx = xs[:, np.newaxis] - px[np.newaxis, :]
+    dy = ys[:, np.newaxis] - py[np.newaxis, :]
+    distances = np.hypot(dx, dy)
+    with np.errstate(divide="ignore"):
+        inverse = 1 / distances
+    inverse[distances == 0] = 0
+    return dx, dy, inverse
+
+
+def point_contributions(
+    x: float, y: float, px: np.ndarray, py: np.ndarray, pq: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculate the electric potential and field caused by each point charge at a single point."""
+    dx, dy, inverse = inverse_distances(np.array([x]), np.array([y]), px, py)
+    potential = ELECTROSTATIC_CONSTANT * pq * inverse[0]
+    inverse **= 2
+    return potential, potential * dx[0] * inverse[0], potential * dy[0] * inverse[0]
+
+
+def point_potential(
+    xs: np.ndarray, ys: np.ndarray, px: np.ndarray, py: np.ndarray, pq: np.ndarray
+) -> np.ndarray:
+    """Calculate the electric potential of point charges at arrays of points."""
+    xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+    shape = xs.shape
+    xs = xs.ravel()
+    ys = ys.ravel()
+    if BACKEND == "numba":
+        potential = compiled.point_potential(xs, ys, *sources(px, py, pq))
+        return ELECTROSTATIC_CONSTANT * potential.reshape(shape)
+    potential = np.zeros(xs.size)
+    for block in blocks(xs.size, pq.size):
+        _, _, inverse = inverse_distances(xs[block], ys[block], px, py)
+        potential[block] = inverse @ pq
+    return ELECTROSTATIC_CONSTANT * potential.reshape(shape)
+
+
+def point_field(
+    xs: np.ndarray, ys: np.ndarray, px: np.ndarray, py: np.ndarray, pq: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate the electric field of point charges at arrays of points."""
+    xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+    shape = xs.shape
+    xs = xs.ravel()
+    ys = ys.ravel()
+    if BACKEND == "numba":
+        field_x, field_y = compiled.point_field(xs, ys, *sources(px, py, pq))
+        return (
+            ELECTROSTATIC_CONSTANT * field_x.reshape(shape),
+            ELECTROSTATIC_CONSTANT * field_y.reshape(shape),
+        )
+    field_x = np.zeros(xs.size)
+    field_y = np.zeros(xs.size)
+    for block in blocks(xs.size, pq.size):
+        dx, dy, inverse = inverse_distances(xs[block], ys[block], px, py)
+        inverse **= 3
+        field_x[block] = (dx * inverse) @ pq
+        field_y[block] = (dy * inverse) @ pq
+    return (
+        ELECTROSTATIC_CONSTANT * field_x.reshape(shape),
+        ELECTROSTATIC_CONSTANT * field_y.reshape(shape),
+    )
+
+
+def segment_terms(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    x1: np.ndarray,
+    y1: np.ndarray,
+    x2: np.ndarray,
+    y2: np.ndarray,
+    lq: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculate the exact electric potential and field of every uniformly charged segment at every target point."""
+    lengths = np.hypot(x2 - x1, y2 - y1)
+    tx = (x2 - x1) / lengths
+    ty = (y2 - y1) / lengths
+    dx = xs[:, np.newaxis] - x1[np.newaxis, :]
+    dy = ys[:, np.newaxis] - y1[np.newaxis, :]
+    # Coordinates along and across the segment, measured from its first end.
+    u = dx * tx + dy * ty
+    v = dy * tx - dx * ty
+    w = u - lengths
+    distances_1 = np.hypot(u, v)
+    distances_2 = np.hypot(w, v)
+    density = ELECTROSTATIC_CONSTANT * lq / lengths
+    inside = (u > 0) & (w < 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gap = distances_1 + distances_2 - lengths
+        potential = density * np.log((distances_1 + distances_2 + lengths) / gap)
+        field_u = density * (1 / distances_2 - 1 / distances_1)
+        # Beyond the ends the direct formula cancels, so the difference of cosines is expanded instead.
+        field_v = np.where(
+            inside,
+            density * (u / distances_1 - w / distances_2) / v,
+            density
+            * v
+            * (u**2 - w**2)
+            / (distances_1 * distances_2 * (u * distances_2 + w * distances_1)),
+        )
+    singular = (gap <= 0) | (distances_1 == 0) | (distances_2 == 0)
+    potential[singular] = 0
+    field_u[singular] = 0
+    field_v[singular] = 0
+    return potential, field_u * tx - field_v * ty, field_u * ty + field_v * tx
+
+
+def segment_contributions(
+    x: float,
+    y: float,
+    x1: np.ndarray,
+    y1: np.ndarray,
+    x2: np.ndarray,
+    y2: np.ndarray,
+    lq: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Calculate the electric potential and field caused by each segment at a single point."""
+    potential, field_x, field_y = segment_terms(
+        np.array([x]), np.array([y]), x1, y1, x2, y2, lq
+    )
+    return potential[0], field_x[0], field_y[0]
+
+
+def segment_potential(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    x1: np.ndarray,
+    y1: np.ndarray,
+    x2: np.ndarray,
+    y2: np.ndarray,
+    lq: np.ndarray,
+) -> np.ndarray:
+    """Calculate the exact electric potential of uniformly charged segments at arrays of points."""
+    xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+    shape = xs.shape
+    xs = xs.ravel()
+    ys = ys.ravel()
+    potential = np.zeros(xs.size)
+    # Segment terms need several times the temporaries of point terms.
+    for block in blocks(xs.size, 4 * lq.size):
+        terms, _, _ = segment_terms(xs[block], ys[block], x1, y1, x2, y2, lq)
+        potential[block] = terms.sum(axis=1)
+    return potential.reshape(shape)
+
+
+def segment_field(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    x1: np.ndarray,
+    y1: np.ndarray,
+    x2: np.ndarray,
+    y2: np.ndarray,
+    lq: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate the exact electric field of uniformly charged segments at arrays of points."""
+    xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+    shape = xs.shape
+    xs = xs.ravel()
+    ys = ys.ravel()
+    field_x = np.zeros(xs.size)
+    field_y = np.zeros(xs.size)
+    for block in blocks(xs.size, 4 * lq.size):
+        _, terms_x, terms_y = segment_terms(xs[block], ys[block], x1, y1, x2, y2, lq)
+        field_x[block] = terms_x.sum(axis=1)
+        field_y[block] = terms_y.sum(axis=1)
+    return field_x.reshape(shape), field_y.reshape(shape)
+
+
+def pair_forces(
+    x: np.ndarray, y: np.ndarray, q: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate the electric force on every point charge from all the others, evaluating each pair once."""
+    if BACKEND == "numba":
+        force_x, force_y = compiled.pair_forces(*sources(x, y, q))
+        return ELECTROSTATIC_CONSTANT * force_x, ELECTROSTATIC_CONSTANT * force_y
+    force_x = np.zeros(len(q))
+    force_y = np.zeros(len(q))
+    start = 0
+    while start < len(q):
+        # Rows of the block interact with every later point charge, so blocks shrink the work as they go.
+        stop = min(len(q), start + max(1, BLOCK_SIZE // (len(q) - start)))
+        dx, dy, inverse = inverse_distances(x[start:stop], y[start:stop], x[start:], y[start:])
+        inverse = np.triu(inverse, k=1) ** 3
+        inverse *= q[start:stop, np.newaxis] * q[np.newaxis, start:]
+        pair_x = dx * inverse
+        pair_y = dy * inverse
+        # Newton's third law: the force on the later charge is the opposite of the force on the earlier one.
+        force_x[start:stop] += pair_x.sum(axis=1)
+        force_y[start:stop] += pair_y.sum(axis=1)
+        force_x[start:] -= pair_x.sum(axis=0)
+        force_y[start:] -= pair_y.sum(axis=0)
+        start = stop
+    return ELECTROSTATIC_CONSTANT * force_x, ELECTROSTATIC_CONSTANT * force_y
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
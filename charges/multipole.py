@@ -0,0 +1,149 @@
+"""Python module for multipole expansions of the potential of point charges in the plane.
+
+Positions are written as complex numbers z = x + iy. Around a center, the inverse distance to a source s expands as
+1 / |z - s| = 1 / |z| * sum over j, k of a(j) a(k) (s / z)^j (conj(s) / conj(z))^k, where a(j) are the coefficients
+of (1 - x)^(-1/2). An expansion of order p keeps the terms with j + k <= p, so order 0 is the monopole and order 1
+adds the dipole.
+"""
+
+from __future__ import annotations
+from math import comb
+import numpy as np
+from kernels import ELECTROSTATIC_CONSTANT
+
+
+def coefficients(order: int) -> np.ndarray:
+    """Find the series coefficients of (1 - x)^(-1/2) up to the specified order."""
+    return np.array([comb(2 * j, j) / 4**j for j in range(order + 1)])
+
+
+def truncation(order: int) -> np.ndarray:
+    """Find which pairs of powers are kept in an expansion of the specified order."""
+    j, k = np.indices((order + 1, order + 1))
+    return j + k <= order
+
+
+def powers(z: np.ndarray, order: int) -> np.ndarray:
+    """Raise complex numbers to every power up to the specified order."""
+    result = np.ones((len(z), order + 1), dtype=complex)
+    for j in range(1, order + 1):
+        result[:, j] = result[:, j - 1] * z
+    return result
+
+
+def p2m(dx: np.ndarray, dy: np.ndarray, q: np.ndarray, order: int) -> np.ndarray:
+    """Form the multipole moments of point charges at the specified offsets from the expansion center."""
+    s = powers(dx + 1j * dy, order)
+    moments = (q[:, np.newaxis] * s).T @ s.conj()
+    moments[~truncation(order)] = 0
+    return moments
+
+
+def shift(dx: float, dy: float, order: int) -> np.ndarray:
+    """Build the binomial matrix expanding powers of an offset position, with entries C(j, a) d^(j - a)."""
+    j, a = np.indices((order + 1, order + 1))
+    result = np.zeros((order + 1, order + 1), dtype=complex)
+    lower = a <= j
+    result[lower] = [
+        comb(int(n), int(m)) * complex(dx, dy) ** int(n - m)
+        for n, m in zip(j[lower], a[lower])
+    ]
+    return result
+
+
+def m2m(moments: np.ndarray, dx: float, dy: float, order: int) -> np.ndarray:
+    """Shift multipole moments to a new center, given the offset of the old center from the new one."""
+    operator = shift(dx, dy, order)
+    shifted = operator @ moments @ operator.conj().T
+    shifted[..., ~truncation(order)] = 0
+    return shifted
+
+
+def m2l(moments: np.ndarray, dx: float, dy: float, order: int) -> np.ndarray:
+    """Convert multipole moments into a local expansion, given the offset of the local center from the multipole center."""
+    a = coefficients(order)
+    weighted = a[:, np.newaxis] * moments * a[np.newaxis, :]
+    t = complex(dx, dy)
+    j, m = np.indices((order + 1, order + 1))
+    # Binomial series coefficients of (1 + x)^(-j - 1/2), built up one power of x at a time.
+    series = np.ones((order + 1, order + 1))
+    for n in range(1, order + 1):
+        series[:, n] = series[:, n - 1] * (-(j[:, 0] + 0.5) - (n - 1)) / n
+    operator = series * t ** (-(j + m)).astype(float)
+    local = (
+        ELECTROSTATIC_CONSTANT / abs(t) * (operator.T @ weighted @ operator.conj())
+    )
+    local[..., ~truncation(order)] = 0
+    return local
+
+
+def l2l(local: np.ndarray, dx: float, dy: float, order: int) -> np.ndarray:
+    """Shift a local expansion to a new center, given the offset of the new center from the old one."""
+    operator = shift(dx, dy, order)
+    shifted = operator.T @ local @ operator.conj()
+    shifted[..., ~truncation(order)] = 0
+    return shifted
+
+
+def l2p(
+    local: np.ndarray, dx: np.ndarray, dy: np.ndarray, order: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Evaluate the potential and field of local expansions, one per target, at the specified offsets from their centers."""
+    w = powers(dx + 1j * dy, order)
+    n = np.arange(order + 1)
+    derivative = np.zeros_like(w)
+    derivative[:, 1:] = n[1:] * w[:, :-1].conj()
+    potential = np.einsum("tm,tmn,tn->t", w, local, w.conj()).real
+    field = -2 * np.einsum("tm,tmn,tn->t", w, local, derivative)
+    return potential, field.real, field.imag
+
+
+def m2p(
+    moments: np.ndarray, dx: np.ndarray, dy: np.ndarray, order: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Evaluate the potential and field of multipole moments at targets with the specified offsets from the center."""
+    a = coefficients(order)
+    weighted = a[:, np.newaxis] * moments * a[np.newaxis, :]
+    z = dx + 1j * dy
+    inverse = powers(1 / z, order)
+    distance = np.abs(z)
+    potential = ELECTROSTATIC_CONSTANT * np.einsum(
+        "tj,jk,tk->t", inverse, weighted, inverse.conj()
+    ).real / distance
+    k = np.arange(order + 1)
+    field = (
+        ELECTROSTATIC_CONSTANT
+        * np.einsum(
+            "tj,jk,tk->t", inverse, weighted * (2 * k + 1), inverse.conj()
+        )
+        / (distance * z.conj())
+    )
+    return potential, field.real, field.imag
+
+
+def bound(
+    charge: float | np.ndarray, distance: np.ndarray, ratio: np.ndarray, order: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Bound the truncation error of the potential and field of an expansion of sources with the specified absolute charge."""
+    n = np.arange(order + 1)
+    ratio = np.asarray(ratio)[..., np.newaxis]
+    kept = ((n + 1) * ratio**n).sum(axis=-1)
+    kept_field = ((n + 1) ** 2 * ratio**n).sum(axis=-1)
+    ratio = ratio[..., 0]
+    # Closed forms of the sums of (n + 1) r^n and (n + 1)^2 r^n over every n.
+    total = 1 / (1 - ratio) ** 2
+    total_field = (1 + ratio) / (1 - ratio) ** 3
+    scale = ELECTROSTATIC_CONSTANT * np.abs(charge) / distance
+    return scale * (total - kept), scale * (total_field - kept_field) / distance
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
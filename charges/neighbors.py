@@ -0,0 +1,148 @@
+"""Python module for short range interactions between charged particles using cell lists and Verlet neighbor lists."""
+
+from __future__ import annotations
+from math import inf
+import numpy as np
+from kernels import ELECTROSTATIC_CONSTANT
+
+HALF_STENCIL: tuple[tuple[int, int], ...] = ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+"""Offsets of the neighboring cells visited from every cell so that each pair of cells is visited once."""
+
+
+def cell_pairs(
+    x: np.ndarray, y: np.ndarray, radius: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find every pair of points closer than the radius by binning them into square cells of that size."""
+    if len(x) < 2:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    cell_x = np.floor((x - x.min()) / radius).astype(np.int64)
+    cell_y = np.floor((y - y.min()) / radius).astype(np.int64)
+    # Cells are numbered with room for the stencil on every side so that neighbors never wrap around.
+    width = int(cell_x.max()) + 3
+    cells = (cell_y + 1) * width + (cell_x + 1)
+    order = np.argsort(cells, kind="stable")
+    sorted_cells = cells[order]
+    occupied, starts, counts = np.unique(
+        sorted_cells, return_index=True, return_counts=True
+    )
+    first: list[np.ndarray] = []
+    second: list[np.ndarray] = []
+    for offset_x, offset_y in HALF_STENCIL:
+        neighbor = sorted_cells + offset_y * width + offset_x
+        found = np.searchsorted(occupied, neighbor)
+        found = np.minimum(found, len(occupied) - 1)
+        present = occupied[found] == neighbor
+        members = np.flatnonzero(present)
+        sizes = counts[found[members]]
+        # Every point is paired with each member of its neighbor cell.
+        rows = np.repeat(members, sizes)
+        columns = (
+            np.repeat(starts[found[members]] - np.cumsum(sizes) + sizes, sizes)
+            + np.arange(sizes.sum())
+        )
+        if offset_x == 0 and offset_y == 0:
+            keep = columns > rows
+            rows = rows[keep]
+            columns = columns[keep]
+        first.append(order[rows])
+        second.append(order[columns])
+    i = np.concatenate(first)
+    j = np.concatenate(second)
+    close = np.hypot(x[i] - x[j], y[i] - y[j]) < radius
+    return i[close], j[close]
+
+
+class VerletList:
+    """Neighbor list of all pairs within the cutoff plus a skin, rebuilt only once some particle has moved half the skin."""
+
+    cutoff: float
+    skin: float
+    x: np.ndarray
+    y: np.ndarray
+    i: np.ndarray
+    j: np.ndarray
+    rebuilds: int
+
+    def __init__(self, cutoff: float, skin: float) -> None:
+        """Create an empty neighbor list for the specified cutoff and skin."""
+        self.cutoff = cutoff
+        self.skin = skin
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.i = np.zeros(0, dtype=np.int64)
+        self.j = np.zeros(0, dtype=np.int64)
+        self.rebuilds = 0
+
+    def pairs(self, x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Find the candidate pairs for the specified positions, rebuilding the list when it may have gone stale."""
+        if len(x) != len(self.x) or (
+            len(x) > 0
+            and np.max((x - self.x) ** 2 + (y - self.y) ** 2) > (self.skin / 2) ** 2
+        ):
+            self.i, self.j = cell_pairs(x, y, self.cutoff + self.skin)
+            self.x = x.copy()
+            self.y = y.copy()
+            self.rebuilds += 1
+        return self.i, self.j
+
+
+class ShortRange:
+    """Screened (Yukawa) or truncated Coulomb interaction, cut off beyond a fixed distance."""
+
+    cutoff: float
+    debye_length: float
+    neighbors: VerletList
+
+    def __init__(
+        self, cutoff: float, debye_length: float = inf, skin: float | None = None
+    ) -> None:
+        """Create a short range interaction, screened over the Debye length if given, with a skin of a tenth of the cutoff by default."""
+        self.cutoff = cutoff
+        self.debye_length = debye_length
+        self.neighbors = VerletList(cutoff, 0.1 * cutoff if skin is None else skin)
+
+    def terms(
+        self, x: np.ndarray, y: np.ndarray, q: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Find the pairs within the cutoff with their displacements, distances and charge products."""
+        i, j = self.neighbors.pairs(x, y)
+        dx = x[i] - x[j]
+        dy = y[i] - y[j]
+        distance = np.hypot(dx, dy)
+        close = (distance < self.cutoff) & (distance > 0)
+        i, j, dx, dy, distance = i[close], j[close], dx[close], dy[close], distance[close]
+        return i, j, dx, dy, distance, ELECTROSTATIC_CONSTANT * q[i] * q[j]
+
+    def forces(
+        self, x: np.ndarray, y: np.ndarray, q: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate the force on every particle from its neighbors, applying each pair once in both directions."""
+        i, j, dx, dy, distance, product = self.terms(x, y, q)
+        screening = np.exp(-distance / self.debye_length)
+        magnitude = (
+            product * screening * (1 / distance + 1 / self.debye_length) / distance**2
+        )
+        pair_x = magnitude * dx
+        pair_y = magnitude * dy
+        n = len(q)
+        return (
+            np.bincount(i, pair_x, n) - np.bincount(j, pair_x, n),
+            np.bincount(i, pair_y, n) - np.bincount(j, pair_y, n),
+        )
+
+    def energy(self, x: np.ndarray, y: np.ndarray, q: np.ndarray) -> float:
+        """Calculate the potential energy of all pairs within the cutoff."""
+        _, _, _, _, distance, product = self.terms(x, y, q)
+        return float(np.sum(product * np.exp(-distance / self.debye_length) / distance))
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
@@ -0,0 +1,65 @@
+"""Python module for splitting evaluations over arrays of points across several threads."""
+
+from __future__ import annotations
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+import numpy as np
+
+TILES_PER_WORKER: int = 4
+"""Number of tiles handed to every worker, so that uneven tiles still balance out."""
+
+
+def workers_count(workers: int | None) -> int:
+    """Find the number of workers to use, every available core when none is given."""
+    return max(1, cpu_count() or 1) if workers is None else max(1, workers)
+
+
+def map_tiles(
+    function: Callable[[np.ndarray, np.ndarray], np.ndarray | tuple[np.ndarray, ...]],
+    xs: np.ndarray,
+    ys: np.ndarray,
+    workers: int | None = None,
+    compiled: bool = False,
+) -> np.ndarray | tuple[np.ndarray, ...]:
+    """Evaluate a function of arrays of points tile by tile on a pool of threads and stitch the results back together.
+
+    The kernels spend their time inside NumPy, which releases the global interpreter lock, so threads run in
+    parallel while sharing the charge arrays without copying them. A function running the compiled kernels is called
+    once on every point instead, as they already run on every core and their thread pool must not be entered from
+    several threads.
+    """
+    xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+    shape = xs.shape
+    xs = xs.ravel()
+    ys = ys.ravel()
+    workers = workers_count(workers)
+    if compiled or workers == 1 or xs.size < 2:
+        return function(xs.reshape(shape), ys.reshape(shape))
+    bounds = np.linspace(0, xs.size, min(xs.size, workers * TILES_PER_WORKER) + 1).astype(int)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(
+            executor.map(
+                lambda start, stop: function(xs[start:stop], ys[start:stop]),
+                bounds[:-1],
+                bounds[1:],
+            )
+        )
+    if isinstance(results[0], tuple):
+        return tuple(
+            np.concatenate([result[n] for result in results]).reshape(shape)
+            for n in range(len(results[0]))
+        )
+    return np.concatenate(results).reshape(shape)
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
@@ -1,35 +1,131 @@
 from __future__ import annotations
-from itertools import combinations
-from charges import PointCharge, Point
+import numpy as np
+from charges import Engine, PointCharge, Point
+from integrators import Integrator, SemiImplicitEuler
+from kernels import pair_forces, point_field, point_potential
+from neighbors import ShortRange
+from store import ChargeStore
 
 
 class System:
-    """System of charged particles."""
+    """System of charged particles, with positions and velocities kept in arrays."""
+
+    x: np.ndarray
+    y: np.ndarray
+    velocity_x: np.ndarray
+    velocity_y: np.ndarray
+    charge: np.ndarray
+    mass: np.ndarray
+    engine: Engine | None
+    integrator: Integrator
+    interaction: ShortRange | None
 
-    particles: list[Particle]
+    def __init__(
+        self,
+        particles: list[Particle],
+        engine: Engine | None = None,
+        integrator: Integrator | None = None,
+        interaction: ShortRange | None = None,
+    ) -> None:
+        """Create a system of charged particles, with forces summed over all pairs unless an approximation engine or a short range interaction is given.
 
-    def __init__(self, particles: list[Particle]) -> None:
-        """Create a system of charged particles."""
+        The particles are copied into the arrays, so iterating the system does not move the particle objects given.
+        """
         self.particles = particles
+        self.engine = engine
+        self.integrator = SemiImplicitEuler() if integrator is None else integrator
+        self.interaction = interaction
+
+    @property
+    def particles(self) -> tuple[Particle, ...]:
+        """Build a snapshot of the particles from the arrays, which changing does not change the system."""
+        return tuple(
+            Particle(
+                float(charge),
+                float(mass),
+                Point(float(x), float(y)),
+                Point(float(vx), float(vy)),
+            )
+            for charge, mass, x, y, vx, vy in zip(
+                self.charge, self.mass, self.x, self.y, self.velocity_x, self.velocity_y
+            )
+        )
+
+    @particles.setter
+    def particles(self, particles: list[Particle]) -> None:
+        """Replace the particles of the system, copying them into the arrays."""
+        self.x = np.array([particle.point.x for particle in particles], dtype=float)
+        self.y = np.array([particle.point.y for particle in particles], dtype=float)
+        self.velocity_x = np.array(
+            [particle.velocity.x for particle in particles], dtype=float
+        )
+        self.velocity_y = np.array(
+            [particle.velocity.y for particle in particles], dtype=float
+        )
+        self.charge = np.array([particle.charge for particle in particles], dtype=float)
+        self.mass = np.array([particle.mass for particle in particles], dtype=float)
 
     def momentum(self) -> Point:
-        momentum = Point(0, 0)
-        for particle in self.particles:
-            momentum += particle.momentum()
-        return momentum
+        return Point(
+            float(self.mass @ self.velocity_x), float(self.mass @ self.velocity_y)
+        )
+
+    def kinetic_energy(self) -> float:
+        """Calculate the total kinetic energy of the particles."""
+        return float(0.5 * self.mass @ (self.velocity_x**2 + self.velocity_y**2))
+
+    def potential_energy(self) -> float:
+        """Calculate the electric potential energy of all pairs of particles."""
+        if self.interaction is not None:
+            return self.interaction.energy(self.x, self.y, self.charge)
+        potential = point_potential(self.x, self.y, self.x, self.y, self.charge)
+        return float(0.5 * self.charge @ potential)
+
+    def energy(self) -> float:
+        """Calculate the total energy of the system."""
+        return self.kinetic_energy() + self.potential_energy()
+
+    def accelerations(
+        self, x: np.ndarray, y: np.ndarray, active: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate the accelerations of the particles at the specified positions, only for the active ones if given."""
+        if self.interaction is not None:
+            force_x, force_y = self.interaction.forces(x, y, self.charge)
+            if active is None:
+                active = slice(None)
+            return (
+                force_x[active] / self.mass[active],
+                force_y[active] / self.mass[active],
+            )
+        if active is None:
+            if self.engine is None:
+                force_x, force_y = pair_forces(x, y, self.charge)
+                return force_x / self.mass, force_y / self.mass
+            active = slice(None)
+        if self.engine is None:
+            field_x, field_y = point_field(x[active], y[active], x, y, self.charge)
+        else:
+            field_x, field_y = self.engine.field_grid(
+                ChargeStore([(x, y, self.charge)]), x[active], y[active]
+            )
+        ratio = self.charge[active] / self.mass[active]
+        return field_x * ratio, field_y * ratio
+
+    def state(self) -> np.ndarray:
+        """Gather positions and velocities into a single array of rows x, y, velocity x and velocity y."""
+        return np.array([self.x, self.y, self.velocity_x, self.velocity_y])
+
+    def set_state(self, state: np.ndarray, /) -> None:
+        """Set positions and velocities from a single array of rows x, y, velocity x and velocity y."""
+        self.x[:], self.y[:], self.velocity_x[:], self.velocity_y[:] = state
+
+    def derivative(self, state: np.ndarray, /) -> np.ndarray:
+        """Find the rate of change of an array of positions and velocities."""
+        acceleration_x, acceleration_y = self.accelerations(state[0], state[1])
+        return np.array([state[2], state[3], acceleration_x, acceleration_y])
 
     def iterate(self, time: float) -> System:
-        # Calculation of velocity.
-        for particle_1, particle_2 in combinations(self.particles, 2):
-            particle_1.velocity += (
-                particle_1.force(particle_2) / particle_1.mass
-            ) * time
-            particle_2.velocity += (
-                particle_2.force(particle_1) / particle_2.mass
-            ) * time
-        # Calculation of position.
-        for particle in self.particles:
-            particle.iterate(time)
+        self.integrator.step(self, time)
         return self
 
 
@@ -56,8 +152,8 @@ class Particle(PointCharge):
 
     def force(self, particle: Particle) -> Point:
         """Calculate the electric force applied on the particle itself."""
-        force = self.field(particle.point) * particle.charge
-        return force
+        field_x, field_y = particle.field_at(self.point.x, self.point.y)
+        return Point(field_x * self.charge, field_y * self.charge)
 
 
 try:
@@ -3,10 +3,13 @@
 from __future__ import annotations
 from math import hypot
 from collections.abc import Iterator
+import numpy as np
 
 
 class Point:
-    """Two-dimensional point represented in cartesian coordinates."""
+    """Two-dimensional point represented in cartesian coordinates, with slots instead of a dictionary of attributes."""
+
+    __slots__ = ("x", "y")
 
     x: float
     y: float
@@ -23,7 +26,7 @@ class Point:
 
     def __add__(self, point: Point, /) -> Point:
         """(+) Add caller point with parameter point, without modification to point."""
-        return self.copy().add(point)
+        return Point(self.x + point.x, self.y + point.y)
 
     def __iadd__(self, point: Point, /) -> Point:
         """(+=) Add caller point with parameter point, with modification to caller point."""
@@ -31,7 +34,7 @@ class Point:
 
     def __sub__(self, point: Point, /) -> Point:
         """(-) Subtract parameter point from caller point, without modification to point."""
-        return self.copy().sub(point)
+        return Point(self.x - point.x, self.y - point.y)
 
     def __isub__(self, point: Point, /) -> Point:
         """(-=) Subtract parameter point from caller point, with modification to caller point."""
@@ -39,11 +42,11 @@ class Point:
 
     def __mul__(self, multiplier: float, /) -> Point:
         """(*) Multiply point coordinates by a number, without modification to point."""
-        return self.copy().mul(multiplier)
+        return Point(self.x * multiplier, self.y * multiplier)
 
     def __rmul__(self, multiplier: float, /) -> Point:
         """(*) Multiply point coordinates by a number, without modification to point."""
-        return self.copy().mul(multiplier)
+        return Point(self.x * multiplier, self.y * multiplier)
 
     def __imul__(self, multiplier: float, /) -> Point:
         """(*=) Multiply point coordinates by a number, with modification to point."""
@@ -51,7 +54,7 @@ class Point:
 
     def __truediv__(self, divisor: float, /) -> Point:
         """(/) Divide point coordinates by a number, without modification to point."""
-        return self.copy().div(divisor)
+        return Point(self.x / divisor, self.y / divisor)
 
     def __itruediv__(self, divisor: float, /) -> Point:
         """(/=) Divide point coordinates by a number, with modification to point."""
@@ -63,7 +66,7 @@ class Point:
 
     def __neg__(self) -> Point:
         """(-) Flip the sign of point coordinates, without modification to point."""
-        return self.copy().mul(-1)
+        return Point(-self.x, -self.y)
 
     def __matmul__(self, point: Point, /) -> float:
         """(@) Find the dot product of two points as vectors."""
@@ -127,6 +130,148 @@ class Point:
         return Point(self.x, self.y)
 
 
+class PointArray:
+    """Array of two-dimensional points kept as arrays of coordinates, with the same operations as a single point.
+
+    Operations take either another array of as many points or a single point, which is then applied to all of them.
+    """
+
+    __slots__ = ("x", "y")
+
+    x: np.ndarray
+    y: np.ndarray
+
+    def __init__(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Instantiate an array of points from arrays of cartesian coordinates, a single coordinate being repeated."""
+        # Broadcast arrays share memory along repeated axes, so they are copied to be safely changed in place.
+        x, y = np.broadcast_arrays(np.atleast_1d(x), np.atleast_1d(y))
+        self.x = np.array(x, dtype=float, copy=True)
+        self.y = np.array(y, dtype=float, copy=True)
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        """Iterate through the arrays of coordinates."""
+        yield self.x
+        yield self.y
+
+    def __len__(self) -> int:
+        """Find the number of points."""
+        return len(self.x)
+
+    def __getitem__(self, index: int | slice | np.ndarray, /) -> Point | PointArray:
+        """Select a single point, or an array of points with a slice or mask."""
+        if isinstance(index, (int, np.integer)):
+            return Point(float(self.x[index]), float(self.y[index]))
+        return PointArray(self.x[index], self.y[index])
+
+    def __add__(self, point: Point | PointArray, /) -> PointArray:
+        """(+) Add caller points with parameter points, without modification to points."""
+        return PointArray(self.x + point.x, self.y + point.y)
+
+    def __iadd__(self, point: Point | PointArray, /) -> PointArray:
+        """(+=) Add caller points with parameter points, with modification to caller points."""
+        return self.add(point)
+
+    def __sub__(self, point: Point | PointArray, /) -> PointArray:
+        """(-) Subtract parameter points from caller points, without modification to points."""
+        return PointArray(self.x - point.x, self.y - point.y)
+
+    def __isub__(self, point: Point | PointArray, /) -> PointArray:
+        """(-=) Subtract parameter points from caller points, with modification to caller points."""
+        return self.sub(point)
+
+    def __mul__(self, multiplier: float | np.ndarray, /) -> PointArray:
+        """(*) Multiply point coordinates by numbers, without modification to points."""
+        return PointArray(self.x * multiplier, self.y * multiplier)
+
+    def __rmul__(self, multiplier: float | np.ndarray, /) -> PointArray:
+        """(*) Multiply point coordinates by numbers, without modification to points."""
+        return PointArray(self.x * multiplier, self.y * multiplier)
+
+    def __imul__(self, multiplier: float | np.ndarray, /) -> PointArray:
+        """(*=) Multiply point coordinates by numbers, with modification to points."""
+        return self.mul(multiplier)
+
+    def __truediv__(self, divisor: float | np.ndarray, /) -> PointArray:
+        """(/) Divide point coordinates by numbers, without modification to points."""
+        return PointArray(self.x / divisor, self.y / divisor)
+
+    def __itruediv__(self, divisor: float | np.ndarray, /) -> PointArray:
+        """(/=) Divide point coordinates by numbers, with modification to points."""
+        return self.div(divisor)
+
+    def __pos__(self) -> PointArray:
+        """(+) Return the same points instance."""
+        return self
+
+    def __neg__(self) -> PointArray:
+        """(-) Flip the sign of point coordinates, without modification to points."""
+        return PointArray(-self.x, -self.y)
+
+    def __matmul__(self, point: Point | PointArray, /) -> np.ndarray:
+        """(@) Find the dot products of points as vectors."""
+        return self.dot(point)
+
+    def __mod__(self, point: Point | PointArray, /) -> np.ndarray:
+        """(%) Find the cross products of points as vectors."""
+        return self.cross(point)
+
+    def set(self, point: Point | PointArray, /) -> PointArray:
+        """Set coordinates of caller points to match parameter points."""
+        self.x[...] = point.x
+        self.y[...] = point.y
+        return self
+
+    def add(self, point: Point | PointArray, /) -> PointArray:
+        """Add caller points with parameter points, with modification to caller points."""
+        self.x += point.x
+        self.y += point.y
+        return self
+
+    def sub(self, point: Point | PointArray, /) -> PointArray:
+        """Subtract parameter points from caller points, with modification to caller points."""
+        self.x -= point.x
+        self.y -= point.y
+        return self
+
+    def mul(self, multiplier: float | np.ndarray, /) -> PointArray:
+        """Multiply point coordinates by numbers, with modification to points."""
+        self.x *= multiplier
+        self.y *= multiplier
+        return self
+
+    def div(self, divisor: float | np.ndarray, /) -> PointArray:
+        """Divide point coordinates by numbers, with modification to points."""
+        self.x /= divisor
+        self.y /= divisor
+        return self
+
+    def norm(self) -> PointArray:
+        """Scale the points to unit length, leaving the points at the origin there."""
+        length = self.len()
+        length[length == 0] = np.inf
+        return self.div(length)
+
+    def len(self) -> np.ndarray:
+        """Find the distances to the origin."""
+        return np.hypot(self.x, self.y)
+
+    def dist(self, point: Point | PointArray, /) -> np.ndarray:
+        """Find the distances between points."""
+        return np.hypot(self.x - point.x, self.y - point.y)
+
+    def dot(self, point: Point | PointArray, /) -> np.ndarray:
+        """Find the dot products of points."""
+        return self.x * point.x + self.y * point.y
+
+    def cross(self, point: Point | PointArray, /) -> np.ndarray:
+        """Find the cross products of points."""
+        return self.x * point.y - self.y * point.x
+
+    def copy(self) -> PointArray:
+        """Copy the points instance."""
+        return PointArray(self.x, self.y)
+
+
 try:
     if __name__ == "__main__":
         from time import sleep
@@ -0,0 +1,127 @@
+"""Python module for picking percentile levels out of large arrays of samples without sorting them."""
+
+from __future__ import annotations
+import numpy as np
+
+CONTOUR_FRACTIONS: list[float] = [
+    0.01, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 0.99
+]
+"""Fractions of the sorted potentials at which contour levels are drawn."""
+
+
+def select(values: np.ndarray, ranks: list[int], offset: int, found: dict[int, float]) -> None:
+    """Partition the values in place around the middle rank, then recurse into both sides for the remaining ranks."""
+    if len(ranks) == 0:
+        return
+    middle = len(ranks) // 2
+    rank = ranks[middle] - offset
+    values.partition(rank)
+    found[ranks[middle]] = float(values[rank])
+    select(values[:rank], ranks[:middle], offset, found)
+    select(values[rank + 1 :], ranks[middle + 1 :], offset + rank + 1, found)
+
+
+def levels(values: np.ndarray, fractions: list[float]) -> list[float]:
+    """Find the samples at the specified fractions of the sorted order, using partial selection instead of a full sort.
+
+    Splitting around the middle rank first keeps the work to the logarithm of the number of fractions passes over
+    the samples, where partitioning at all ranks at once walks them from the last one down.
+    """
+    values = np.array(values, dtype=float).ravel()
+    ranks = [round(fraction * (values.size - 1)) for fraction in fractions]
+    found: dict[int, float] = {}
+    select(values, sorted(set(ranks)), 0, found)
+    return [found[rank] for rank in ranks]
+
+
+class QuantileSketch:
+    """Mergeable streaming summary of samples answering quantile queries within a small rank error.
+
+    Samples are kept in levels of sorted buffers; a level holding more than the capacity is compacted by keeping
+    every other sample, with a random offset, into the next level where every sample counts twice as much. Every
+    compaction moves the rank of any value by at most the weight of the level compacted, which rank_error adds up.
+    Not a number samples are left out.
+    """
+
+    capacity: int
+    buffers: list[np.ndarray]
+    count: int
+    rank_error: float
+    random: np.random.Generator
+
+    def __init__(self, capacity: int = 4096, seed: int | None = None) -> None:
+        """Create an empty sketch keeping about the specified number of samples per level."""
+        self.capacity = capacity
+        self.buffers = [np.empty(0)]
+        self.count = 0
+        self.rank_error = 0.0
+        self.random = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray, /) -> QuantileSketch:
+        """Feed a tile of samples into the sketch."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        self.count += values.size
+        self.buffers[0] = np.concatenate([self.buffers[0], values])
+        self.compact()
+        return self
+
+    def merge(self, sketch: QuantileSketch, /) -> QuantileSketch:
+        """Merge the samples of another sketch into this one."""
+        for level, buffer in enumerate(sketch.buffers):
+            if level == len(self.buffers):
+                self.buffers.append(np.empty(0))
+            self.buffers[level] = np.concatenate([self.buffers[level], buffer])
+        self.count += sketch.count
+        self.rank_error += sketch.rank_error
+        self.compact()
+        return self
+
+    def compact(self) -> None:
+        """Halve every level holding more samples than the capacity into the level above."""
+        level = 0
+        while level < len(self.buffers):
+            buffer = self.buffers[level]
+            if buffer.size > self.capacity:
+                buffer = np.sort(buffer)
+                # An odd sample out stays behind so that the total weight is preserved exactly.
+                if buffer.size % 2 == 1:
+                    keep, buffer = buffer[-1:], buffer[:-1]
+                else:
+                    keep = np.empty(0)
+                promoted = buffer[self.random.integers(2) :: 2]
+                self.rank_error += 2.0**level
+                self.buffers[level] = keep
+                if level + 1 == len(self.buffers):
+                    self.buffers.append(np.empty(0))
+                self.buffers[level + 1] = np.concatenate(
+                    [self.buffers[level + 1], promoted]
+                )
+            level += 1
+
+    def quantiles(self, fractions: list[float]) -> list[float]:
+        """Estimate the samples at the specified fractions of the sorted order, within the rank error and the weight of the top level."""
+        values = np.concatenate(self.buffers)
+        if values.size == 0:
+            return [float("nan") for _ in fractions]
+        weights = np.concatenate(
+            [np.full(buffer.size, 2.0**level) for level, buffer in enumerate(self.buffers)]
+        )
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+        ranks = np.cumsum(weights[order]) - 1
+        total = ranks[-1]
+        indices = np.searchsorted(ranks, [fraction * total for fraction in fractions])
+        return [float(values[min(index, values.size - 1)]) for index in indices]
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
@@ -4,6 +4,88 @@ try:
     import matplotlib.colors as colors
     from charges import System, Point
     from text import text_system
+    from quantiles import CONTOUR_FRACTIONS, levels
+    from adaptive import AdaptiveSampler
+    from cache import GridCache, default_cache
+    from viewer import Viewer
+    from field_lines import FieldLineTracer
+    from matplotlib.collections import LineCollection
+    from matplotlib.figure import Figure
+    from contextlib import nullcontext
+    from instrument import Profiler, phase
+
+
+    def figure_system(
+        system: System,
+        minimum: Point,
+        maximum: Point,
+        title: str,
+        field_size: int = 20,
+        potential_size: int = 100,
+        workers: int = 1,
+        tolerance: float | None = None,
+        cache: GridCache | None = default_cache,
+        field_lines: int = 0,
+    ) -> tuple[Figure, np.ndarray]:
+        if cache is None:
+            cache = GridCache(memory_limit=0)
+        with phase("potentials"):
+            if tolerance is None:
+                potentials = cache.potential_grid(
+                    system, minimum, maximum, potential_size, potential_size, workers
+                )
+            else:
+                potentials = AdaptiveSampler(tolerance, potential_size).sample(
+                    system, minimum, maximum, workers
+                )
+        with phase("levels"):
+            potentials_interest = levels(potentials, CONTOUR_FRACTIONS)
+        with phase("contours"):
+            norm_center = colors.TwoSlopeNorm(vcenter=0)
+            fig, ax = plt.subplots()
+            contourf = ax.contourf(
+                potentials,
+                cmap="seismic",
+                extent=(minimum.x, maximum.x, minimum.y, maximum.y),
+                levels=potentials_interest,
+                extend="both",
+                norm=norm_center,
+            )
+            ax.contour(
+                potentials,
+                extent=(minimum.x, maximum.x, minimum.y, maximum.y),
+                levels=potentials_interest,
+                colors="black",
+                linestyles="solid",
+                linewidths=1,
+                norm=norm_center,
+            )
+        if field_lines > 0:
+            with phase("field lines"):
+                paths = FieldLineTracer().trace(system, minimum, maximum, field_lines)
+                ax.add_collection(
+                    LineCollection(paths, colors="black", linewidths=0.5), autolim=False
+                )
+        else:
+            with phase("field"):
+                x = np.linspace(minimum.x, maximum.x, field_size)
+                y = np.linspace(minimum.y, maximum.y, field_size)
+                u, v = cache.field_grid(
+                    system, minimum, maximum, field_size, field_size, workers
+                )
+                field_len = np.hypot(u, v)
+                field_len[field_len == 0] = np.inf
+                u /= field_len
+                v /= field_len
+                ax.quiver(x, y, u, v)
+        with phase("labels"):
+            ax.set_title(title)
+            ax.set_xlabel("Horizontal displacement (meters)")
+            ax.set_ylabel("Vertical displacement (meters)")
+            ax.set_aspect("equal")
+            cbar = plt.colorbar(contourf)
+            cbar.set_label("Joules per coulomb (Volts)")
+        return fig, potentials
 
 
     def render_system(
@@ -13,80 +95,41 @@ try:
         title: str,
         field_size: int = 20,
         potential_size: int = 100,
+        workers: int = 1,
+        tolerance: float | None = None,
+        cache: GridCache | None = default_cache,
+        interactive: bool = False,
+        field_lines: int = 0,
+        profile: bool = False,
     ) -> None:
+        if interactive:
+            Viewer(
+                system, minimum, maximum, title, field_size=field_size, workers=workers
+            ).show()
+            return
         print("Solving electric field and potential equations numerically...")
-        difference = maximum - minimum
-        potentials = [
-            [
-                system.potential(
-                    Point(
-                        minimum.x + difference.x * (x / (potential_size - 1)),
-                        minimum.y + difference.y * (y / (potential_size - 1)),
-                    )
+        with Profiler(memory=True) if profile else nullcontext() as profiler:
+            with phase("figure"):
+                _, potentials = figure_system(
+                    system,
+                    minimum,
+                    maximum,
+                    title,
+                    field_size,
+                    potential_size,
+                    workers,
+                    tolerance,
+                    cache,
+                    field_lines,
                 )
-                for x in range(potential_size)
-            ]
-            for y in range(potential_size)
-        ]
-        potentials_sorted = sorted(
-            potential for potentials_buffer in potentials for potential in potentials_buffer
-        )
-        potentials_interest = [
-            potentials_sorted[round(0.01 * (len(potentials_sorted) - 1))],
-            potentials_sorted[round(0.05 * (len(potentials_sorted) - 1))],
-            potentials_sorted[round(0.1 * (len(potentials_sorted) - 1))],
-            potentials_sorted[round(0.2 * (len(potentials_sorted) - 1))],
-            potentials_sorted[round(0.3 * (len(potentials_sorted) - 1))],
-            potentials_sorted[round(0.4 * (len(potentials_sorted) - 1))],
-            potentials_sorted[round(0.5 * (len(potentials_sorted) - 1))],
-            potentials_sorted[round(0.6 * (len(potentials_sorted) - 1))],
-            potentials_sorted[round(0.7 * (len(potentials_sorted) - 1))],
-            potentials_sorted[round(0.8 * (len(potentials_sorted) - 1))],
-            potentials_sorted[round(0.9 * (len(potentials_sorted) - 1))],
-            potentials_sorted[round(0.95 * (len(potentials_sorted) - 1))],
-            potentials_sorted[round(0.99 * (len(potentials_sorted) - 1))],
-        ]
-        norm_center = colors.TwoSlopeNorm(vcenter=0)
-        fig, ax = plt.subplots()
-        contourf = ax.contourf(
-            potentials,
-            cmap="seismic",
-            extent=(minimum.x, maximum.x, minimum.y, maximum.y),
-            levels=potentials_interest,
-            extend="both",
-            norm=norm_center,
-        )
-        ax.contour(
-            potentials,
-            extent=(minimum.x, maximum.x, minimum.y, maximum.y),
-            levels=potentials_interest,
-            colors="black",
-            linestyles="solid",
-            linewidths=1,
-            norm=norm_center,
-        )
-        x = np.linspace(minimum.x, maximum.x, field_size)
-        y = np.linspace(minimum.y, maximum.y, field_size)
-        u = np.empty((field_size, field_size))
-        v = np.empty((field_size, field_size))
-        for a in range(field_size):
-            for b in range(field_size):
-                field = system.field(Point(x[a], y[b]))
-                try:
-                    field_unit = field / field.len()
-                except ZeroDivisionError:
-                    field_unit = Point(0, 0)
-                u[b][a] = field_unit.x
-                v[b][a] = field_unit.y
-        ax.quiver(x, y, u, v)
-        ax.set_title(title)
-        ax.set_xlabel("Horizontal displacement (meters)")
-        ax.set_ylabel("Vertical displacement (meters)")
-        ax.set_aspect("equal")
-        cbar = plt.colorbar(contourf)
-        cbar.set_label("Joules per coulomb (Volts)")
-        print("Done, displaying results...\n")
-        text_system(system, minimum, maximum, potential_size=20)
+            print("Done, displaying results...\n")
+            with phase("text"):
+                text_system(
+                    system, minimum, maximum, potential_size=20, potentials=potentials
+                )
+        if profiler is not None:
+            print()
+            print(profiler.summary())
         plt.show()
 
 
@@ -0,0 +1,371 @@
+"""Python module for saving and loading scenes of charges and particles, as text or as memory-mappable arrays."""
+
+from __future__ import annotations
+from pathlib import Path
+import json
+import tomllib
+import numpy as np
+from points import Point
+from charges import (
+    System,
+    Engine,
+    Charge,
+    PointCharge,
+    FiniteLineCharge,
+    CircleCharge,
+    ChargeArray,
+    PROTON_CHARGE,
+    ELECTRON_CHARGE,
+    NEUTRON_CHARGE,
+)
+from particles import System as ParticleSystem, Particle
+
+SCENE_FILE: str = "scene.json"
+"""Name of the description of a binary scene, inside its directory next to the arrays."""
+POINTS_FILE: str = "points.npy"
+"""Name of the array of a binary scene holding the x, y and charge rows of its point charges."""
+PARTICLES_FILE: str = "particles.npy"
+"""Name of the array of a binary scene holding the x, y, velocity x, velocity y, charge and mass rows of its particles."""
+NAMED_CHARGES: dict[str, float] = {
+    "proton": PROTON_CHARGE,
+    "electron": ELECTRON_CHARGE,
+    "neutron": NEUTRON_CHARGE,
+}
+"""Charges that can be given by name instead of in Coulombs."""
+
+
+class Scene:
+    """Charges and charged particles, along with the viewport they are shown over."""
+
+    charges: list[Charge]
+    particles: ParticleSystem | None
+    minimum: Point
+    maximum: Point
+
+    def __init__(
+        self,
+        charges: list[Charge],
+        particles: ParticleSystem | None = None,
+        minimum: Point | None = None,
+        maximum: Point | None = None,
+    ) -> None:
+        """Create a scene, shown from (0, 0) to (10, 10) unless told otherwise."""
+        self.charges = charges
+        self.particles = particles
+        self.minimum = Point(0, 0) if minimum is None else minimum
+        self.maximum = Point(10, 10) if maximum is None else maximum
+
+    def system(self, engine: Engine | None = None) -> System:
+        """Create a system of the charges of the scene."""
+        return System(list(self.charges), engine)
+
+
+def point(value: list[float]) -> Point:
+    """Create a point from a pair of coordinates."""
+    x, y = value
+    return Point(float(x), float(y))
+
+
+def charge_value(value: float | str) -> float:
+    """Read a charge in Coulombs or by the name of a particle."""
+    if isinstance(value, str):
+        if value not in NAMED_CHARGES:
+            raise ValueError(f"Unknown charge name {value!r}.")
+        return NAMED_CHARGES[value]
+    return float(value)
+
+
+def build_charges(description: dict) -> list[Charge]:
+    """Create the charges of a description, a square being made of four line charges."""
+    kind = description.get("type")
+    charge = charge_value(description.get("charge", 0.0))
+    points = int(description.get("points", 100))
+    if kind == "point":
+        return [PointCharge(charge, point(description["position"]))]
+    if kind == "line":
+        return [
+            FiniteLineCharge(
+                charge,
+                point(description["start"]),
+                point(description["end"]),
+                points,
+                analytic=bool(description.get("analytic", False)),
+            )
+        ]
+    if kind == "circle":
+        return [
+            CircleCharge(
+                charge, point(description["center"]), float(description["radius"]), points
+            )
+        ]
+    if kind == "square":
+        center = point(description["center"])
+        half = float(description["size"]) / 2
+        corners = [
+            Point(center.x - half, center.y + half),
+            Point(center.x + half, center.y + half),
+            Point(center.x + half, center.y - half),
+            Point(center.x - half, center.y - half),
+        ]
+        return [
+            FiniteLineCharge(
+                charge / 4,
+                corners[n],
+                corners[(n + 1) % 4],
+                points,
+                analytic=bool(description.get("analytic", True)),
+            )
+            for n in range(4)
+        ]
+    if kind == "array":
+        return [
+            ChargeArray(
+                np.array(description["x"], dtype=float),
+                np.array(description["y"], dtype=float),
+                np.array(description["q"], dtype=float),
+            )
+        ]
+    raise ValueError(f"Unknown charge type {kind!r}.")
+
+
+def describe(charge: Charge) -> dict:
+    """Describe a charge with the plain values it is built from."""
+    if type(charge) is PointCharge:
+        return {
+            "type": "point",
+            "charge": charge.charge,
+            "position": [charge.point.x, charge.point.y],
+        }
+    if type(charge) is FiniteLineCharge:
+        return {
+            "type": "line",
+            "charge": charge.charge,
+            "start": [charge.point_1.x, charge.point_1.y],
+            "end": [charge.point_2.x, charge.point_2.y],
+            "points": len(charge.xs),
+            "analytic": charge.analytic,
+        }
+    if type(charge) is CircleCharge:
+        return {
+            "type": "circle",
+            "charge": charge.charge,
+            "center": [charge.center.x, charge.center.y],
+            "radius": charge.radius,
+            "points": len(charge.xs),
+        }
+    if type(charge) is ChargeArray:
+        return {
+            "type": "array",
+            "x": charge.xs.tolist(),
+            "y": charge.ys.tolist(),
+            "q": charge.qs.tolist(),
+        }
+    raise ValueError(f"Charges of type {type(charge).__name__} cannot be saved.")
+
+
+def particle_system(
+    x: np.ndarray,
+    y: np.ndarray,
+    velocity_x: np.ndarray,
+    velocity_y: np.ndarray,
+    charge: np.ndarray,
+    mass: np.ndarray,
+) -> ParticleSystem:
+    """Create a particle system straight from its arrays, without building a particle for each of them."""
+    system = ParticleSystem([])
+    system.x = x
+    system.y = y
+    system.velocity_x = velocity_x
+    system.velocity_y = velocity_y
+    system.charge = charge
+    system.mass = mass
+    return system
+
+
+def build_scene(content: dict) -> Scene:
+    """Create a scene from its description."""
+    charges: list[Charge] = []
+    for description in content.get("charges", []):
+        charges.extend(build_charges(description))
+    particles = None
+    if "particles" in content:
+        particles = ParticleSystem(
+            [
+                Particle(
+                    charge_value(description["charge"]),
+                    float(description["mass"]),
+                    point(description["position"]),
+                    point(description.get("velocity", [0, 0])),
+                )
+                for description in content["particles"]
+            ]
+        )
+    return Scene(
+        charges,
+        particles,
+        point(content.get("minimum", [0, 0])),
+        point(content.get("maximum", [10, 10])),
+    )
+
+
+def describe_scene(scene: Scene, charges: list[Charge] | None = None) -> dict:
+    """Describe a scene with plain values, only with the specified charges if given."""
+    content: dict = {
+        "minimum": [scene.minimum.x, scene.minimum.y],
+        "maximum": [scene.maximum.x, scene.maximum.y],
+        "charges": [describe(charge) for charge in (scene.charges if charges is None else charges)],
+    }
+    if scene.particles is not None:
+        particles = scene.particles
+        content["particles"] = [
+            {"charge": charge, "mass": mass, "position": [x, y], "velocity": [vx, vy]}
+            for x, y, vx, vy, charge, mass in zip(
+                *(
+                    array.tolist()
+                    for array in (
+                        particles.x,
+                        particles.y,
+                        particles.velocity_x,
+                        particles.velocity_y,
+                        particles.charge,
+                        particles.mass,
+                    )
+                )
+            )
+        ]
+    return content
+
+
+def toml_value(value: object) -> str:
+    """Write a plain value in TOML."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, str):
+        return json.dumps(value)
+    if isinstance(value, list):
+        return "[" + ", ".join(toml_value(item) for item in value) + "]"
+    return repr(value)
+
+
+def toml(content: dict) -> str:
+    """Write the description of a scene in TOML, with the charges and particles as arrays of tables."""
+    lines = [
+        f"{key} = {toml_value(value)}"
+        for key, value in content.items()
+        if not isinstance(value, list) or not all(isinstance(item, dict) for item in value)
+    ]
+    for key, value in content.items():
+        if isinstance(value, list) and len(value) > 0 and all(isinstance(item, dict) for item in value):
+            for table in value:
+                lines.append(f"\n[[{key}]]")
+                lines.extend(f"{name} = {toml_value(item)}" for name, item in table.items())
+    return "\n".join(lines) + "\n"
+
+
+def save_scene(scene: Scene, path: str | Path) -> None:
+    """Save a scene as JSON or TOML depending on the extension of the path, or else as a directory of arrays.
+
+    The directory holds the point charges and particles as arrays that load memory-mapped, and describes the charges
+    in JSON in their order, point charges and charge arrays by the columns of the array they take.
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        path.write_text(json.dumps(describe_scene(scene), indent=2))
+        return
+    if path.suffix == ".toml":
+        path.write_text(toml(describe_scene(scene)))
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    content = describe_scene(scene, [])
+    columns: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+    start = 0
+    for charge in scene.charges:
+        if type(charge) not in (PointCharge, ChargeArray):
+            content["charges"].append(describe(charge))
+            continue
+        kind = "point" if type(charge) is PointCharge else "array"
+        columns.append(charge.arrays())
+        stop = start + len(columns[-1][0])
+        previous = content["charges"][-1] if len(content["charges"]) > 0 else {}
+        # Point charges in a row share a description, one column each.
+        if kind == "point" and previous.get("type") == "point" and "columns" in previous:
+            previous["columns"][1] = stop
+        else:
+            content["charges"].append({"type": kind, "columns": [start, stop]})
+        start = stop
+    for name in (POINTS_FILE, PARTICLES_FILE):
+        (path / name).unlink(missing_ok=True)
+    if len(columns) > 0:
+        np.save(
+            path / POINTS_FILE,
+            np.stack([np.concatenate(column) for column in zip(*columns)]),
+        )
+    if scene.particles is not None and len(scene.particles.x) > 0:
+        particles = scene.particles
+        np.save(
+            path / PARTICLES_FILE,
+            np.stack(
+                [
+                    particles.x,
+                    particles.y,
+                    particles.velocity_x,
+                    particles.velocity_y,
+                    particles.charge,
+                    particles.mass,
+                ]
+            ),
+        )
+    (path / SCENE_FILE).write_text(json.dumps(content, indent=2))
+
+
+def load_scene(path: str | Path, mmap: bool = True) -> Scene:
+    """Load a scene saved as JSON, TOML or a directory of arrays.
+
+    The charge arrays of a directory come back as views of its array of point charges, memory mapped unless told
+    otherwise, so that no object is built for each of their charges. Particles are mapped copy on write, so they can
+    move without changing the file.
+    """
+    path = Path(path)
+    if path.suffix == ".json":
+        return build_scene(json.loads(path.read_text()))
+    if path.suffix == ".toml":
+        return build_scene(tomllib.loads(path.read_text()))
+    content = json.loads((path / SCENE_FILE).read_text())
+    points = None
+    if (path / POINTS_FILE).exists():
+        points = np.load(path / POINTS_FILE, mmap_mode="r" if mmap else None)
+    charges: list[Charge] = []
+    for description in content.get("charges", []):
+        if "columns" not in description:
+            charges.extend(build_charges(description))
+            continue
+        start, stop = description["columns"]
+        x, y, q = points[:, start:stop]
+        if description["type"] == "array":
+            charges.append(ChargeArray(x, y, q))
+        else:
+            charges.extend(
+                PointCharge(value, Point(position_x, position_y))
+                for position_x, position_y, value in zip(x.tolist(), y.tolist(), q.tolist())
+            )
+    scene = build_scene({**content, "charges": []})
+    scene.charges = charges
+    # Directories saved before the charges recorded their columns kept every point charge as one array in front.
+    if points is not None and not any("columns" in description for description in content.get("charges", [])):
+        scene.charges.insert(0, ChargeArray(*points))
+    if (path / PARTICLES_FILE).exists():
+        particles = np.load(path / PARTICLES_FILE, mmap_mode="c" if mmap else None)
+        scene.particles = particle_system(*particles)
+    return scene
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
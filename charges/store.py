@@ -0,0 +1,249 @@
+"""Python module for storing large numbers of point and segment sources in contiguous arrays."""
+
+from __future__ import annotations
+import numpy as np
+import kernels
+from kernels import (
+    point_contributions,
+    point_field,
+    point_potential,
+    segment_contributions,
+    segment_field,
+    segment_potential,
+)
+
+
+class ChargeStore:
+    """Structure of arrays holding the point sources and uniformly charged segments, grouped by the charge they came from."""
+
+    x: np.ndarray
+    y: np.ndarray
+    q: np.ndarray
+    group: np.ndarray
+    x1: np.ndarray
+    y1: np.ndarray
+    x2: np.ndarray
+    y2: np.ndarray
+    line_q: np.ndarray
+    line_group: np.ndarray
+    groups: int
+
+    def __init__(
+        self,
+        sources: list[tuple[np.ndarray, np.ndarray, np.ndarray]],
+        segments: list[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]]
+        | None = None,
+    ) -> None:
+        """Flatten the point sources and segments of each charge into a single store."""
+        if segments is None:
+            segments = [empty_segments() for _ in sources]
+        self.x, self.y, self.q, self.group = flatten(sources, 3)
+        self.x1, self.y1, self.x2, self.y2, self.line_q, self.line_group = flatten(
+            segments, 5
+        )
+        self.groups = len(sources)
+
+    def __len__(self) -> int:
+        """Find the number of point sources in the store."""
+        return len(self.q)
+
+    @property
+    def nbytes(self) -> int:
+        """Find the memory used by the store arrays in bytes."""
+        return sum(
+            array.nbytes
+            for array in (
+                self.x,
+                self.y,
+                self.q,
+                self.group,
+                self.x1,
+                self.y1,
+                self.x2,
+                self.y2,
+                self.line_q,
+                self.line_group,
+            )
+        )
+
+    @property
+    def compiled(self) -> bool:
+        """Find whether evaluating the store runs the compiled kernels, which only cover point sources."""
+        return kernels.BACKEND == "numba" and len(self.q) > 0
+
+    def points(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Find the positions and charges of the point sources."""
+        return self.x, self.y, self.q
+
+    def segments(
+        self,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Find the end points and charges of the segments."""
+        return self.x1, self.y1, self.x2, self.y2, self.line_q
+
+    def reduce(self, values: np.ndarray, line_values: np.ndarray, /) -> np.ndarray:
+        """Sum values given for every point source and segment into one value per charge."""
+        return np.bincount(
+            self.group, weights=values, minlength=self.groups
+        ) + np.bincount(self.line_group, weights=line_values, minlength=self.groups)
+
+    def contributions(
+        self, x: float, y: float, /
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Calculate the electric potential and field caused by each charge at a single point."""
+        point_terms = point_contributions(x, y, *self.points())
+        segment_terms = segment_contributions(x, y, *self.segments())
+        return tuple(
+            self.reduce(values, line_values)
+            for values, line_values in zip(point_terms, segment_terms)
+        )
+
+    def field_grid(
+        self, xs: np.ndarray, ys: np.ndarray, /
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate the electric field components at arrays of points."""
+        field_x, field_y = point_field(xs, ys, *self.points())
+        line_field_x, line_field_y = self.segment_field_grid(xs, ys)
+        return field_x + line_field_x, field_y + line_field_y
+
+    def potential_grid(self, xs: np.ndarray, ys: np.ndarray, /) -> np.ndarray:
+        """Calculate the electric potential at arrays of points."""
+        return point_potential(xs, ys, *self.points()) + self.segment_potential_grid(
+            xs, ys
+        )
+
+    def segment_field_grid(
+        self, xs: np.ndarray, ys: np.ndarray, /
+    ) -> tuple[np.ndarray, np.ndarray] | tuple[float, float]:
+        """Calculate the electric field components of the segments alone at arrays of points."""
+        if len(self.line_q) == 0:
+            return 0.0, 0.0
+        return segment_field(xs, ys, *self.segments())
+
+    def segment_potential_grid(
+        self, xs: np.ndarray, ys: np.ndarray, /
+    ) -> np.ndarray | float:
+        """Calculate the electric potential of the segments alone at arrays of points."""
+        if len(self.line_q) == 0:
+            return 0.0
+        return segment_potential(xs, ys, *self.segments())
+
+    def rows(self, group: int, /) -> tuple[slice, slice]:
+        """Find the rows of the point sources and of the segments of a charge, which follow each other."""
+        start, stop = np.searchsorted(self.group, [group, group + 1])
+        line_start, line_stop = np.searchsorted(self.line_group, [group, group + 1])
+        return slice(int(start), int(stop)), slice(int(line_start), int(line_stop))
+
+    def sources(
+        self, group: int, /
+    ) -> tuple[tuple[np.ndarray, ...], tuple[np.ndarray, ...]]:
+        """Find the point sources and segments of a charge, as views of the store arrays."""
+        points, lines = self.rows(group)
+        return (
+            tuple(array[points] for array in self.points()),
+            tuple(array[lines] for array in self.segments()),
+        )
+
+    def splice(
+        self,
+        group: int,
+        sources: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None,
+        segments: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+        | None = None,
+    ) -> ChargeStore:
+        """Create a store with the sources of one charge replaced, without reading the other charges again.
+
+        A charge one past the last is added, and a charge is removed when no sources are given for it.
+        """
+        removed = sources is None and segments is None
+        if sources is None:
+            sources = tuple(np.empty(0) for _ in range(3))
+        if segments is None:
+            segments = empty_segments()
+        points, lines = self.rows(group)
+        store = ChargeStore([])
+        store.x, store.y, store.q, store.group = splice_columns(
+            self.points(), self.group, points, sources, group, removed
+        )
+        store.x1, store.y1, store.x2, store.y2, store.line_q, store.line_group = (
+            splice_columns(self.segments(), self.line_group, lines, segments, group, removed)
+        )
+        store.groups = self.groups - 1 if removed else max(self.groups, group + 1)
+        return store
+
+
+def mapped(array: np.ndarray) -> bool:
+    """Find whether an array is a view of a file memory mapped read only, which no array can change."""
+    while isinstance(array, np.ndarray):
+        if isinstance(array, np.memmap) and array.mode == "r":
+            return True
+        array = array.base
+    return False
+
+
+def copy(array: np.ndarray) -> np.ndarray:
+    """Copy an array of floats, unless it is a view of a file memory mapped read only, like the arrays of a scene.
+
+    A read only view of a writable array is still copied, as the array it views can change.
+    """
+    if isinstance(array, np.ndarray) and array.dtype == float and mapped(array):
+        return array
+    return np.array(array, dtype=float)
+
+
+def splice_columns(
+    columns: tuple[np.ndarray, ...],
+    group: np.ndarray,
+    rows: slice,
+    new: tuple[np.ndarray, ...],
+    index: int,
+    removed: bool,
+) -> tuple[np.ndarray, ...]:
+    """Replace some rows of columns with new ones belonging to a charge, and renumber the charges after it if it is removed."""
+    after = group[rows.stop :] - 1 if removed else group[rows.stop :]
+    return (
+        *(
+            np.concatenate([column[: rows.start], np.asarray(values, dtype=float), column[rows.stop :]])
+            for column, values in zip(columns, new)
+        ),
+        np.concatenate(
+            [
+                group[: rows.start],
+                np.full(len(new[0]), index, dtype=np.int32),
+                after.astype(np.int32),
+            ]
+        ),
+    )
+
+
+def empty_segments() -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Create the segment arrays of a charge without any segments."""
+    return tuple(np.empty(0) for _ in range(5))
+
+
+def flatten(arrays: list[tuple[np.ndarray, ...]], width: int) -> tuple[np.ndarray, ...]:
+    """Concatenate per charge arrays column by column and append the group id of every row."""
+    sizes = [len(columns[0]) for columns in arrays]
+    filled = [row for row, size in zip(arrays, sizes) if size > 0]
+    if len(filled) == 1:
+        # The arrays of a single charge memory mapped read only, such as those of a scene, are used as they are.
+        columns = tuple(copy(column) for column in filled[0])
+    else:
+        columns = tuple(
+            np.concatenate([np.asarray(row[n], dtype=float) for row in arrays] or [np.empty(0)])
+            for n in range(width)
+        )
+    group = np.repeat(np.arange(len(arrays), dtype=np.int32), sizes)
+    return *columns, group
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
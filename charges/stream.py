@@ -0,0 +1,192 @@
+"""Python module for rendering potential maps larger than memory tile by tile onto disk."""
+
+from __future__ import annotations
+from collections.abc import Iterator
+from math import ceil, log2
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.image import imsave
+from charges import System
+from points import Point
+from quantiles import CONTOUR_FRACTIONS, QuantileSketch
+
+TILE_SIZE: int = 256
+"""Width and height in pixels of the image tiles of the pyramid."""
+COMPUTE_TILE_SIZE: int = 1024
+"""Width and height in samples of the tiles the potential is computed in."""
+
+
+def tiles(
+    system: System,
+    minimum: Point,
+    maximum: Point,
+    width: int,
+    height: int,
+    tile_size: int = COMPUTE_TILE_SIZE,
+    workers: int = 1,
+) -> Iterator[tuple[slice, slice, np.ndarray]]:
+    """Generate the potential over a grid of the specified size tile by tile, with the rows and columns of each tile."""
+    xs = np.linspace(minimum.x, maximum.x, width)
+    ys = np.linspace(minimum.y, maximum.y, height)
+    for row in range(0, height, tile_size):
+        rows = slice(row, min(row + tile_size, height))
+        for column in range(0, width, tile_size):
+            columns = slice(column, min(column + tile_size, width))
+            yield rows, columns, system.potential_grid(
+                *np.meshgrid(xs[columns], ys[rows]), workers=workers
+            )
+
+
+def stream_potentials(
+    system: System,
+    minimum: Point,
+    maximum: Point,
+    path: str | Path,
+    width: int,
+    height: int,
+    tile_size: int = COMPUTE_TILE_SIZE,
+    workers: int = 1,
+) -> list[float]:
+    """Write the potential over a grid to a memory-mapped .npy file, returning the contour levels estimated on the way."""
+    potentials = np.lib.format.open_memmap(
+        path, mode="w+", dtype=np.float64, shape=(height, width)
+    )
+    sketch = QuantileSketch(seed=0)
+    for rows, columns, tile in tiles(
+        system, minimum, maximum, width, height, tile_size, workers
+    ):
+        potentials[rows, columns] = tile
+        sketch.update(tile)
+    potentials.flush()
+    del potentials
+    return sketch.quantiles(CONTOUR_FRACTIONS)
+
+
+def palette(levels: list[float]) -> np.ndarray:
+    """Find the color of every band between the levels, centered on zero like the contour plot of render_system."""
+    bounds = [levels[0], *levels, levels[-1]]
+    centers = np.array(
+        [(low + high) / 2 for low, high in zip(bounds[:-1], bounds[1:])]
+    )
+    low = min(levels[0], 0.0)
+    high = max(levels[-1], 0.0)
+    normals = np.full(centers.size, 0.5)
+    if low < 0:
+        normals[centers < 0] = 0.5 * (1 - centers[centers < 0] / low)
+    if high > 0:
+        normals[centers > 0] = 0.5 + 0.5 * centers[centers > 0] / high
+    return colormaps["seismic"](normals, bytes=True)
+
+
+def downsample(source: np.ndarray, destination: np.ndarray, tile_size: int) -> None:
+    """Average every two by two block of the source into the destination, one tile of the destination at a time."""
+    height, width = destination.shape
+    for row in range(0, height, tile_size):
+        for column in range(0, width, tile_size):
+            block = np.asarray(
+                source[
+                    2 * row : 2 * min(row + tile_size, height),
+                    2 * column : 2 * min(column + tile_size, width),
+                ]
+            )
+            # Odd edges are padded by repeating the last row or column.
+            block = np.pad(
+                block,
+                ((0, block.shape[0] % 2), (0, block.shape[1] % 2)),
+                mode="edge",
+            )
+            destination[
+                row : row + block.shape[0] // 2, column : column + block.shape[1] // 2
+            ] = block.reshape(
+                block.shape[0] // 2, 2, block.shape[1] // 2, 2
+            ).mean(axis=(1, 3))
+
+
+def pyramid(
+    path: str | Path,
+    directory: str | Path,
+    levels: list[float],
+    tile_size: int = TILE_SIZE,
+) -> int:
+    """Write the potentials of a .npy file as a pyramid of image tiles, returning the number of zoom levels.
+
+    Tiles are written to directory/zoom/row_column.png, zoom 0 being the coarsest level that fits in one tile and
+    row 0 being the top of the map.
+    """
+    directory = Path(directory)
+    colors = palette(levels)
+    source = np.load(path, mmap_mode="r")
+    height, width = source.shape
+    zooms = max(0, ceil(log2(max(height, width) / tile_size))) + 1
+    with TemporaryDirectory() as temporary:
+        for zoom in reversed(range(zooms)):
+            if zoom < zooms - 1:
+                reduced = np.lib.format.open_memmap(
+                    Path(temporary) / f"{zoom}.npy",
+                    mode="w+",
+                    dtype=np.float64,
+                    shape=((source.shape[0] + 1) // 2, (source.shape[1] + 1) // 2),
+                )
+                downsample(source, reduced, tile_size)
+                source = reduced
+            (directory / str(zoom)).mkdir(parents=True, exist_ok=True)
+            height, width = source.shape
+            for row in range(0, height, tile_size):
+                for column in range(0, width, tile_size):
+                    # Rows of the grid go up, rows of the image go down.
+                    tile = np.asarray(
+                        source[
+                            max(0, height - row - tile_size) : height - row,
+                            column : column + tile_size,
+                        ]
+                    )[::-1]
+                    imsave(
+                        directory
+                        / str(zoom)
+                        / f"{row // tile_size}_{column // tile_size}.png",
+                        colors[np.searchsorted(levels, tile)],
+                    )
+        del source
+    return zooms
+
+
+def render_streaming(
+    system: System,
+    minimum: Point,
+    maximum: Point,
+    directory: str | Path,
+    width: int,
+    height: int,
+    tile_size: int = COMPUTE_TILE_SIZE,
+    workers: int = 1,
+) -> int:
+    """Render the potential of a system into directory/potentials.npy and a pyramid of image tiles with bounded memory."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    print("Solving electric potential equations numerically, tile by tile...")
+    levels = stream_potentials(
+        system,
+        minimum,
+        maximum,
+        directory / "potentials.npy",
+        width,
+        height,
+        tile_size,
+        workers,
+    )
+    print("Done, writing image pyramid...")
+    return pyramid(directory / "potentials.npy", directory, levels)
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
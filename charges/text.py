@@ -1,78 +1,136 @@
 try:
+    import numpy as np
     from math import sqrt
     from random import choice, randint
+    from time import perf_counter, sleep
     from rich.console import Console
+    from rich.live import Live
+    from rich.text import Span, Text
     from charges import System
     from points import Point
+    from quantiles import levels
+    from cache import GridCache, default_cache
+    from particles import System as ParticleSystem
+    from store import ChargeStore
 
     letters = "@%*."
     console = Console()
 
 
+    def resample(potentials: np.ndarray, size: int) -> np.ndarray:
+        rows = np.round(np.linspace(0, potentials.shape[0] - 1, size)).astype(int)
+        columns = np.round(np.linspace(0, potentials.shape[1] - 1, size)).astype(int)
+        return potentials[np.ix_(rows, columns)]
+
+
+    def frame(potentials: np.ndarray, potential_low: float, potential_high: float) -> Text:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            normals = np.where(
+                potentials < 0,
+                -potentials / potential_low,
+                np.where(potentials > 0, potentials / potential_high, 0.0),
+            )
+        normals = np.clip(np.nan_to_num(normals), -1, 1)[::-1]
+        channels = np.round(255 * (1 - np.abs(normals))).astype(int)
+        red = np.where(normals < 0, channels, 255)
+        blue = np.where(normals > 0, channels, 255)
+        indices = np.clip(np.round((len(letters) - 1) * (1 - np.abs(normals))), 0, len(letters) - 1)
+        cells = np.array(list(letters))[indices.astype(int)]
+        colors = (red << 16) | (channels << 8) | blue
+
+        dark = "rgb(60,60,60)"
+        light = "rgb(90,90,90)"
+        width = 2 * potentials.shape[1]
+        pieces: list[str] = []
+        spans: list[Span] = []
+        length = 0
+
+        def add(piece: str, style: str) -> None:
+            nonlocal length
+            pieces.append(piece)
+            spans.append(Span(length, length + len(piece), style))
+            length += len(piece)
+
+        add(" " + "#" * (width + 6) + " ", dark)
+        add("\n##", dark)
+        add("#" * (width + 4), light)
+        add("##", dark)
+        for row in range(potentials.shape[0]):
+            add("\n##", dark)
+            add("##", light)
+            # Neighboring cells of the same color share a span, so a row takes as many spans as color changes.
+            starts = np.flatnonzero(np.diff(colors[row], prepend=-1))
+            stops = np.append(starts[1:], len(colors[row]))
+            for start, stop in zip(starts.tolist(), stops.tolist()):
+                color = int(colors[row, start])
+                add(
+                    "".join(cells[row, start:stop].repeat(2)),
+                    f"rgb({color >> 16},{(color >> 8) & 255},{color & 255})",
+                )
+            add("##", light)
+            add("##", dark)
+        add("\n##", dark)
+        add("#" * (width + 4), light)
+        add("##", dark)
+        add("\n " + "#" * (width + 6) + " ", dark)
+        return Text("".join(pieces), spans=spans)
+
+
     def text_system(
-        system: System, minimum: Point, maximum: Point, potential_size: int = 10
+        system: System,
+        minimum: Point,
+        maximum: Point,
+        potential_size: int = 10,
+        cache: GridCache | None = default_cache,
+        potentials: np.ndarray | None = None,
     ) -> None:
-        difference = maximum - minimum
-        potentials = [
-            [
-                system.potential(
-                    Point(
-                        minimum.x + difference.x * (x / (potential_size - 1)),
-                        minimum.y + difference.y * (y / (potential_size - 1)),
-                    )
-                )
-                for x in range(potential_size)
-            ]
-            for y in range(potential_size)
-        ]
-        potentials_sorted = sorted(
-            potential for potentials_buffer in potentials for potential in potentials_buffer
+        if potentials is None:
+            if cache is None:
+                cache = GridCache(memory_limit=0)
+            potentials = cache.potential_grid(
+                system, minimum, maximum, potential_size, potential_size
+            )
+        elif potentials.shape != (potential_size, potential_size):
+            potentials = resample(potentials, potential_size)
+        potential_low, potential_high = levels(potentials, [0.02, 0.98])
+        console.print(frame(potentials, potential_low, potential_high))
+
+
+    def particle_potentials(
+        system: ParticleSystem, xs: np.ndarray, ys: np.ndarray
+    ) -> np.ndarray:
+        store = ChargeStore([(system.x, system.y, system.charge)])
+        if system.engine is not None:
+            return system.engine.potential_grid(store, xs, ys)
+        return store.potential_grid(xs, ys)
+
+
+    def live_particles(
+        system: ParticleSystem,
+        minimum: Point,
+        maximum: Point,
+        time_step: float,
+        steps_per_frame: int = 1,
+        potential_size: int = 40,
+        frames: int | None = None,
+        frame_rate: float = 20,
+    ) -> None:
+        xs, ys = np.meshgrid(
+            np.linspace(minimum.x, maximum.x, potential_size),
+            np.linspace(minimum.y, maximum.y, potential_size),
         )
-        potential_low = potentials_sorted[round(0.02 * (len(potentials_sorted) - 1))]
-        potential_high = potentials_sorted[round(0.98 * (len(potentials_sorted) - 1))]
-
-        normals = [[0.0 for x in range(potential_size)] for y in range(potential_size)]
-        for x in range(potential_size):
-            for y in range(potential_size):
-                potential = potentials[x][y]
-                if potential < 0:
-                    normal = min(max(-potential / potential_low, -1), 1)
-                elif potential > 0:
-                    normal = min(max(potential / potential_high, -1), 1)
-                else:
-                    normal = 0
-                normals[x][y] = normal
-
-        console.print(" " + ("#" * (2 * potential_size + 6)) + " ", style="rgb(60,60,60)")
-        console.print("##", end="", style="rgb(60,60,60)")
-        console.print("#" * (2 * potential_size + 4), end="", style="rgb(90,90,90)")
-        console.print("##", style="rgb(60,60,60)")
-        for x in range(potential_size):
-            for _ in range(2):
-                console.print("#", end="", style="rgb(60,60,60)")
-            for _ in range(2):
-                console.print("#", end="", style="rgb(90,90,90)")
-            for y in range(potential_size):
-                normal = normals[-x - 1][y]
-                if normal < 0:
-                    channel = round(255 * (normal + 1))
-                    color = f"rgb({channel},{channel},{255})"
-                elif normal > 0:
-                    channel = round(255 * (1 - normal))
-                    color = f"rgb({255},{channel},{channel})"
-                else:
-                    color = "rgb(255,255,255)"
-                letter = letters[min(max(round((len(letters) - 1) * (1 - abs(normal))), 0), len(letters) - 1)]
-                console.print(letter + letter, style=f"{color}", end="")
-            for _ in range(2):
-                console.print("#", style="rgb(90,90,90)", end="")
-            for _ in range(2):
-                console.print("#", style="rgb(60,60,60)", end="")
-            console.print("")
-        console.print("##", end="", style="rgb(60,60,60)")
-        console.print("#" * (2 * potential_size + 4), end="", style="rgb(90,90,90)")
-        console.print("##", style="rgb(60,60,60)")
-        console.print(" " + ("#" * (2 * potential_size + 6)) + " ", style="rgb(60,60,60)")
+        frame_count = 0
+        with Live(console=console, auto_refresh=False) as live:
+            while frames is None or frame_count < frames:
+                start = perf_counter()
+                for _ in range(steps_per_frame):
+                    system.iterate(time_step)
+                potentials = particle_potentials(system, xs, ys)
+                live.update(
+                    frame(potentials, *levels(potentials, [0.02, 0.98])), refresh=True
+                )
+                frame_count += 1
+                sleep(max(0.0, 1 / frame_rate - (perf_counter() - start)))
 
 
     if __name__ == "__main__":
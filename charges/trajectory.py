@@ -0,0 +1,285 @@
+"""Python module for recording the trajectories of particle systems to disk in compressed chunks and replaying them."""
+
+from __future__ import annotations
+from collections.abc import Iterator
+from pathlib import Path
+import json
+import mmap
+import zlib
+import numpy as np
+from particles import System
+
+QUANTITIES: tuple[str, ...] = ("x", "y", "velocity_x", "velocity_y")
+"""Arrays of the system recorded for every particle at every frame, in order."""
+MEMORY_BUDGET: int = 64 << 20
+"""Bytes of frames a recorder keeps in memory before compressing them into a chunk."""
+LEVEL: int = 6
+"""Compression level of the chunks, from 1 for the fastest to 9 for the smallest."""
+DESCRIPTION_FILE: str = "trajectory.json"
+"""Name of the description of a recording, inside its directory."""
+FRAMES_FILE: str = "frames.bin"
+"""Name of the file of time, kinetic energy and potential energy, if recorded, of every frame, as raw 64 bit floats."""
+INDEX_FILE: str = "index.bin"
+"""Name of the file of first frame, number of frames, offset and length of every chunk, as raw 64 bit integers."""
+CHUNKS_FILE: str = "chunks.bin"
+"""Name of the file of compressed chunks, one after the other."""
+
+
+def shuffle(array: np.ndarray) -> bytes:
+    """Compress an array of floats, grouping the bytes of its values by significance so that they compress better."""
+    return zlib.compress(
+        np.ascontiguousarray(array).view(np.uint8).reshape(-1, 8).T.tobytes(), LEVEL
+    )
+
+
+def unshuffle(data: bytes, shape: tuple[int, ...]) -> np.ndarray:
+    """Decompress an array of floats compressed by shuffle."""
+    grouped = np.frombuffer(zlib.decompress(data), dtype=np.uint8).reshape(8, -1)
+    return np.ascontiguousarray(grouped.T).view(np.float64).reshape(shape)
+
+
+class TrajectoryRecorder:
+    """Recorder streaming the positions and velocities of a particle system to a directory every few steps.
+
+    Frames are buffered up to a memory budget, then compressed into a chunk appended to the recording, so that runs
+    of any length take a fixed amount of memory. The time and energies of every frame are kept uncompressed next to
+    the chunks, to look frames up by time without decompressing anything.
+    """
+
+    path: Path
+    system: System
+    every: int
+    energies: bool
+    chunk_frames: int
+    buffer: np.ndarray
+    scalars: np.ndarray
+    buffered: int
+    frames: int
+    steps: int
+    time: float
+
+    def __init__(
+        self,
+        path: str | Path,
+        system: System,
+        every: int = 1,
+        memory_budget: int = MEMORY_BUDGET,
+        energies: bool = False,
+    ) -> None:
+        """Start a new recording of a system in a directory, from its current state as the first frame.
+
+        The potential energy sums over every pair of particles, so it is only recorded when asked for.
+        """
+        self.path = Path(path)
+        self.system = system
+        self.every = every
+        self.energies = energies
+        frame_bytes = len(QUANTITIES) * len(system.x) * 8
+        self.chunk_frames = max(1, memory_budget // max(1, frame_bytes))
+        self.buffer = np.empty((self.chunk_frames, len(QUANTITIES), len(system.x)))
+        self.scalars = np.empty((self.chunk_frames, 3))
+        self.buffered = 0
+        self.frames = 0
+        self.steps = 0
+        self.time = 0.0
+        self.path.mkdir(parents=True, exist_ok=True)
+        for name in (FRAMES_FILE, INDEX_FILE, CHUNKS_FILE):
+            (self.path / name).write_bytes(b"")
+        (self.path / DESCRIPTION_FILE).write_text(
+            json.dumps(
+                {
+                    "particles": len(system.x),
+                    "every": every,
+                    "chunk_frames": self.chunk_frames,
+                    "quantities": list(QUANTITIES),
+                    "charge": system.charge.tolist(),
+                    "mass": system.mass.tolist(),
+                },
+                indent=2,
+            )
+        )
+        self.record()
+
+    def __enter__(self) -> TrajectoryRecorder:
+        """Use the recorder until the end of the block, then write what is left."""
+        return self
+
+    def __exit__(self, *exception: object) -> None:
+        """Write the frames left in memory."""
+        self.flush()
+
+    def record(self) -> None:
+        """Add the current state of the system as a frame, writing a chunk once the buffer is full."""
+        for n, name in enumerate(QUANTITIES):
+            self.buffer[self.buffered, n] = getattr(self.system, name)
+        self.scalars[self.buffered] = (
+            self.time,
+            self.system.kinetic_energy(),
+            self.system.potential_energy() if self.energies else np.nan,
+        )
+        self.buffered += 1
+        if self.buffered == self.chunk_frames:
+            self.flush()
+
+    def step(self, time: float) -> None:
+        """Advance the system by a time step, recording a frame every few steps."""
+        self.system.iterate(time)
+        self.time += time
+        self.steps += 1
+        if self.steps % self.every == 0:
+            self.record()
+
+    def run(self, time: float, steps: int) -> None:
+        """Advance the system by a number of time steps, recording a frame every few of them."""
+        for _ in range(steps):
+            self.step(time)
+
+    def flush(self) -> None:
+        """Compress the buffered frames into a chunk and append it to the recording."""
+        if self.buffered == 0:
+            return
+        data = shuffle(self.buffer[: self.buffered])
+        with open(self.path / CHUNKS_FILE, "ab") as file:
+            offset = file.tell()
+            file.write(data)
+        with open(self.path / FRAMES_FILE, "ab") as file:
+            file.write(self.scalars[: self.buffered].tobytes())
+        # The index is written last, so a chunk only counts once it is entirely on disk.
+        with open(self.path / INDEX_FILE, "ab") as file:
+            file.write(
+                np.array(
+                    [self.frames, self.buffered, offset, len(data)], dtype=np.int64
+                ).tobytes()
+            )
+        self.frames += self.buffered
+        self.buffered = 0
+
+
+class TrajectoryReader:
+    """Reader of a recording, memory mapping its files and decompressing only the chunks that are asked for."""
+
+    path: Path
+    particles: int
+    every: int
+    charge: np.ndarray
+    mass: np.ndarray
+    index: np.ndarray
+    scalars: np.ndarray
+    chunks: mmap.mmap | None
+
+    def __init__(self, path: str | Path) -> None:
+        """Open a recording."""
+        self.path = Path(path)
+        description = json.loads((self.path / DESCRIPTION_FILE).read_text())
+        self.particles = description["particles"]
+        self.every = description["every"]
+        self.charge = np.array(description["charge"], dtype=float)
+        self.mass = np.array(description["mass"], dtype=float)
+        self.index = self.map(INDEX_FILE, np.int64, 4)
+        self.scalars = self.map(FRAMES_FILE, np.float64, 3)[: self.index[:, 1].sum()]
+        self.chunks = None
+        if (self.path / CHUNKS_FILE).stat().st_size > 0:
+            with open(self.path / CHUNKS_FILE, "rb") as file:
+                self.chunks = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def map(self, name: str, dtype: type, columns: int) -> np.ndarray:
+        """Memory map a file of raw records, leaving out a record only partly written."""
+        rows = (self.path / name).stat().st_size // (np.dtype(dtype).itemsize * columns)
+        if rows == 0:
+            return np.empty((0, columns), dtype=dtype)
+        return np.memmap(self.path / name, dtype=dtype, mode="r", shape=(rows, columns))
+
+    def __len__(self) -> int:
+        """Find the number of frames."""
+        return len(self.scalars)
+
+    @property
+    def times(self) -> np.ndarray:
+        """Find the time of every frame."""
+        return self.scalars[:, 0]
+
+    @property
+    def kinetic_energies(self) -> np.ndarray:
+        """Find the kinetic energy of every frame."""
+        return self.scalars[:, 1]
+
+    @property
+    def potential_energies(self) -> np.ndarray:
+        """Find the potential energy of every frame, not a number when it was not recorded."""
+        return self.scalars[:, 2]
+
+    def chunk(self, number: int) -> np.ndarray:
+        """Decompress a chunk into an array of frames, quantities and particles."""
+        _, frames, offset, length = (int(value) for value in self.index[number])
+        return unshuffle(
+            self.chunks[offset : offset + length],
+            (frames, len(QUANTITIES), self.particles),
+        )
+
+    def iterate(
+        self,
+        start: int = 0,
+        stop: int | None = None,
+        particles: np.ndarray | slice | None = None,
+    ) -> Iterator[tuple[int, np.ndarray]]:
+        """Go through a range of frames a chunk at a time, yielding the first frame and the states of the particles.
+
+        The states are arrays of frames, quantities and particles, with only the selected particles if given.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        if start >= stop:
+            return
+        first = self.index[:, 0]
+        for number in range(
+            np.searchsorted(first, start, side="right") - 1,
+            np.searchsorted(first, stop, side="left"),
+        ):
+            begin = int(first[number])
+            states = self.chunk(number)[
+                max(start - begin, 0) : stop - begin,
+                :,
+                slice(None) if particles is None else particles,
+            ]
+            yield max(start, begin), states
+
+    def frames(
+        self,
+        start: int = 0,
+        stop: int | None = None,
+        particles: np.ndarray | slice | None = None,
+    ) -> np.ndarray:
+        """Gather a range of frames into an array of frames, quantities and particles, with only the selected particles if given."""
+        parts = [states for _, states in self.iterate(start, stop, particles)]
+        if len(parts) == 0:
+            return np.empty((0, len(QUANTITIES), self.particles))[
+                :, :, slice(None) if particles is None else particles
+            ]
+        return np.concatenate(parts)
+
+    def between(
+        self,
+        start_time: float,
+        stop_time: float,
+        particles: np.ndarray | slice | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Gather the frames from a time up to before another, returning their times along with their states."""
+        start, stop = np.searchsorted(self.times, [start_time, stop_time])
+        return np.array(self.times[start:stop]), self.frames(start, stop, particles)
+
+    def close(self) -> None:
+        """Release the memory maps."""
+        if self.chunks is not None:
+            self.chunks.close()
+            self.chunks = None
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
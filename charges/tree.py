@@ -0,0 +1,236 @@
+"""Python module for approximating electric field and potential of many point charges with a quadtree (Barnes-Hut)."""
+
+from __future__ import annotations
+import numpy as np
+from kernels import point_field, point_potential
+from multipole import bound, m2p, p2m
+from store import ChargeStore
+
+
+class Node:
+    """Square cell of the quadtree holding a contiguous range of the sorted point charges."""
+
+    start: int
+    stop: int
+    center_x: float
+    center_y: float
+    radius: float
+    charge: float
+    moments: np.ndarray
+    children: list[Node]
+
+    def __init__(self, start: int, stop: int, center_x: float, center_y: float) -> None:
+        """Create a cell over the point charges in the specified range."""
+        self.start = start
+        self.stop = stop
+        self.center_x = center_x
+        self.center_y = center_y
+        self.radius = 0.0
+        self.charge = 0.0
+        self.moments = np.zeros((0, 0), dtype=complex)
+        self.children = []
+
+
+class QuadTree:
+    """Quadtree over point charges, with the multipole moments of every cell about its center."""
+
+    x: np.ndarray
+    y: np.ndarray
+    q: np.ndarray
+    order: int
+    leaf_size: int
+    root: Node
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        q: np.ndarray,
+        order: int = 1,
+        leaf_size: int = 32,
+    ) -> None:
+        """Build a quadtree over the point charges, splitting cells until they hold at most the leaf size."""
+        self.x = np.array(x, dtype=float)
+        self.y = np.array(y, dtype=float)
+        self.q = np.array(q, dtype=float)
+        self.order = order
+        self.leaf_size = leaf_size
+        if len(self.q) > 0:
+            minimum_x, maximum_x = self.x.min(), self.x.max()
+            minimum_y, maximum_y = self.y.min(), self.y.max()
+        else:
+            minimum_x = maximum_x = minimum_y = maximum_y = 0.0
+        size = max(maximum_x - minimum_x, maximum_y - minimum_y)
+        self.root = Node(
+            0, len(self.q), (minimum_x + maximum_x) / 2, (minimum_y + maximum_y) / 2
+        )
+        self.split(self.root, size / 2)
+
+    def split(self, node: Node, half: float) -> None:
+        """Sort the point charges of a cell into quadrants and recurse until the cells are small enough."""
+        x = self.x[node.start : node.stop]
+        y = self.y[node.start : node.stop]
+        q = self.q[node.start : node.stop]
+        dx = x - node.center_x
+        dy = y - node.center_y
+        node.radius = float(np.hypot(dx, dy).max()) if len(q) > 0 else 0.0
+        node.charge = float(np.abs(q).sum())
+        node.moments = p2m(dx, dy, q, self.order)
+        # Coincident charges cannot be separated, so cells stop splitting once they are a point.
+        if node.stop - node.start <= self.leaf_size or node.radius == 0:
+            return
+        quadrants = (dx >= 0).astype(int) + 2 * (dy >= 0).astype(int)
+        order = np.argsort(quadrants, kind="stable")
+        x[:] = x[order]
+        y[:] = y[order]
+        q[:] = q[order]
+        counts = np.bincount(quadrants, minlength=4)
+        start = node.start
+        for quadrant, count in enumerate(counts):
+            if count == 0:
+                continue
+            child = Node(
+                start,
+                start + count,
+                node.center_x + (half / 2 if quadrant & 1 else -half / 2),
+                node.center_y + (half / 2 if quadrant & 2 else -half / 2),
+            )
+            node.children.append(child)
+            self.split(child, half / 2)
+            start += count
+
+    def evaluate(
+        self, xs: np.ndarray, ys: np.ndarray, theta: float, field: bool
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Evaluate the potential or field at flat arrays of points, opening cells seen under an angle above theta."""
+        values = [np.zeros(len(xs)) for _ in range(3)]
+        errors = np.zeros(len(xs))
+        self.visit(self.root, np.arange(len(xs)), xs, ys, theta, field, values, errors)
+        return *values, errors
+
+    def visit(
+        self,
+        node: Node,
+        targets: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        theta: float,
+        field: bool,
+        values: list[np.ndarray],
+        errors: np.ndarray,
+    ) -> None:
+        """Accumulate the contribution of a cell, either from its moments or from its children."""
+        if len(targets) == 0 or node.stop == node.start:
+            return
+        dx = xs[targets] - node.center_x
+        dy = ys[targets] - node.center_y
+        distance = np.hypot(dx, dy)
+        accept = node.radius < theta * distance
+        if np.any(accept):
+            accepted = targets[accept]
+            potential, field_x, field_y = m2p(
+                node.moments, dx[accept], dy[accept], self.order
+            )
+            potential_error, field_error = bound(
+                node.charge,
+                distance[accept],
+                node.radius / distance[accept],
+                self.order,
+            )
+            if field:
+                values[1][accepted] += field_x
+                values[2][accepted] += field_y
+                errors[accepted] += field_error
+            else:
+                values[0][accepted] += potential
+                errors[accepted] += potential_error
+        targets = targets[~accept]
+        if len(targets) == 0:
+            return
+        if not node.children:
+            sources = (
+                self.x[node.start : node.stop],
+                self.y[node.start : node.stop],
+                self.q[node.start : node.stop],
+            )
+            if field:
+                field_x, field_y = point_field(xs[targets], ys[targets], *sources)
+                values[1][targets] += field_x
+                values[2][targets] += field_y
+            else:
+                values[0][targets] += point_potential(xs[targets], ys[targets], *sources)
+            return
+        for child in node.children:
+            self.visit(child, targets, xs, ys, theta, field, values, errors)
+
+
+class TreeEngine:
+    """Barnes-Hut engine evaluating the point charges of a system through a quadtree of multipole expansions."""
+
+    theta: float
+    order: int
+    leaf_size: int
+    errors: np.ndarray
+    tree: QuadTree | None
+    store: ChargeStore | None
+
+    def __init__(self, theta: float = 0.5, order: int = 1, leaf_size: int = 32) -> None:
+        """Create a tree engine with the specified opening angle and expansion order (1 is monopole and dipole)."""
+        self.theta = theta
+        self.order = order
+        self.leaf_size = leaf_size
+        self.errors = np.zeros(0)
+        self.tree = None
+        self.store = None
+
+    @property
+    def error_bound(self) -> float:
+        """Find the largest bound on the absolute truncation error of the last evaluation."""
+        return float(self.errors.max()) if self.errors.size > 0 else 0.0
+
+    def build(self, store: ChargeStore) -> QuadTree:
+        """Build the quadtree of the store, reusing it while the store stays the same."""
+        if self.tree is None or self.store is not store:
+            self.tree = QuadTree(
+                store.x, store.y, store.q, order=self.order, leaf_size=self.leaf_size
+            )
+            self.store = store
+        return self.tree
+
+    def field_grid(
+        self, store: ChargeStore, xs: np.ndarray, ys: np.ndarray, /
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Approximate the electric field components of the store at arrays of points."""
+        xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+        _, field_x, field_y, errors = self.build(store).evaluate(
+            xs.ravel(), ys.ravel(), self.theta, field=True
+        )
+        self.errors = errors.reshape(xs.shape)
+        line_field_x, line_field_y = store.segment_field_grid(xs, ys)
+        return (
+            field_x.reshape(xs.shape) + line_field_x,
+            field_y.reshape(xs.shape) + line_field_y,
+        )
+
+    def potential_grid(
+        self, store: ChargeStore, xs: np.ndarray, ys: np.ndarray, /
+    ) -> np.ndarray:
+        """Approximate the electric potential of the store at arrays of points."""
+        xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+        potential, _, _, errors = self.build(store).evaluate(
+            xs.ravel(), ys.ravel(), self.theta, field=False
+        )
+        self.errors = errors.reshape(xs.shape)
+        return potential.reshape(xs.shape) + store.segment_potential_grid(xs, ys)
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
@@ -0,0 +1,302 @@
+"""Python module for exploring systems of charges interactively, refining the picture progressively in the background."""
+
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.colors as colors
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.lines import Line2D
+from charges import System, Charge, RetainedGrid
+from points import Point
+from quantiles import levels
+
+PREVIEW_SIZES: tuple[int, ...] = (32, 64, 128, 256, 512)
+"""Resolutions the potential is shown at, the first computed right away and the others in the background."""
+POLL_INTERVAL: int = 50
+"""Milliseconds between checks for finished background work and changes of the view."""
+CHUNK_POINTS: int = 1 << 14
+"""Number of points the background work evaluates at a time, between which the window may take over."""
+PICK_RADIUS: float = 0.03
+"""Distance within which a click grabs a charge, as a fraction of the width of the view."""
+
+
+def centers(system: System) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Find the mean position of the sources of every charge, along with its total charge."""
+    store = system.store
+    counts = np.bincount(store.group, minlength=store.groups) + np.bincount(
+        store.line_group, minlength=store.groups
+    )
+    x, y, q = (
+        store.reduce(values, line_values)
+        for values, line_values in (
+            (store.x, (store.x1 + store.x2) / 2),
+            (store.y, (store.y1 + store.y2) / 2),
+            (store.q, store.line_q),
+        )
+    )
+    return x / np.maximum(counts, 1), y / np.maximum(counts, 1), q
+
+
+class Viewer:
+    """Interactive matplotlib window over a system of charges.
+
+    A coarse potential map and the field directions are computed before the window opens, then finer maps are
+    computed on a worker thread and swapped in as they finish. Panning or zooming starts over from the coarse map
+    of the visible region, and dragging a charge moves it with incremental updates of the maps on screen. The
+    worker evaluates in chunks under a lock shared with the window, so it never evaluates the system at the same
+    time as a drag and gives up on maps that went stale.
+    """
+
+    system: System
+    sizes: tuple[int, ...]
+    field_size: int
+    workers: int
+    figure: plt.Figure
+    axes: plt.Axes
+    image: object
+    arrows: object
+    markers: Line2D
+    executor: ThreadPoolExecutor
+    lock: Lock
+    future: Future | None
+    generation: int
+    level: int
+    grid: RetainedGrid | None
+    field: RetainedGrid | None
+    norm: colors.TwoSlopeNorm
+    stale: bool
+    dragging: Charge | None
+    anchor: Point
+
+    def __init__(
+        self,
+        system: System,
+        minimum: Point,
+        maximum: Point,
+        title: str,
+        sizes: tuple[int, ...] = PREVIEW_SIZES,
+        field_size: int = 20,
+        workers: int = 1,
+    ) -> None:
+        """Create the window and draw the coarse preview of the system over the viewport."""
+        self.system = system
+        self.sizes = sizes
+        self.field_size = field_size
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.lock = Lock()
+        self.future = None
+        self.generation = 0
+        self.level = 0
+        self.grid = None
+        self.field = None
+        self.norm = colors.TwoSlopeNorm(vcenter=0, vmin=-1, vmax=1)
+        self.stale = False
+        self.dragging = None
+        self.anchor = Point(0, 0)
+        self.figure, self.axes = plt.subplots()
+        self.image = self.axes.imshow(
+            np.zeros((2, 2)),
+            origin="lower",
+            extent=(minimum.x, maximum.x, minimum.y, maximum.y),
+            cmap="seismic",
+            norm=self.norm,
+            interpolation="bilinear",
+            aspect="equal",
+        )
+        self.arrows = None
+        (self.markers,) = self.axes.plot(
+            *centers(system)[:2], "o", color="yellow", markeredgecolor="black"
+        )
+        self.axes.set_xlim(minimum.x, maximum.x)
+        self.axes.set_ylim(minimum.y, maximum.y)
+        self.axes.set_title(title)
+        self.axes.set_xlabel("Horizontal displacement (meters)")
+        self.axes.set_ylabel("Vertical displacement (meters)")
+        colorbar = self.figure.colorbar(self.image)
+        colorbar.set_label("Joules per coulomb (Volts)")
+        self.start()
+        self.axes.callbacks.connect("xlim_changed", self.moved)
+        self.axes.callbacks.connect("ylim_changed", self.moved)
+        self.figure.canvas.mpl_connect("button_press_event", self.press)
+        self.figure.canvas.mpl_connect("motion_notify_event", self.drag)
+        self.figure.canvas.mpl_connect("button_release_event", self.release)
+        self.figure.canvas.mpl_connect("close_event", self.close)
+        self.timer = self.figure.canvas.new_timer(interval=POLL_INTERVAL)
+        self.timer.add_callback(self.poll)
+        self.timer.start()
+
+    def show(self) -> None:
+        """Display the window until it is closed."""
+        plt.show()
+
+    def viewport(self, size: int) -> tuple[np.ndarray, np.ndarray]:
+        """Create a grid of the specified size over the visible region."""
+        minimum_x, maximum_x = self.axes.get_xlim()
+        minimum_y, maximum_y = self.axes.get_ylim()
+        return np.meshgrid(
+            np.linspace(minimum_x, maximum_x, size),
+            np.linspace(minimum_y, maximum_y, size),
+        )
+
+    def start(self) -> None:
+        """Compute the coarse preview of the visible region right away and queue the finer ones."""
+        with self.lock:
+            self.generation += 1
+            self.level = 0
+            for grid in (self.grid, self.field):
+                if grid is not None:
+                    self.system.release(grid)
+            self.grid = self.system.retain(
+                *self.viewport(self.sizes[0]), workers=self.workers, field=False
+            )
+            self.field = self.system.retain(
+                *self.viewport(self.field_size), workers=self.workers
+            )
+        low, high = levels(self.grid.potential, [0.01, 0.99])
+        self.norm.vmin = min(low, -abs(high) * 1e-6, -1e-300)
+        self.norm.vmax = max(high, abs(low) * 1e-6, 1e-300)
+        if self.arrows is not None:
+            self.arrows.remove()
+        self.arrows = self.axes.quiver(
+            self.field.xs, self.field.ys, *self.directions()
+        )
+        self.draw()
+        self.refine()
+
+    def directions(self) -> tuple[np.ndarray, np.ndarray]:
+        """Normalize the field of the retained arrows grid to unit vectors."""
+        length = np.hypot(self.field.field_x, self.field.field_y)
+        length[length == 0] = np.inf
+        return self.field.field_x / length, self.field.field_y / length
+
+    def draw(self) -> None:
+        """Show the current potential map, arrows and charges."""
+        xs = self.grid.xs
+        ys = self.grid.ys
+        self.image.set_data(self.grid.potential)
+        self.image.set_extent((xs[0, 0], xs[0, -1], ys[0, 0], ys[-1, 0]))
+        self.arrows.set_UVC(*self.directions())
+        self.markers.set_data(*centers(self.system)[:2])
+        self.figure.canvas.draw_idle()
+
+    def refine(self) -> None:
+        """Queue the computation of the next finer map of the visible region, if any."""
+        if self.level + 1 >= len(self.sizes):
+            self.future = None
+            return
+        xs, ys = self.viewport(self.sizes[self.level + 1])
+        self.future = self.executor.submit(self.compute, self.generation, xs, ys)
+
+    def compute(
+        self, generation: int, xs: np.ndarray, ys: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+        """Calculate the potential over a grid chunk by chunk, giving up once the map has gone stale."""
+        potential = np.empty(xs.shape)
+        rows = max(1, CHUNK_POINTS // xs.shape[1])
+        for start in range(0, xs.shape[0], rows):
+            with self.lock:
+                if generation != self.generation:
+                    return None
+                potential[start : start + rows] = self.system.potential_grid(
+                    xs[start : start + rows],
+                    ys[start : start + rows],
+                    workers=self.workers,
+                )
+        return xs, ys, potential
+
+    def poll(self) -> None:
+        """Swap in finished finer maps and start over when the view has changed."""
+        if self.dragging is not None:
+            return
+        if self.stale:
+            self.stale = False
+            self.start()
+            return
+        if self.future is None or not self.future.done():
+            return
+        result = self.future.result()
+        # Maps abandoned because the charges moved or the view changed are queued again.
+        if result is None:
+            self.refine()
+            return
+        xs, ys, potential = result
+        self.system.release(self.grid)
+        self.grid = RetainedGrid(xs, ys, potential)
+        self.system.retained.append(self.grid)
+        self.level += 1
+        self.draw()
+        self.refine()
+
+    def moved(self, axes: plt.Axes) -> None:
+        """Remember that the visible region changed, to recompute it at the next poll."""
+        self.stale = True
+
+    def press(self, event: MouseEvent) -> None:
+        """Grab the charge closest to a left click, if close enough."""
+        toolbar = self.figure.canvas.toolbar
+        if (
+            event.button != 1
+            or event.inaxes is not self.axes
+            or (toolbar is not None and toolbar.mode)
+            or len(self.system.charges) == 0
+        ):
+            return
+        x, y, _ = centers(self.system)
+        distances = np.hypot(x - event.xdata, y - event.ydata)
+        nearest = int(np.argmin(distances))
+        minimum_x, maximum_x = self.axes.get_xlim()
+        if distances[nearest] > PICK_RADIUS * abs(maximum_x - minimum_x):
+            return
+        with self.lock:
+            self.dragging = self.system.charges[nearest]
+            self.anchor = Point(event.xdata, event.ydata)
+            self.generation += 1
+
+    def drag(self, event: MouseEvent) -> None:
+        """Move the grabbed charge with the mouse, updating the maps by its change alone."""
+        if self.dragging is None or event.inaxes is not self.axes:
+            return
+        position = Point(event.xdata, event.ydata)
+        with self.lock:
+            try:
+                self.dragging.move(position - self.anchor)
+            except NotImplementedError:
+                self.dragging = None
+                return
+            self.anchor = position
+            self.system.update(self.dragging)
+        self.draw()
+
+    def release(self, event: MouseEvent) -> None:
+        """Let go of the grabbed charge and resume refining from the current map."""
+        if self.dragging is None:
+            return
+        with self.lock:
+            self.dragging = None
+            self.generation += 1
+        self.refine()
+
+    def close(self, event: object) -> None:
+        """Stop the background work and the retained grids when the window closes."""
+        self.timer.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for grid in (self.grid, self.field):
+            if grid is not None and grid in self.system.retained:
+                self.system.release(grid)
+        self.grid = None
+        self.field = None
+
+
+try:
+    if __name__ == "__main__":
+        from time import sleep
+
+        print(
+            "This python file is just a library, feel free to try out the other programs."
+        )
+        sleep(5)
+except KeyboardInterrupt:
+    exit()
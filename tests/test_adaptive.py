@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from adaptive import AdaptiveSampler
+from charges import System, PointCharge, FiniteLineCharge, PROTON_CHARGE, ELECTRON_CHARGE
+from points import Point
+from quantiles import levels
+
+
+def dipole():
+    return System(
+        [
+            PointCharge(PROTON_CHARGE, Point(3.03, 4.97)),
+            PointCharge(ELECTRON_CHARGE, Point(6.97, 5.03)),
+        ]
+    )
+
+
+def dense(system, size):
+    xs = np.linspace(0, 10, size)
+    return system.potential_grid(*np.meshgrid(xs, xs))
+
+
+@pytest.mark.parametrize("tolerance", [0.01, 0.001])
+def test_adaptive_sampling_agrees_with_dense_sampling(tolerance):
+    system = dipole()
+    sampler = AdaptiveSampler(tolerance, size=100)
+    values = sampler.sample(system, Point(0, 0), Point(10, 10))
+    exact = dense(system, values.shape[0])
+    step = 2**sampler.depth
+    low, high = levels(exact[::step, ::step], [0.02, 0.98])
+    assert values.shape == (129, 129)
+    assert np.abs(values - exact).max() <= 2 * tolerance * (high - low)
+    assert sampler.evaluations < values.size
+
+
+def test_evaluated_points_are_exact():
+    system = System(
+        [
+            FiniteLineCharge(1e-19, Point(2, 2), Point(8, 2), 20, analytic=True),
+            PointCharge(ELECTRON_CHARGE, Point(5.01, 6.99)),
+        ]
+    )
+    sampler = AdaptiveSampler(0.01, size=64, coarse=4)
+    values = sampler.sample(system, Point(0, 0), Point(10, 10))
+    exact = dense(system, values.shape[0])
+    step = 2**sampler.depth
+    np.testing.assert_allclose(values[::step, ::step], exact[::step, ::step], rtol=1e-12)
+    assert np.isclose(values, exact, rtol=1e-12).sum() >= sampler.evaluations
+
+
+def test_tighter_tolerances_evaluate_more_points():
+    system = dipole()
+    evaluations = []
+    for tolerance in (0.1, 0.01, 0.001):
+        sampler = AdaptiveSampler(tolerance, size=100)
+        sampler.sample(system, Point(0, 0), Point(10, 10))
+        evaluations.append(sampler.evaluations)
+    assert evaluations == sorted(evaluations)
+    assert evaluations[0] < evaluations[-1]
@@ -0,0 +1,38 @@
+import subprocess
+import sys
+from pathlib import Path
+
+CHARGES = Path(__file__).resolve().parent.parent / "charges"
+
+SCRIPT = """
+import sys
+sys.path.insert(0, {charges!r})
+import numpy as np
+from charges import System, PointCharge, Point
+from batch import run_batch
+
+if __name__ == "__main__":
+    System([PointCharge(1e-9, Point(5, 5))]).potential_grid(np.zeros((4, 4)), np.ones((4, 4)))
+    job = {{
+        "name": "dipole",
+        "potential_size": 10,
+        "field_size": 5,
+        "charges": [
+            {{"type": "point", "position": [2, 5], "charge": "proton"}},
+            {{"type": "point", "position": [8, 5], "charge": "electron"}},
+        ],
+    }}
+    print(run_batch([job], {output!r}, workers=2, cache=False))
+"""
+
+
+def test_batch_exits_after_an_evaluation_in_the_parent(tmp_path):
+    script = tmp_path / "batch_after_evaluation.py"
+    script.write_text(SCRIPT.format(charges=str(CHARGES), output=str(tmp_path / "renders")))
+    result = subprocess.run(
+        [sys.executable, str(script)], capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("0")
+    assert (tmp_path / "renders" / "dipole.png").exists()
+    assert (tmp_path / "renders" / "dipole.npy").exists()
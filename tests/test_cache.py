@@ -0,0 +1,65 @@
+import numpy as np
+from cache import GridCache
+from charges import System, PointCharge
+from points import Point
+
+MINIMUM = Point(0, 0)
+MAXIMUM = Point(10, 10)
+
+
+def dipole():
+    return System([PointCharge(1e-9, Point(2, 5)), PointCharge(-1e-9, Point(8, 5))])
+
+
+def test_repeated_evaluation_is_a_hit():
+    cache = GridCache()
+    system = dipole()
+    first = cache.potential_grid(system, MINIMUM, MAXIMUM, 20, 10)
+    first[0, 0] = np.nan
+    second = cache.potential_grid(system, MINIMUM, MAXIMUM, 20, 10)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second.shape == (10, 20)
+    assert not np.isnan(second[0, 0])
+
+
+def test_memory_is_evicted_to_its_size_limit():
+    # Every potential grid takes 20 by 20 floats, 3200 bytes, so two of them fit.
+    cache = GridCache(memory_limit=2 * 3200)
+    system = dipole()
+    for shift in (0, 1, 2):
+        cache.potential_grid(system, Point(shift, 0), MAXIMUM, 20, 20)
+    assert cache.memory_bytes == 2 * 3200
+    assert len(cache.memory) == 2
+    cache.potential_grid(system, Point(2, 0), MAXIMUM, 20, 20)
+    assert cache.hits == 1
+    cache.potential_grid(system, Point(0, 0), MAXIMUM, 20, 20)
+    assert cache.misses == 4
+
+
+def test_grids_larger_than_the_limit_are_not_kept():
+    cache = GridCache(memory_limit=100)
+    cache.potential_grid(dipole(), MINIMUM, MAXIMUM, 20, 20)
+    assert len(cache.memory) == 0
+    assert cache.memory_bytes == 0
+
+
+def test_changing_the_system_changes_the_key():
+    cache = GridCache()
+    charge = PointCharge(1e-9, Point(2, 5))
+    system = System([charge, PointCharge(-1e-9, Point(8, 5))])
+    before = cache.potential_grid(system, MINIMUM, MAXIMUM, 20, 20)
+    charge.point = Point(3, 5)
+    system.update(charge)
+    after = cache.potential_grid(system, MINIMUM, MAXIMUM, 20, 20)
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert not np.allclose(before, after)
+
+
+def test_disk_entries_are_found_by_another_cache(tmp_path):
+    system = dipole()
+    expected = GridCache(directory=tmp_path).field_grid(system, MINIMUM, MAXIMUM, 8, 8)
+    cache = GridCache(directory=tmp_path)
+    found = cache.field_grid(system, MINIMUM, MAXIMUM, 8, 8)
+    assert cache.hits == 1
+    for expected_part, found_part in zip(expected, found):
+        np.testing.assert_array_equal(expected_part, found_part)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from charges import System, PointCharge, PROTON_CHARGE
+from contours import Crossings, contours, segments
+from kernels import ELECTROSTATIC_CONSTANT
+from points import Point
+
+
+def cell(bottom_left, bottom_right, top_right, top_left):
+    return np.array([[bottom_left, bottom_right], [top_left, top_right]], dtype=float)
+
+
+def joined(values, level):
+    crossings = Crossings(np.empty(0), np.empty(0), values, level)
+    names = {int(crossings.edge(name, np.array([0]), np.array([0]))[0]): name for name in ("bottom", "top", "left", "right")}
+    return {frozenset((names[int(a)], names[int(b)])) for a, b in zip(*segments(values, level))}
+
+
+@pytest.mark.parametrize("case", range(16))
+def test_every_case_joins_the_edges_it_crosses(case):
+    corners = [(case >> bit) & 1 for bit in range(4)]
+    values = cell(*corners)
+    pairs = joined(values, 0.5)
+    crossed = {
+        name
+        for name, (a, b) in {"bottom": (0, 1), "right": (1, 2), "top": (2, 3), "left": (3, 0)}.items()
+        if corners[a] != corners[b]
+    }
+    assert set().union(*pairs) == crossed
+    assert len(pairs) == {0: 0, 2: 1, 4: 2}[len(crossed)]
+
+
+def test_saddles_follow_the_center():
+    # Corners above the level on one diagonal, the center deciding whether they are connected.
+    assert joined(cell(1, 0, 1, 0), 0.4) == {frozenset(("bottom", "right")), frozenset(("top", "left"))}
+    assert joined(cell(1, 0, 1, 0), 0.6) == {frozenset(("left", "bottom")), frozenset(("right", "top"))}
+    assert joined(cell(0, 1, 0, 1), 0.4) == {frozenset(("left", "bottom")), frozenset(("right", "top"))}
+    assert joined(cell(0, 1, 0, 1), 0.6) == {frozenset(("bottom", "right")), frozenset(("top", "left"))}
+
+
+@pytest.mark.parametrize("iterations, tolerance", [(0, 1e-2), (8, 1e-9)])
+def test_point_charge_gives_circles(iterations, tolerance):
+    system = System([PointCharge(PROTON_CHARGE, Point(5, 5))])
+    radii = [1.0, 2.0, 3.5]
+    levels = [ELECTROSTATIC_CONSTANT * PROTON_CHARGE / radius for radius in radii]
+    # The charge is kept off the grid points, where its potential is left out.
+    found = contours(system, Point(0, 0), Point(10, 10), levels, size=60, iterations=iterations)
+    for radius, level in zip(radii, levels):
+        (line,) = found[level]
+        np.testing.assert_allclose(line[0], line[-1])
+        distances = np.hypot(line[:, 0] - 5, line[:, 1] - 5)
+        assert np.abs(distances - radius).max() < tolerance * radius
+        # A closed line around the charge turns once all the way round.
+        angles = np.unwrap(np.arctan2(line[:, 1] - 5, line[:, 0] - 5))
+        assert abs(angles[-1] - angles[0]) == pytest.approx(2 * np.pi)
+
+
+def test_refinement_converges():
+    system = System([PointCharge(PROTON_CHARGE, Point(0, 0))])
+    xs = np.array([1.0, 3.0])
+    ys = np.array([0.0, 1.0])
+    values = system.potential_grid(*np.meshgrid(xs, ys))
+    level = ELECTROSTATIC_CONSTANT * PROTON_CHARGE / 1.5
+    crossings = Crossings(xs, ys, values, level)
+    edge = crossings.edge("bottom", np.array([0]), np.array([0]))
+    errors = [abs(crossings.refine(system, edge, iterations)[0][0] - 1.5) for iterations in range(1, 9)]
+    # The closest point so far is kept, so more iterations never do worse.
+    assert all(later <= earlier for earlier, later in zip(errors, errors[1:]))
+    assert errors[-1] < 1e-12
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from charges import System, PointCharge, FiniteLineCharge, PROTON_CHARGE, ELECTRON_CHARGE
+from field_lines import FieldLineTracer, clearance, seeds
+from points import Point
+from store import ChargeStore
+
+MINIMUM = Point(0, 0)
+MAXIMUM = Point(10, 10)
+
+
+def systems():
+    return [
+        System([PointCharge(PROTON_CHARGE, Point(4, 5)), PointCharge(ELECTRON_CHARGE, Point(6, 5))]),
+        System(
+            [
+                FiniteLineCharge(2 * ELECTRON_CHARGE, Point(3, 3), Point(7, 3), 20, analytic=True),
+                PointCharge(2 * PROTON_CHARGE, Point(5, 6)),
+            ]
+        ),
+    ]
+
+
+def closest_charge(system, point):
+    distances = [
+        clearance(ChargeStore([charge.arrays()], [charge.segments()]), point[:1], point[1:])[0]
+        for charge in system.charges
+    ]
+    index = int(np.argmin(distances))
+    return np.sign(system.charges[index].charge), distances[index]
+
+
+@pytest.mark.parametrize("system", systems())
+def test_field_lines_start_and_end_on_charges_of_opposite_sign(system):
+    tracer = FieldLineTracer()
+    lines = tracer.trace(system, MINIMUM, MAXIMUM, 20)
+    radius = tracer.radius * 10
+    ending = 0
+    for line in lines:
+        start_sign, start_distance = closest_charge(system, line[0])
+        assert start_distance <= radius * (1 + 1e-9)
+        inside = MINIMUM.x <= line[-1, 0] <= MAXIMUM.x and MINIMUM.y <= line[-1, 1] <= MAXIMUM.y
+        if not inside:
+            continue
+        end_sign, end_distance = closest_charge(system, line[-1])
+        assert end_distance < radius
+        assert end_sign == -start_sign
+        ending += 1
+    assert ending >= len(lines) // 2
+
+
+def test_seeds_follow_the_charges():
+    system = System(
+        [
+            PointCharge(3 * PROTON_CHARGE, Point(2, 2)),
+            PointCharge(ELECTRON_CHARGE, Point(8, 8)),
+            PointCharge(0.0, Point(5, 5)),
+        ]
+    )
+    x, y, direction = seeds(system.store, 20, 0.1)
+    around = np.hypot(x - 2, y - 2) < 0.2
+    np.testing.assert_allclose(np.hypot(x[around] - 2, y[around] - 2), 0.1)
+    assert around.sum() == 15
+    assert np.all(direction[around] == 1)
+    assert np.all(direction[~around] == -1)
+    assert len(x) == 20
+
+
+def test_no_lines_without_charge():
+    assert FieldLineTracer().trace(System([PointCharge(0.0, Point(5, 5))]), MINIMUM, MAXIMUM) == []
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from fmm import FMMEngine
+from store import ChargeStore
+
+
+@pytest.fixture(scope="module")
+def scene():
+    generator = np.random.default_rng(1)
+    # Uniform charges with a tight cluster, which leaves most of the finest boxes empty.
+    x = np.concatenate([generator.uniform(0, 10, 2000), generator.normal(2, 0.05, 500)])
+    y = np.concatenate([generator.uniform(0, 10, 2000), generator.normal(8, 0.05, 500)])
+    q = generator.uniform(-1e-9, 1e-9, x.size)
+    # Coincident charges, one of them also a target.
+    x[:20], y[:20] = 5, 5
+    xs, ys = np.meshgrid(np.linspace(0, 10, 30), np.linspace(0, 10, 30))
+    xs = np.append(xs.ravel(), [5, x[100]])
+    ys = np.append(ys.ravel(), [5, y[100]])
+    return ChargeStore([(x, y, q)]), xs, ys
+
+
+def relative_errors(engine, store, xs, ys):
+    potential = engine.potential_grid(store, xs, ys)
+    exact_potential = store.potential_grid(xs, ys)
+    field = np.array(engine.field_grid(store, xs, ys))
+    exact_field = np.array(store.field_grid(xs, ys))
+    assert np.isfinite(potential).all() and np.isfinite(field).all()
+    return (
+        np.abs(potential - exact_potential).max() / np.abs(exact_potential).max(),
+        np.hypot(*(field - exact_field)).max() / np.hypot(*exact_field).max(),
+    )
+
+
+@pytest.mark.parametrize("tolerance", [1e-3, 1e-6])
+def test_tolerance_is_met(scene, tolerance):
+    assert max(relative_errors(FMMEngine(tolerance), *scene)) < tolerance
+
+
+@pytest.mark.parametrize("order, leaf_size", [(4, 32), (10, 32), (10, 4)])
+def test_error_shrinks_with_order(scene, order, leaf_size):
+    potential_error, field_error = relative_errors(FMMEngine(order=order, leaf_size=leaf_size), *scene)
+    assert potential_error < 10 * 0.35**order
+    assert field_error < 10 * 0.35**order
+
+
+def test_validate_reports_small_errors(scene):
+    potential_error, field_error = FMMEngine(1e-6).validate(*scene)
+    assert potential_error < 1e-6
+    assert field_error < 1e-6
+
+
+def test_empty_store_and_targets():
+    engine = FMMEngine()
+    xs = np.array([1.0, 2.0])
+    assert engine.potential_grid(ChargeStore([]), xs, xs).tolist() == [0, 0]
+    store = ChargeStore([(xs, xs, np.array([1e-9, -1e-9]))])
+    assert engine.potential_grid(store, np.empty(0), np.empty(0)).shape == (0,)
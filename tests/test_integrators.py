@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from integrators import Adaptive, RungeKutta4, SemiImplicitEuler, VelocityVerlet
+from kernels import ELECTROSTATIC_CONSTANT
+from particles import Particle, System
+from points import Point
+
+CHARGE = 1e-5
+MASSES = (1.0, 3.0)
+SEPARATION = 1.0
+TOTAL = sum(MASSES)
+# Relative speed of a circular orbit, where the attraction provides the centripetal force of the reduced mass.
+SPEED = np.sqrt(ELECTROSTATIC_CONSTANT * CHARGE**2 * TOTAL / (MASSES[0] * MASSES[1] * SEPARATION))
+PERIOD = 2 * np.pi * SEPARATION / SPEED
+
+
+def orbit(integrator):
+    """Create two opposite charges on a circular orbit about their center of mass at the origin."""
+    first, second = MASSES
+    return System(
+        [
+            Particle(CHARGE, first, Point(-second / TOTAL, 0) * SEPARATION, Point(0, -second / TOTAL * SPEED)),
+            Particle(-CHARGE, second, Point(first / TOTAL, 0) * SEPARATION, Point(0, first / TOTAL * SPEED)),
+        ],
+        integrator=integrator,
+    )
+
+
+def error(integrator, steps, time=PERIOD / 4):
+    system = orbit(integrator)
+    for _ in range(steps):
+        system.iterate(time / steps)
+    angle = 2 * np.pi * time / PERIOD
+    radius = MASSES[0] / TOTAL * SEPARATION
+    return np.hypot(system.x[1] - radius * np.cos(angle), system.y[1] - radius * np.sin(angle))
+
+
+@pytest.mark.parametrize(
+    "integrator, order, steps",
+    [(SemiImplicitEuler, 1, 200), (VelocityVerlet, 2, 200), (RungeKutta4, 4, 25)],
+)
+def test_order_of_accuracy(integrator, order, steps):
+    coarse = error(integrator(), steps)
+    fine = error(integrator(), 2 * steps)
+    assert np.log2(coarse / fine) == pytest.approx(order, abs=0.2)
+
+
+@pytest.mark.parametrize(
+    "integrator, tolerance",
+    [
+        (SemiImplicitEuler(), 1e-4),
+        (VelocityVerlet(), 1e-9),
+        (RungeKutta4(), 1e-6),
+        (Adaptive(1e-8), 1e-7),
+        (Adaptive(1e-6, block=True), 1e-7),
+    ],
+)
+def test_energy_and_momentum_are_conserved(integrator, tolerance):
+    system = orbit(integrator)
+    energy = system.energy()
+    for _ in range(100):
+        system.iterate(PERIOD / 100)
+    assert abs(system.energy() - energy) <= tolerance * abs(energy)
+    momentum = system.momentum()
+    assert abs(momentum.x) < 1e-12 and abs(momentum.y) < 1e-12
+
+
+@pytest.mark.parametrize("block", [False, True])
+def test_adaptive_follows_the_orbit(block):
+    assert error(Adaptive(1e-6, block=block), 10) < 1e-5
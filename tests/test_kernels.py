@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+import kernels
+
+pytest.importorskip("numba")
+
+
+@pytest.fixture
+def backend():
+    previous = kernels.BACKEND
+    yield kernels.set_backend
+    kernels.set_backend(previous)
+
+
+def evaluate(backend, name, function, *arrays):
+    backend(name)
+    return function(*arrays)
+
+
+@pytest.fixture
+def sources():
+    generator = np.random.default_rng(0)
+    px, py = generator.uniform(0, 10, (2, 200))
+    pq = generator.uniform(-1e-9, 1e-9, 200)
+    xs, ys = np.meshgrid(np.linspace(0, 10, 17), np.linspace(0, 10, 13))
+    # A target on top of a source, which both backends leave out.
+    xs[0, 0], ys[0, 0] = px[0], py[0]
+    return xs, ys, px, py, pq
+
+
+def test_compiled_potential_matches_numpy(backend, sources):
+    compiled = evaluate(backend, "numba", kernels.point_potential, *sources)
+    reference = evaluate(backend, "numpy", kernels.point_potential, *sources)
+    assert compiled.shape == reference.shape
+    np.testing.assert_allclose(compiled, reference, rtol=1e-12, atol=1e-12)
+
+
+def test_compiled_field_matches_numpy(backend, sources):
+    compiled = evaluate(backend, "numba", kernels.point_field, *sources)
+    reference = evaluate(backend, "numpy", kernels.point_field, *sources)
+    for compiled_part, reference_part in zip(compiled, reference):
+        np.testing.assert_allclose(compiled_part, reference_part, rtol=1e-12, atol=1e-12)
+
+
+def test_compiled_pair_forces_match_numpy(backend, sources):
+    _, _, px, py, pq = sources
+    compiled = evaluate(backend, "numba", kernels.pair_forces, px, py, pq)
+    reference = evaluate(backend, "numpy", kernels.pair_forces, px, py, pq)
+    for compiled_part, reference_part in zip(compiled, reference):
+        np.testing.assert_allclose(compiled_part, reference_part, rtol=1e-10, atol=1e-30)
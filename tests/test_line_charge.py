@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from charges import FiniteLineCharge, ChargeArray
+from points import Point
+
+SEGMENTS = [
+    (Point(2, 5), Point(6, 5)),
+    (Point(1, 1), Point(4, 5)),
+    (Point(3, 7), Point(3, 2)),
+]
+
+
+def discretized(charge, start, end, count=200_000):
+    # Midpoints of equal pieces, so the discretization error falls with the square of the piece size.
+    fractions = (np.arange(count) + 0.5) / count
+    return ChargeArray(
+        start.x + fractions * (end.x - start.x),
+        start.y + fractions * (end.y - start.y),
+        np.full(count, charge / count),
+    )
+
+
+def targets(start, end):
+    # Coordinates along and across the segment in units of its length: on its extension, next to its ends, around it.
+    along = np.array([-1.0, -0.01, -0.001, 1.001, 1.01, 2.0, 0.0, 1.0, 0.0, 1.0, -0.002, 1.002, 0.5, 0.3, 0.5, 1.5])
+    across = np.array([0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.003, -0.003, -0.05, 0.05, 0.002, -0.002, 0.01, -0.4, 2.0, 1.0])
+    dx, dy = end.x - start.x, end.y - start.y
+    return start.x + along * dx - across * dy, start.y + along * dy + across * dx
+
+
+@pytest.mark.parametrize("start, end", SEGMENTS)
+def test_analytic_potential_matches_a_fine_discretization(start, end):
+    analytic = FiniteLineCharge(1e-9, start, end, 2, analytic=True)
+    xs, ys = targets(start, end)
+    np.testing.assert_allclose(
+        analytic.potential_grid(xs, ys), discretized(1e-9, start, end).potential_grid(xs, ys), rtol=1e-6
+    )
+
+
+@pytest.mark.parametrize("start, end", SEGMENTS)
+def test_analytic_field_matches_a_fine_discretization(start, end):
+    analytic = FiniteLineCharge(-2e-9, start, end, 2, analytic=True)
+    xs, ys = targets(start, end)
+    exact_x, exact_y = analytic.field_grid(xs, ys)
+    expected_x, expected_y = discretized(-2e-9, start, end).field_grid(xs, ys)
+    scale = np.hypot(expected_x, expected_y)
+    assert np.all(np.hypot(exact_x - expected_x, exact_y - expected_y) <= 1e-5 * scale)
+
+
+def test_field_along_the_extension_points_along_the_segment():
+    analytic = FiniteLineCharge(1e-9, Point(2, 5), Point(6, 5), 2, analytic=True)
+    xs = np.array([1.0, 1.99, 6.01, 9.0])
+    field_x, field_y = analytic.field_grid(xs, np.full(4, 5.0))
+    np.testing.assert_array_equal(field_y, 0)
+    assert np.all(np.sign(field_x) == [-1, -1, 1, 1])
+
+
+def test_analytic_and_discretized_modes_converge():
+    start, end = Point(1, 1), Point(4, 5)
+    xs, ys = targets(start, end)
+    far = np.hypot(xs - 2.5, ys - 3) > 3
+    exact = FiniteLineCharge(1e-9, start, end, 2, analytic=True).potential_grid(xs[far], ys[far])
+    errors = [
+        np.abs(FiniteLineCharge(1e-9, start, end, count).potential_grid(xs[far], ys[far]) - exact).max()
+        for count in (10, 100, 1000)
+    ]
+    assert errors[0] > errors[1] > errors[2]
+    assert errors[2] < 1e-3 * np.abs(exact).max()
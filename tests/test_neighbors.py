@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from neighbors import ShortRange, VerletList, cell_pairs
+
+
+def brute_force(x, y, radius):
+    i, j = np.triu_indices(len(x), k=1)
+    close = np.hypot(x[i] - x[j], y[i] - y[j]) < radius
+    return {(int(a), int(b)) for a, b in zip(i[close], j[close])}
+
+
+def found(x, y, radius):
+    i, j = cell_pairs(x, y, radius)
+    pairs = {(int(min(a, b)), int(max(a, b))) for a, b in zip(i, j)}
+    assert len(pairs) == len(i)
+    return pairs
+
+
+def lattice(spacing, size=6, offset=(0.0, 0.0)):
+    x, y = np.meshgrid(np.arange(size) * spacing, np.arange(size) * spacing)
+    return x.ravel() + offset[0], y.ravel() + offset[1]
+
+
+@pytest.mark.parametrize("count, radius", [(2, 0.5), (50, 0.3), (400, 0.1), (400, 2.0)])
+def test_random_points(count, radius):
+    generator = np.random.default_rng(count)
+    x, y = generator.uniform(-1, 1, (2, count))
+    assert found(x, y, radius) == brute_force(x, y, radius)
+
+
+@pytest.mark.parametrize("spacing", [1.0, 0.999, 1.001, 0.5])
+def test_periodic_lattice_on_the_cell_boundaries(spacing):
+    # Points on a lattice of the cell size sit exactly on cell edges, at exactly the radius from their neighbors.
+    x, y = lattice(spacing, offset=(-3.0, 7.0))
+    assert found(x, y, 1.0) == brute_force(x, y, 1.0)
+
+
+def test_degenerate_inputs():
+    assert found(np.zeros(0), np.zeros(0), 1.0) == set()
+    assert found(np.array([1.0]), np.array([1.0]), 1.0) == set()
+    x = np.zeros(5)
+    assert found(x, x, 1.0) == brute_force(x, x, 1.0)
+    # A single row and a single column of points.
+    line = np.linspace(0, 10, 41)
+    assert found(line, np.zeros(41), 0.3) == brute_force(line, np.zeros(41), 0.3)
+    assert found(np.zeros(41), line, 0.3) == brute_force(np.zeros(41), line, 0.3)
+
+
+def test_verlet_list_is_rebuilt_past_half_the_skin():
+    neighbors = VerletList(cutoff=1.0, skin=0.2)
+    x, y = lattice(0.7)
+    neighbors.pairs(x, y)
+    assert neighbors.rebuilds == 1
+    x = x.copy()
+    x[3] += 0.09
+    neighbors.pairs(x, y)
+    assert neighbors.rebuilds == 1
+    x[3] += 0.02
+    i, j = neighbors.pairs(x, y)
+    assert neighbors.rebuilds == 2
+    assert {(int(a), int(b)) for a, b in zip(np.minimum(i, j), np.maximum(i, j))} == brute_force(x, y, 1.2)
+    neighbors.pairs(x[:-1], y[:-1])
+    assert neighbors.rebuilds == 3
+
+
+def test_cached_pairs_still_find_every_pair_within_the_cutoff():
+    interaction = ShortRange(cutoff=1.0, skin=0.2)
+    generator = np.random.default_rng(5)
+    x, y = generator.uniform(0, 5, (2, 200))
+    q = np.ones(200)
+    for _ in range(20):
+        x = x + generator.uniform(-0.03, 0.03, 200)
+        y = y + generator.uniform(-0.03, 0.03, 200)
+        i, j, *_ = interaction.terms(x, y, q)
+        pairs = {(int(a), int(b)) for a, b in zip(np.minimum(i, j), np.maximum(i, j))}
+        assert pairs == brute_force(x, y, 1.0)
+    assert 1 < interaction.neighbors.rebuilds < 20
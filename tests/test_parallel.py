@@ -0,0 +1,56 @@
+import numpy as np
+import kernels
+from charges import System, FiniteLineCharge, ChargeArray
+from parallel import map_tiles
+from points import Point
+
+
+def grid():
+    return np.meshgrid(np.linspace(0, 10, 41), np.linspace(0, 10, 37))
+
+
+def test_tiles_are_evaluated_separately_unless_compiled():
+    xs, ys = grid()
+    calls = []
+
+    def function(xs, ys):
+        calls.append(xs.size)
+        return xs * ys, xs + ys
+
+    tiled = map_tiles(function, xs, ys, workers=3)
+    assert len(calls) > 1
+    calls.clear()
+    untiled = map_tiles(function, xs, ys, workers=3, compiled=True)
+    assert calls == [xs.size]
+    for tiled_part, untiled_part in zip(tiled, untiled):
+        assert tiled_part.shape == xs.shape
+        np.testing.assert_array_equal(tiled_part, untiled_part)
+
+
+def test_tiled_system_equals_untiled_system():
+    xs, ys = grid()
+    generator = np.random.default_rng(0)
+    system = System(
+        [
+            FiniteLineCharge(1e-9, Point(3, 3), Point(3, 7), 10, analytic=True),
+            ChargeArray(*generator.uniform(0, 10, (2, 50)), generator.uniform(-1e-9, 1e-9, 50)),
+        ]
+    )
+    previous = kernels.BACKEND
+    try:
+        for backend in {"numpy", previous}:
+            kernels.set_backend(backend)
+            np.testing.assert_allclose(
+                system.potential_grid(xs, ys, workers=4),
+                system.potential_grid(xs, ys),
+                rtol=1e-12,
+            )
+            for tiled, untiled in zip(system.field_grid(xs, ys, workers=4), system.field_grid(xs, ys)):
+                np.testing.assert_allclose(tiled, untiled, rtol=1e-12)
+    finally:
+        kernels.set_backend(previous)
+
+
+def test_segments_alone_are_not_left_to_the_compiled_kernels():
+    system = System([FiniteLineCharge(1e-9, Point(3, 3), Point(3, 7), 10, analytic=True)])
+    assert not system.store.compiled
@@ -0,0 +1,30 @@
+import pytest
+from charges import PROTON_CHARGE, ELECTRON_CHARGE
+from particles import Particle, System
+from points import Point
+
+
+def test_opposite_charges_attract():
+    proton = Particle(PROTON_CHARGE, 1.67262192e-27, Point(0, 0), Point(0, 0))
+    electron = Particle(ELECTRON_CHARGE, 9.1093837e-31, Point(1, 0), Point(0, 0))
+    assert proton.force(electron).x > 0
+    assert electron.force(proton).x < 0
+
+
+def test_particles_are_copied_into_the_system():
+    proton = Particle(PROTON_CHARGE, 1.67262192e-27, Point(0, 0), Point(0, 0))
+    electron = Particle(ELECTRON_CHARGE, 9.1093837e-31, Point(1e-9, 0), Point(0, 0))
+    system = System([proton, electron])
+    system.iterate(1e-18)
+    assert (proton.point.x, electron.point.x) == (0, 1e-9)
+    assert system.particles[1].point.x < 1e-9
+    with pytest.raises(AttributeError):
+        system.particles.append(proton)
+
+
+def test_assigning_particles_replaces_them():
+    system = System([Particle(PROTON_CHARGE, 1.67262192e-27, Point(0, 0), Point(0, 0))])
+    system.particles = [*system.particles, Particle(ELECTRON_CHARGE, 9.1093837e-31, Point(1, 2), Point(3, 4))]
+    assert system.x.tolist() == [0, 1]
+    assert system.velocity_y.tolist() == [0, 4]
+    assert system.charge.tolist() == [PROTON_CHARGE, ELECTRON_CHARGE]
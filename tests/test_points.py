@@ -0,0 +1,22 @@
+import numpy as np
+from points import Point, PointArray
+
+
+def test_scalar_coordinates_are_repeated_into_separate_cells():
+    points = PointArray([1, 2, 3], 0.0)
+    points.set(PointArray([0, 0, 0], [1, 2, 3]))
+    assert points.y.tolist() == [1, 2, 3]
+
+
+def test_single_point_array_has_a_length():
+    points = PointArray(1.0, 2.0)
+    assert len(points) == 1
+    points.add(Point(1, 1))
+    assert (points.x.tolist(), points.y.tolist()) == ([2.0], [3.0])
+
+
+def test_construction_copies_the_coordinates():
+    x = np.array([1.0, 2.0])
+    points = PointArray(x, [0.0, 0.0])
+    points.mul(2)
+    assert x.tolist() == [1.0, 2.0]
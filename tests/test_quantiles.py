@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from quantiles import CONTOUR_FRACTIONS, QuantileSketch, levels
+
+
+def rank_error(sorted_values, value, fraction):
+    """Find how far a value is from the rank of a fraction, counting ties as every rank they cover."""
+    low = np.searchsorted(sorted_values, value, side="left")
+    high = np.searchsorted(sorted_values, value, side="right") - 1
+    target = fraction * (sorted_values.size - 1)
+    return max(0.0, low - target, target - high)
+
+
+@pytest.mark.parametrize("size", [1, 2, 1001, 100_000])
+def test_levels_match_the_sorted_order(size):
+    values = np.random.default_rng(size).normal(size=size)
+    expected = np.quantile(values, CONTOUR_FRACTIONS, method="nearest")
+    assert levels(values, CONTOUR_FRACTIONS) == pytest.approx(expected.tolist())
+
+
+def test_levels_leave_the_input_alone_and_handle_infinities():
+    values = np.random.default_rng(0).normal(size=(30, 40))
+    values[0, :5] = np.inf
+    values[1, :5] = -np.inf
+    original = values.copy()
+    found = levels(values, [0.0, 0.5, 1.0])
+    np.testing.assert_array_equal(values, original)
+    assert found == [-np.inf, np.sort(values.ravel())[round(0.5 * (values.size - 1))], np.inf]
+
+
+@pytest.mark.parametrize("capacity", [64, 512])
+def test_sketch_stays_within_its_rank_error(capacity):
+    generator = np.random.default_rng(capacity)
+    values = generator.normal(size=200_000)
+    values[::97] = np.inf
+    values[::89] = -np.inf
+    sketch = QuantileSketch(capacity, seed=1)
+    for tile in np.array_split(values, 37):
+        sketch.update(tile)
+    assert sketch.count == values.size
+    allowed = sketch.rank_error + 2.0 ** (len(sketch.buffers) - 1)
+    assert allowed < values.size / 10
+    ordered = np.sort(values)
+    for fraction, estimate in zip(CONTOUR_FRACTIONS, sketch.quantiles(CONTOUR_FRACTIONS)):
+        assert rank_error(ordered, estimate, fraction) <= allowed
+
+
+def test_sketch_leaves_out_nan_and_merges():
+    generator = np.random.default_rng(3)
+    values = generator.uniform(size=50_000)
+    first = QuantileSketch(256, seed=0).update(values[:20_000]).update(np.full(100, np.nan))
+    second = QuantileSketch(256, seed=1).update(values[20_000:])
+    merged = first.merge(second)
+    assert merged.count == values.size
+    ordered = np.sort(values)
+    allowed = merged.rank_error + 2.0 ** (len(merged.buffers) - 1)
+    for fraction, estimate in zip(CONTOUR_FRACTIONS, merged.quantiles(CONTOUR_FRACTIONS)):
+        assert not np.isnan(estimate)
+        assert rank_error(ordered, estimate, fraction) <= allowed
+
+
+def test_small_and_empty_sketches_are_exact():
+    assert all(np.isnan(QuantileSketch().quantiles([0.5])))
+    assert QuantileSketch().update(np.full(3, np.nan)).count == 0
+    values = np.random.default_rng(4).normal(size=1000)
+    sketch = QuantileSketch().update(values)
+    assert sketch.rank_error == 0
+    ordered = np.sort(values)
+    for fraction, estimate in zip(CONTOUR_FRACTIONS, sketch.quantiles(CONTOUR_FRACTIONS)):
+        assert rank_error(ordered, estimate, fraction) < 1
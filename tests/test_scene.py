@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from charges import ChargeArray, CircleCharge, FiniteLineCharge, PointCharge, System
+from points import Point
+from scene import Scene, describe, load_scene, particle_system, save_scene
+
+
+def scene():
+    return Scene(
+        [
+            FiniteLineCharge(1e-9, Point(1, 1), Point(1, 4), 20, analytic=True),
+            PointCharge(2e-9, Point(2, 3)),
+            PointCharge(-1e-9, Point(4, 5)),
+            ChargeArray(np.array([6.0, 7.0]), np.array([1.0, 2.0]), np.array([1e-9, -3e-9])),
+            CircleCharge(-2e-9, Point(5, 5), 2, 30),
+            PointCharge(5e-10, Point(8, 8)),
+            ChargeArray(np.empty(0), np.empty(0), np.empty(0)),
+        ],
+        particle_system(
+            np.array([1.0, 2.0]),
+            np.array([3.0, 4.0]),
+            np.array([0.5, 0.0]),
+            np.array([0.0, -0.5]),
+            np.array([1e-9, -1e-9]),
+            np.array([1.0, 2.0]),
+        ),
+        Point(-1, 0),
+        Point(11, 12),
+    )
+
+
+@pytest.mark.parametrize("name", ["scene.json", "scene.toml", "scene"])
+def test_round_trip_keeps_order_and_types(tmp_path, name):
+    original = scene()
+    save_scene(original, tmp_path / name)
+    loaded = load_scene(tmp_path / name)
+    assert [type(charge) for charge in loaded.charges] == [type(charge) for charge in original.charges]
+    assert [describe(charge) for charge in loaded.charges] == [describe(charge) for charge in original.charges]
+    assert (loaded.minimum.x, loaded.minimum.y, loaded.maximum.x, loaded.maximum.y) == (-1, 0, 11, 12)
+    for name in ("x", "y", "velocity_x", "velocity_y", "charge", "mass"):
+        np.testing.assert_array_equal(getattr(loaded.particles, name), getattr(original.particles, name))
+    xs, ys = np.meshgrid(np.linspace(0, 10, 7), np.linspace(0, 10, 7))
+    np.testing.assert_allclose(loaded.system().potential_grid(xs, ys), original.system().potential_grid(xs, ys))
+
+
+def test_directory_maps_charge_arrays(tmp_path):
+    save_scene(scene(), tmp_path / "scene")
+    mapped = load_scene(tmp_path / "scene").charges[3]
+    assert not mapped.xs.flags.writeable
+    assert load_scene(tmp_path / "scene", mmap=False).charges[3].xs.flags.writeable
+
+
+def test_saving_again_replaces_the_arrays(tmp_path):
+    save_scene(scene(), tmp_path / "scene")
+    save_scene(Scene([CircleCharge(1e-9, Point(5, 5), 1, 10)]), tmp_path / "scene")
+    loaded = load_scene(tmp_path / "scene")
+    assert [type(charge) for charge in loaded.charges] == [CircleCharge]
+    assert loaded.particles is None
+
+
+def test_directories_without_columns_still_load(tmp_path):
+    directory = tmp_path / "scene"
+    directory.mkdir()
+    (directory / "scene.json").write_text('{"charges": [{"type": "point", "charge": 1e-09, "position": [1, 2]}]}')
+    np.save(directory / "points.npy", np.array([[3.0, 4.0], [5.0, 6.0], [1e-9, -1e-9]]))
+    loaded = load_scene(directory)
+    assert [type(charge) for charge in loaded.charges] == [ChargeArray, PointCharge]
+    assert loaded.charges[0].xs.tolist() == [3.0, 4.0]
@@ -0,0 +1,46 @@
+import numpy as np
+from charges import System, PointCharge, FiniteLineCharge, PROTON_CHARGE, ELECTRON_CHARGE
+from points import Point
+from stream import downsample, render_streaming, stream_potentials, tiles
+
+
+def dipole():
+    return System(
+        [
+            PointCharge(PROTON_CHARGE, Point(3.1, 4.9)),
+            PointCharge(ELECTRON_CHARGE, Point(6.9, 5.1)),
+            FiniteLineCharge(1e-19, Point(2, 2), Point(8, 2), 20, analytic=True),
+        ]
+    )
+
+
+def test_tiles_cover_the_grid_once():
+    covered = np.zeros((23, 37), dtype=int)
+    for rows, columns, tile in tiles(dipole(), Point(0, 0), Point(10, 10), 37, 23, 10):
+        assert tile.shape == covered[rows, columns].shape
+        covered[rows, columns] += 1
+    assert np.all(covered == 1)
+
+
+def test_streamed_potentials_match_the_potential_grid(tmp_path):
+    system = dipole()
+    width, height = 45, 31
+    zooms = render_streaming(system, Point(0, 0), Point(10, 10), tmp_path, width, height, tile_size=16)
+    xs, ys = np.meshgrid(np.linspace(0, 10, width), np.linspace(0, 10, height))
+    streamed = np.load(tmp_path / "potentials.npy")
+    np.testing.assert_allclose(streamed, system.potential_grid(xs, ys), rtol=1e-12, atol=0)
+    assert zooms == 1
+    assert (tmp_path / "0" / "0_0.png").exists()
+
+
+def test_streamed_levels_are_increasing(tmp_path):
+    levels = stream_potentials(dipole(), Point(0, 0), Point(10, 10), tmp_path / "potentials.npy", 40, 40, 16)
+    assert levels == sorted(levels)
+
+
+def test_downsample_averages_blocks_and_pads_odd_edges():
+    source = np.arange(35, dtype=float).reshape(5, 7)
+    destination = np.zeros((3, 4))
+    downsample(source, destination, 2)
+    padded = np.pad(source, ((0, 1), (0, 1)), mode="edge")
+    np.testing.assert_allclose(destination, padded.reshape(3, 2, 4, 2).mean(axis=(1, 3)))
@@ -0,0 +1,70 @@
+import numpy as np
+from points import Point
+from charges import System, PointCharge, FiniteLineCharge, CircleCharge, ChargeArray
+
+
+def test_edits_update_retained_grids_and_store_like_a_new_system():
+    charges = [
+        PointCharge(1e-9, Point(1, 2)),
+        FiniteLineCharge(-1e-9, Point(3, 3), Point(3, 7), 50, analytic=True),
+        CircleCharge(2e-9, Point(6, 6), 1, 20),
+        FiniteLineCharge(1e-9, Point(7, 1), Point(9, 2), 30),
+    ]
+    system = System(list(charges))
+    grid = system.retain(*np.meshgrid(np.linspace(0, 10, 20), np.linspace(0, 10, 20)))
+    charges[2].move(Point(0.5, -0.2))
+    system.update(charges[2])
+    charges[3].xs += 0.3
+    system.update(charges[3])
+    system.remove(charges[0])
+    system.add(PointCharge(-3e-9, Point(4, 5)))
+    expected = System(list(system.charges))
+    exact = expected.potential_grid(grid.xs, grid.ys)
+    assert np.allclose(grid.potential, exact, rtol=1e-12, atol=0)
+    for mine, theirs in zip(
+        (*system.store.points(), system.store.group, *system.store.segments()),
+        (*expected.store.points(), expected.store.group, *expected.store.segments()),
+    ):
+        assert np.array_equal(mine, theirs)
+
+
+def assert_matches_a_new_system(system, grid):
+    expected = System(list(system.charges))
+    # Superposition leaves round-off of the order of the largest value, even where the result is near zero.
+    potential = expected.potential_grid(grid.xs, grid.ys)
+    np.testing.assert_allclose(grid.potential, potential, atol=1e-12 * np.abs(potential).max())
+    for exact, updated in zip(expected.field_grid(grid.xs, grid.ys), (grid.field_x, grid.field_y)):
+        np.testing.assert_allclose(updated, exact, atol=1e-12 * np.abs(exact).max())
+
+
+def test_read_only_views_of_changing_arrays_are_copied():
+    xs = np.array([2.0, 4.0, 6.0])
+    view = xs.view()
+    view.flags.writeable = False
+    array = ChargeArray(view, np.full(3, 5.0), np.array([1e-9, -2e-9, 1e-9]))
+    system = System([array])
+    assert not np.shares_memory(system.store.x, xs)
+    grid = system.retain(*np.meshgrid(np.linspace(0, 10, 15), np.linspace(0, 10, 15)))
+    system.add(PointCharge(1e-9, Point(1, 1)))
+    xs += 0.5
+    system.update(array)
+    assert_matches_a_new_system(system, grid)
+    xs -= 1.5
+    system.remove(array)
+    assert_matches_a_new_system(system, grid)
+    system.add(array)
+    assert_matches_a_new_system(system, grid)
+
+
+def test_memory_mapped_scene_arrays_are_not_copied(tmp_path):
+    np.save(tmp_path / "points.npy", np.array([[2.0, 4.0], [5.0, 5.0], [1e-9, -1e-9]]))
+    array = ChargeArray(*np.load(tmp_path / "points.npy", mmap_mode="r"))
+    system = System([array])
+    assert np.shares_memory(system.store.x, array.xs)
+    grid = system.retain(*np.meshgrid(np.linspace(0, 10, 15), np.linspace(0, 10, 15)))
+    moved = PointCharge(1e-9, Point(3, 3))
+    system.add(moved)
+    moved.point = Point(7, 2)
+    system.update(moved)
+    system.remove(array)
+    assert_matches_a_new_system(system, grid)
@@ -0,0 +1,21 @@
+import numpy as np
+from scene import particle_system
+from trajectory import TrajectoryReader, TrajectoryRecorder
+
+
+def test_recording_starts_from_the_initial_state(tmp_path):
+    system = particle_system(
+        np.array([0.0, 1.0]),
+        np.array([0.0, 0.0]),
+        np.zeros(2),
+        np.zeros(2),
+        np.array([1e-9, -1e-9]),
+        np.array([1.0, 1.0]),
+    )
+    with TrajectoryRecorder(tmp_path, system) as recorder:
+        recorder.run(1e-3, 3)
+    reader = TrajectoryReader(tmp_path)
+    assert reader.times.tolist() == [0.0, 1e-3, 2e-3, 3e-3]
+    assert reader.frames(0, 1)[0, :2].tolist() == [[0.0, 1.0], [0.0, 0.0]]
+    assert np.isnan(reader.potential_energies).all()
+    reader.close()
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from kernels import point_field, point_potential
+from multipole import bound, m2m, m2p, p2m
+from store import ChargeStore
+from tree import TreeEngine
+
+
+@pytest.fixture(scope="module")
+def scene():
+    generator = np.random.default_rng(2)
+    x, y = generator.uniform(0, 10, (2, 2000))
+    q = generator.uniform(-1e-9, 1e-9, 2000)
+    xs, ys = np.meshgrid(np.linspace(-2, 12, 25), np.linspace(-2, 12, 25))
+    store = ChargeStore([(x, y, q)])
+    return store, xs, ys, store.potential_grid(xs, ys), np.array(store.field_grid(xs, ys))
+
+
+def errors(engine, scene):
+    store, xs, ys, potential, field = scene
+    potential_error = np.abs(engine.potential_grid(store, xs, ys) - potential)
+    potential_bound = engine.errors
+    field_error = np.hypot(*(np.array(engine.field_grid(store, xs, ys)) - field))
+    return potential_error, potential_bound, field_error, engine.errors
+
+
+@pytest.mark.parametrize("theta", [0.3, 0.5, 0.8])
+@pytest.mark.parametrize("order", [0, 1, 3, 6])
+def test_reported_bound_covers_the_error(scene, theta, order):
+    potential_error, potential_bound, field_error, field_bound = errors(TreeEngine(theta, order), scene)
+    assert (potential_error <= potential_bound * (1 + 1e-9) + 1e-9).all()
+    assert (field_error <= field_bound * (1 + 1e-9) + 1e-6).all()
+
+
+def test_error_shrinks_with_order_and_angle(scene):
+    potential = np.abs(scene[3]).max()
+    relative = {
+        (theta, order): errors(TreeEngine(theta, order), scene)[0].max() / potential
+        for theta in (0.3, 0.8)
+        for order in (0, 6)
+    }
+    assert relative[0.3, 6] < relative[0.3, 0] / 100
+    assert relative[0.8, 6] < relative[0.8, 0]
+    assert relative[0.3, 0] < relative[0.8, 0]
+    assert relative[0.3, 6] < 1e-5
+
+
+def test_zero_angle_is_exact(scene):
+    potential_error, potential_bound, _, _ = errors(TreeEngine(0.0, 1), scene)
+    assert potential_error.max() <= 1e-12 * np.abs(scene[3]).max()
+    assert potential_bound.max() == 0
+
+
+def test_expansion_matches_direct_sum_far_away():
+    generator = np.random.default_rng(3)
+    dx, dy = generator.uniform(-0.5, 0.5, (2, 50))
+    q = generator.uniform(-1e-9, 1e-9, 50)
+    tx, ty = np.array([3.0, -2.0, 0.5]), np.array([1.0, 2.5, -4.0])
+    exact_potential = point_potential(tx, ty, dx, dy, q)
+    exact_field = point_field(tx, ty, dx, dy, q)
+    radius = np.hypot(dx, dy).max()
+    distance = np.hypot(tx, ty)
+    for order in (0, 2, 5, 10):
+        potential, field_x, field_y = m2p(p2m(dx, dy, q, order), tx, ty, order)
+        potential_bound, field_bound = bound(np.abs(q).sum(), distance, radius / distance, order)
+        assert (np.abs(potential - exact_potential) <= potential_bound).all()
+        assert (np.hypot(field_x - exact_field[0], field_y - exact_field[1]) <= field_bound).all()
+
+
+def test_shifted_moments_match_moments_about_the_new_center():
+    generator = np.random.default_rng(4)
+    dx, dy = generator.uniform(-0.5, 0.5, (2, 20))
+    q = generator.uniform(-1e-9, 1e-9, 20)
+    order = 6
+    shifted = m2m(p2m(dx, dy, q, order), 0.25, -0.5, order)
+    np.testing.assert_allclose(shifted, p2m(dx + 0.25, dy - 0.5, q, order), rtol=1e-10, atol=1e-24)